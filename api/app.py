@@ -1,15 +1,49 @@
 from __future__ import annotations
 
+import json
+import logging
+import os
+import threading
+import time
 import uuid
 import sqlite3
-from datetime import datetime, timezone
+from collections import Counter as Tally
+from contextlib import asynccontextmanager, nullcontext
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Literal, Optional, Dict, Any
+from typing import Literal, Optional, Dict, Any, List, Tuple
 
-import joblib
 import pandas as pd
-from fastapi import FastAPI
-from pydantic import BaseModel, Field
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, Field, ValidationError
+
+from api.batching import MicroBatcher
+from api.drift import DriftMonitor
+from api.executor import (
+    InferencePool, PoolSaturated, explain_records, init_explain_worker, preload_worker, score_records,
+)
+from api.insights import TrainingAggregates
+from api.metrics import Counter, Gauge, HistogramFamily, Registry, StageTimer
+from api.model_bundle import ModelBundle, RegistryWatcher, load_artifacts, timed, timed_load, warm_up
+from api.prediction_cache import PredictionCache, artifact_fingerprint, payload_key
+from api.prediction_logger import (
+    HIST_BUCKETS, LogRecord, PredictionLogWriter, ensure_monitoring_schema, insert_predictions, query_rollups,
+)
+from api.profiler import SlowRequestProfiler
+from api.shadow import ShadowScorer
+from src.drift_reference import REFERENCE_PATH, load_reference
+from src.explainer import top_drivers
+from src.fast_scorer import FastScorer
+from src.forest_evaluator import (
+    PARITY_TOLERANCE, HybridForest, PackedForest, load_training_matrix, max_abs_diff, publish_shared, verify_source,
+)
+from src.model_registry import current_version, load_manifest, thresholds as manifest_thresholds, version_paths
+
+logger = logging.getLogger("churn_api")
 
 
 # ------------------------
@@ -21,16 +55,265 @@ ARTIFACTS_DIR = PROJECT_ROOT / "artifacts"
 
 PREPROCESSOR_PATH = ARTIFACTS_DIR / "preprocessor.joblib"
 MODEL_PATH = ARTIFACTS_DIR / "churn_model_rf.joblib"
+PACKED_MODEL_DIR = ARTIFACTS_DIR / "churn_model_rf_packed"
 
 DEFAULT_THRESHOLD = 0.48
 AGGRESSIVE_THRESHOLD = 0.28
 
+MAX_BATCH_SIZE = 100_000  # rows per /predict/batch call
+MAX_EXPLAIN_BATCH = 1_000  # rows per /predict/explain/batch call
+
+# Pandas-free single-row preprocessing (falls back to preprocessor.transform)
+USE_FAST_SCORER = os.getenv("USE_FAST_SCORER", "1") == "1"
+
+# "sklearn" = model.predict_proba, "packed" = array-backed PackedForest
+MODEL_BACKEND = os.getenv("MODEL_BACKEND", "sklearn")
+# packed: PackedForest for calls of up to PACKED_MAX_ROWS rows, sklearn above (0 = packed for every size)
+PACKED_MAX_ROWS = int(os.getenv("PACKED_MAX_ROWS", "64"))
+
+# "async" = background batched writer, "sync" = insert + commit inside the request
+PREDICTION_LOG_MODE = os.getenv("PREDICTION_LOG_MODE", "async")
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_FLUSH_ROWS = int(os.getenv("LOG_FLUSH_ROWS", "500"))
+LOG_FLUSH_MS = float(os.getenv("LOG_FLUSH_MS", "50"))
+LOG_ON_FULL = os.getenv("LOG_ON_FULL", "block")  # "block" (backpressure) | "drop"
+
+# Coalesce concurrent /predict calls into one vectorized predict_proba
+PREDICT_BATCHING = os.getenv("PREDICT_BATCHING", "0") == "1"
+BATCH_WINDOW_MS = float(os.getenv("BATCH_WINDOW_MS", "2"))
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "64"))
+
+# "threadpool" = Starlette's default pool, "thread" / "process" = dedicated bounded pool
+EXECUTION_MODE = os.getenv("EXECUTION_MODE", "threadpool")
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", str(os.cpu_count() or 1)))
+INFERENCE_MAX_QUEUE = int(os.getenv("INFERENCE_MAX_QUEUE", str(2 * (os.cpu_count() or 1))))
+
+# LRU cache of churn probabilities keyed on the feature payload (0 = disabled)
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "10000"))
+PREDICTION_CACHE_TTL_S = float(os.getenv("PREDICTION_CACHE_TTL_S", "0")) or None
+
+# Streaming PSI/KS drift sketches against artifacts/drift_reference.json
+DRIFT_MONITORING = os.getenv("DRIFT_MONITORING", "1") == "1"
+DRIFT_WINDOWS_S = [float(w) for w in os.getenv("DRIFT_WINDOWS_S", "3600,86400").split(",")]
+DRIFT_SLOTS = int(os.getenv("DRIFT_SLOTS", "60"))
+
+# Prometheus /metrics: request counters + per-stage latency (0 = nothing timed on the request path)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+# Stack-sample requests slower than SLOW_REQUEST_MS (0 = profiler off)
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "0"))
+PROFILER_INTERVAL_MS = float(os.getenv("PROFILER_INTERVAL_MS", "5"))
+
+# Startup: artifacts load in the background (parallel), then a warm-up pass; /ready flips after both
+ARTIFACT_LOAD_PARALLEL = os.getenv("ARTIFACT_LOAD_PARALLEL", "1") == "1"
+MODEL_MMAP = os.getenv("MODEL_MMAP", "0") == "1"  # memory-map the forest arrays instead of reading them
+WARMUP_ROWS = int(os.getenv("WARMUP_ROWS", "64"))  # 0 = no warm-up pass
+
+# Multi-worker hosting: every worker maps the same read-only packed forest arrays
+# (MODEL_BACKEND=packed) instead of unpickling its own copy of the sklearn model.
+# SHARED_MODEL_DIR (e.g. /dev/shm/churn_model_rf_packed) = copy them to tmpfs first.
+SHARED_MODEL = os.getenv("SHARED_MODEL", "0") == "1"
+SHARED_MODEL_DIR = os.getenv("SHARED_MODEL_DIR")
+
+# Model registry (python -m src.model_registry): serve the version promoted to "production" and
+# hot-swap when the pointer changes. Nothing promoted (or SHARED_MODEL=1) = the artifacts/ files above.
+MODEL_REGISTRY_DIR = Path(os.getenv("MODEL_REGISTRY_DIR", str(ARTIFACTS_DIR / "models")))
+REGISTRY_POLL_S = float(os.getenv("REGISTRY_POLL_S", "5"))  # 0 = read the pointers at startup only
+# Candidate promoted to "shadow" scores this fraction of served rows off the request path (0 = off)
+SHADOW_SAMPLE_RATE = float(os.getenv("SHADOW_SAMPLE_RATE", "0.1"))
+SHADOW_QUEUE_SIZE = int(os.getenv("SHADOW_QUEUE_SIZE", "1000"))
+
+# SHAP reason codes (/predict/explain). shap holds the GIL while it runs, so explanations get
+# their own bounded pool: "process" (default) never stalls scoring, "thread" shares the GIL, "off".
+EXPLAIN_EXECUTION = os.getenv("EXPLAIN_EXECUTION", "process")
+EXPLAIN_WORKERS = int(os.getenv("EXPLAIN_WORKERS", "1"))
+EXPLAIN_MAX_QUEUE = int(os.getenv("EXPLAIN_MAX_QUEUE", "4"))
+EXPLAIN_METHOD = os.getenv("EXPLAIN_METHOD", "exact")  # "exact" | "approximate" (Saabas, much faster)
+EXPLAIN_TOP_K = int(os.getenv("EXPLAIN_TOP_K", "5"))
+EXPLAIN_CACHE_SIZE = int(os.getenv("EXPLAIN_CACHE_SIZE", "10000"))  # 0 = disabled
+
+
+# ------------------------
+# Artifacts (loaded at startup, see lifespan)
+# ------------------------
+def _build_fast_scorer(prep) -> Optional[FastScorer]:
+    if not USE_FAST_SCORER:
+        return None
+    try:
+        return FastScorer.from_preprocessor(prep)
+    except ValueError as e:
+        logger.warning("Fast scorer disabled, using preprocessor.transform: %s", e)
+        return None
+
+
+def _build_scoring_model(prep, clf, packed_dir: Path = PACKED_MODEL_DIR):
+    """Model object used for predict_proba, selected by MODEL_BACKEND."""
+    if MODEL_BACKEND == "sklearn":
+        return clf
+    if MODEL_BACKEND != "packed":
+        raise ValueError(f"Unknown MODEL_BACKEND: {MODEL_BACKEND}")
+
+    if packed_dir.exists():
+        packed = PackedForest.load(packed_dir, mmap_mode="r" if MODEL_MMAP else None)
+    else:
+        packed = PackedForest.from_sklearn(clf)
+
+    # Refuse to serve a packed forest that disagrees with the sklearn model
+    diff = max_abs_diff(clf, packed, load_training_matrix(prep, DB_PATH))
+    if diff > PARITY_TOLERANCE:
+        raise RuntimeError(f"Packed forest does not match sklearn model (max diff {diff:.3e})")
+    logger.info("Packed forest backend verified on training view (max diff %.3e)", diff)
+    return HybridForest(packed, clf, PACKED_MAX_ROWS) if PACKED_MAX_ROWS > 0 else packed
+
+
+def _load_shared_bundle(timings: Dict[str, float]) -> ModelBundle:
+    # Parity was checked at export; verify_source ties the export to the current model file
+    if MODEL_BACKEND != "packed":
+        raise ValueError("SHARED_MODEL=1 requires MODEL_BACKEND=packed")
+    prep = timed_load(timings, "load_preprocessor", PREPROCESSOR_PATH)
+    with timed(timings, "map_model"):
+        packed_dir = publish_shared(PACKED_MODEL_DIR, Path(SHARED_MODEL_DIR)) if SHARED_MODEL_DIR else PACKED_MODEL_DIR
+        verify_source(packed_dir, MODEL_PATH)
+        packed = PackedForest.load(packed_dir, mmap_mode="r")
+    with timed(timings, "fast_scorer"):
+        fast = _build_fast_scorer(prep)
+    return ModelBundle(prep, None, packed, fast, timings, thresholds=_thresholds(None))
+
+
+def _promoted(stage: str) -> Optional[str]:
+    # SHARED_MODEL maps the artifacts/ export in every worker; registry versions are not shared
+    if SHARED_MODEL:
+        return None
+    return current_version(stage, MODEL_REGISTRY_DIR)
+
+
+def _artifact_paths(version: Optional[str]) -> Tuple[Path, Path, Path]:
+    """(preprocessor, model, packed dir) of a registry version, or of artifacts/ for None."""
+    if version is None:
+        return PREPROCESSOR_PATH, MODEL_PATH, PACKED_MODEL_DIR
+    paths = version_paths(version, MODEL_REGISTRY_DIR)
+    return paths["preprocessor"], paths["model"], paths["packed"]
+
+
+def _thresholds(version: Optional[str]) -> Dict[str, float]:
+    defaults = {"default": DEFAULT_THRESHOLD, "aggressive": AGGRESSIVE_THRESHOLD}
+    if version is None:
+        return defaults
+    return {**defaults, **manifest_thresholds(load_manifest(version, MODEL_REGISTRY_DIR))}
+
+
+def _load_bundle(version: Optional[str] = None) -> ModelBundle:
+    timings: Dict[str, float] = {}
+    if SHARED_MODEL:
+        return _load_shared_bundle(timings)
+    prep_path, model_path, packed_dir = _artifact_paths(version)
+    prep, clf = load_artifacts(
+        prep_path, model_path, timings,
+        parallel=ARTIFACT_LOAD_PARALLEL, mmap_mode="r" if MODEL_MMAP else None,
+    )
+    with timed(timings, "fast_scorer"):
+        fast = _build_fast_scorer(prep)
+    with timed(timings, "scoring_model"):
+        scoring = _build_scoring_model(prep, clf, packed_dir)
+    return ModelBundle(prep, clf, scoring, fast, timings, version=version, thresholds=_thresholds(version))
+
+
+bundle: Optional[ModelBundle] = None
+_bundle_lock = threading.Lock()
+
+
+def get_bundle() -> ModelBundle:
+    # Built by the startup thread; in-process callers (scripts) build it on first use.
+    # Request paths call this once and pass the bundle along, so a hot-swap never
+    # mixes two versions (model vs thresholds) within one response.
+    global bundle
+    if bundle is None:
+        with _bundle_lock:
+            if bundle is None:
+                bundle = _load_bundle(_promoted("production"))
+    return bundle
+
+
+startup_state: Dict[str, Any] = {"ready": False, "error": None}
+
+
+def _startup() -> None:
+    # Load + warm up off the event loop so /health answers (liveness) while /ready is still 503
+    global drift_monitor, registry_watcher
+    start = time.perf_counter()
+    try:
+        b = get_bundle()
+        if WARMUP_ROWS > 0:
+            with timed(b.timings, "warmup"):
+                warm_up(b, WARMUP_ROWS)
+        if b.version is not None:
+            drift_monitor = _build_drift_monitor(version_paths(b.version, MODEL_REGISTRY_DIR)["reference"])
+    except Exception as e:
+        logger.exception("Startup failed; /ready stays unavailable")
+        startup_state["error"] = repr(e)
+        return
+    b.timings["total"] = time.perf_counter() - start
+    startup_state["ready"] = True
+    logger.info("startup: version %s ready in %.3fs", b.version, b.timings["total"])
+
+    # After /ready: a shadow candidate (and later promotions) load in the watcher thread
+    if not SHARED_MODEL:
+        registry_watcher = RegistryWatcher(
+            MODEL_REGISTRY_DIR, _on_registry_change, poll_s=REGISTRY_POLL_S, seen={"production": b.version},
+        )
+        registry_watcher.start()
+
 
 # ------------------------
-# Load artifacts once
+# Hot-swap / shadow
 # ------------------------
-preprocessor = joblib.load(PREPROCESSOR_PATH)
-model = joblib.load(MODEL_PATH)
+registry_watcher: Optional[RegistryWatcher] = None
+
+
+def _load_warm(version: str) -> ModelBundle:
+    b = _load_bundle(version)
+    if WARMUP_ROWS > 0:
+        with timed(b.timings, "warmup"):
+            warm_up(b, WARMUP_ROWS)
+    return b
+
+
+def _preload_pools(b: ModelBundle) -> None:
+    """Load the version into every pool worker before it takes traffic, so no request pays for the reload."""
+    pools = ((inference_pool, _pool_artifacts, False), (explain_pool, _explain_artifacts, True))
+    for pool, artifacts, explain in pools:
+        if pool is None:
+            continue
+        try:
+            with timed(b.timings, f"{pool.name}_pool_preload"):
+                loaded = pool.preload(preload_worker, artifacts(b.version), explain)
+        except Exception:
+            logger.exception("registry: %s pool preload of %s failed; workers load it on first use",
+                             pool.name, b.version)
+            continue
+        logger.info("registry: %s/%s %s pool workers preloaded %s", loaded, pool.workers, pool.name, b.version)
+
+
+def _on_registry_change(stage: str, version: Optional[str]) -> None:
+    """Watcher thread: load + warm the new version completely, then swap it in with one assignment."""
+    global bundle, drift_monitor
+    if stage == "shadow":
+        if shadow_scorer is not None:
+            shadow_scorer.set_bundle(_load_warm(version) if version is not None else None)
+            logger.info("registry: shadow candidate is now %s", version)
+        return
+    if version is None:
+        logger.warning("registry: production pointer removed; still serving %s", bundle.version)
+        return
+
+    new = _load_warm(version)
+    monitor = _build_drift_monitor(version_paths(version, MODEL_REGISTRY_DIR)["reference"])
+    _preload_pools(new)
+    old, bundle = bundle, new  # requests that already hold `old` finish with it
+    drift_monitor = monitor
+    for cache in (prediction_cache, explain_cache):
+        if cache is not None:
+            cache.clear()
+    logger.info("registry: production swapped %s -> %s", old.version if old else None, version)
 
 
 # ------------------------
@@ -76,33 +359,135 @@ class PredictResponse(BaseModel):
     churn_flag: int
 
 
+class Driver(BaseModel):
+    field: str
+    value: Any = None
+    contribution: float  # SHAP value on churn_probability (base_value + all contributions = probability)
+
+
+class ExplainResponse(PredictResponse):
+    base_value: float
+    drivers: List[Driver]
+
+
+# Request fields explanations are aggregated to
+EXPLAIN_FIELDS = tuple(f for f in PredictRequest.model_fields if f != "mode")
+
+
+# ------------------------
+# Metrics
+# ------------------------
+LATENCY_BUCKETS_S = [
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+]
+# parse: body read + validation; score: whole scoring path incl. batching / pool queueing
+STAGES = ["parse", "payload_to_dataframe", "transform", "predict_proba", "score", "log_prediction"]
+
+metrics_registry = Registry()
+REQUESTS = metrics_registry.register(Counter(
+    "churn_api_requests_total", "HTTP requests by endpoint and status code.", ["endpoint", "status"]))
+ERRORS = metrics_registry.register(Counter(
+    "churn_api_errors_total", "Requests answered with status >= 400 or an unhandled exception.",
+    ["endpoint", "status"]))
+PREDICTIONS = metrics_registry.register(Counter(
+    "churn_api_predictions_total", "Rows scored by endpoint and decision mode.", ["endpoint", "mode"]))
+IN_FLIGHT = metrics_registry.register(Gauge(
+    "churn_api_requests_in_flight", "Requests currently being handled.", ["endpoint"]))
+REQUEST_SECONDS = metrics_registry.register(HistogramFamily(
+    "churn_api_request_seconds", "HTTP request latency in seconds.", ["endpoint"], LATENCY_BUCKETS_S))
+STAGE_SECONDS = metrics_registry.register(HistogramFamily(
+    "churn_api_stage_seconds", "Latency of one scoring stage in seconds.", ["stage"], LATENCY_BUCKETS_S))
+COMPONENTS = metrics_registry.register(Gauge(
+    "churn_api_component", "Log writer / inference pool / cache state, read at scrape time.",
+    ["component", "stat"]))
+
+_stage_hist = {s: STAGE_SECONDS.labels(s) for s in STAGES}
+_NO_TIMER = nullcontext()
+
+
+def _stage(name: str):
+    # Shared no-op context when metrics are off: no clock reads, no allocation
+    return StageTimer(_stage_hist[name]) if METRICS_ENABLED else _NO_TIMER
+
+
 # ------------------------
 # Utilities
 # ------------------------
-def _threshold_for_mode(mode: str) -> float:
-    return AGGRESSIVE_THRESHOLD if mode == "aggressive" else DEFAULT_THRESHOLD
+def _threshold_for_mode(mode: str, b: ModelBundle) -> float:
+    return b.thresholds[mode]
+
+
+log_writer = PredictionLogWriter(
+    DB_PATH,
+    max_queue=LOG_QUEUE_SIZE,
+    flush_rows=LOG_FLUSH_ROWS,
+    flush_interval_ms=LOG_FLUSH_MS,
+    on_full=LOG_ON_FULL,
+)
+
+
+_monitoring_schema_ready = set()
+
+
+def _ensure_monitoring_schema(db_path: Path) -> None:
+    # Rollup tables + ts_utc index, once per DB per process
+    if db_path in _monitoring_schema_ready:
+        return
+    conn = sqlite3.connect(db_path)
+    ensure_monitoring_schema(conn)
+    conn.close()
+    _monitoring_schema_ready.add(db_path)
+
+
+def _write_log(records: List[LogRecord]) -> None:
+    # Hand off to the background writer when it is running (see lifespan)
+    if log_writer.running:
+        log_writer.submit(records)
+        return
+
+    # Sync fallback: one connection, one executemany, one commit for the whole batch
+    _ensure_monitoring_schema(DB_PATH)
+    conn = sqlite3.connect(DB_PATH)
+    insert_predictions(conn, records)
+    conn.close()
+
+
+def _log_predictions(records: List[LogRecord]) -> None:
+    if not records:
+        return
+    with _stage("log_prediction"):
+        _write_log(records)
+
+
+async def _log_predictions_async(records: List[LogRecord]) -> None:
+    # For handlers on the event loop, which must never wait on a full log queue: enqueue
+    # what fits right now, and write the rest (or everything, in sync mode) from the threadpool
+    if not records:
+        return
+    with _stage("log_prediction"):
+        if log_writer.running:
+            records = log_writer.offer(records)
+    if records:
+        await run_in_threadpool(_log_predictions, records)
 
 
 def _log_prediction(
+    ts_utc: str,
     request_id: str,
     mode: str,
     threshold: float,
     churn_probability: float,
-    churn_flag: int
-) -> None:
-    ts_utc = datetime.now(timezone.utc).isoformat()
-
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO prediction_log (ts_utc, request_id, mode, threshold, churn_probability, churn_flag)
-        VALUES (?, ?, ?, ?, ?, ?)
-        """,
-        (ts_utc, request_id, mode, threshold, float(churn_probability), int(churn_flag)),
-    )
-    conn.commit()
-    conn.close()
+    churn_flag: int,
+    model_version: Optional[str] = None,
+    pending: Optional[List[LogRecord]] = None,
+) -> LogRecord:
+    # With `pending`, the record is collected for the caller to log (see _log_predictions_async)
+    record = (ts_utc, request_id, mode, threshold, float(churn_probability), int(churn_flag), model_version, 0)
+    if pending is not None:
+        pending.append(record)
+    else:
+        _log_predictions([record])
+    return record
 
 
 def _payload_to_dataframe(payload: PredictRequest) -> pd.DataFrame:
@@ -112,35 +497,132 @@ def _payload_to_dataframe(payload: PredictRequest) -> pd.DataFrame:
     return pd.DataFrame([row])
 
 
-# ------------------------
-# FastAPI
-# ------------------------
-app = FastAPI(title="Telco Churn Scoring API", version="1.0.0")
+def _transform_payload(payload: PredictRequest, b: ModelBundle):
+    # Single-row feature vector; identical to preprocessor.transform(_payload_to_dataframe(payload))
+    if b.fast_scorer is not None:
+        with _stage("transform"):
+            return b.fast_scorer.transform_record(payload.model_dump(exclude={"mode"}))
+    with _stage("payload_to_dataframe"):
+        X_raw = _payload_to_dataframe(payload)
+    with _stage("transform"):
+        return b.preprocessor.transform(X_raw)
 
 
-@app.get("/health")
-def health():
-    return {"status": "ok"}
+def _payloads_to_dataframe(payloads: List[PredictRequest]) -> pd.DataFrame:
+    # N-row version of _payload_to_dataframe; row order == request order
+    rows = [p.model_dump(exclude={"mode"}) for p in payloads]
+    return pd.DataFrame(rows)
 
 
-@app.post("/predict", response_model=PredictResponse)
-def predict(req: PredictRequest):
-    request_id = str(uuid.uuid4())
-    threshold = _threshold_for_mode(req.mode)
+def _parse_batch_body(body: bytes, content_type: str, max_rows: int = MAX_BATCH_SIZE) -> List[PredictRequest]:
+    """
+    Accepts either a JSON array of PredictRequest objects or NDJSON
+    (one object per line, Content-Type: application/x-ndjson).
+    """
+    try:
+        if "ndjson" in content_type or "jsonlines" in content_type:
+            items = [json.loads(line) for line in body.splitlines() if line.strip()]
+        else:
+            items = json.loads(body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON body: {e}")
+
+    if not isinstance(items, list):
+        raise HTTPException(status_code=422, detail="Expected a JSON array (or NDJSON) of PredictRequest records")
+    if len(items) > max_rows:
+        raise HTTPException(status_code=413, detail=f"Batch too large: {len(items)} > {max_rows}")
+
+    payloads: List[PredictRequest] = []
+    errors: List[Dict[str, Any]] = []
+    for i, item in enumerate(items):
+        try:
+            payloads.append(PredictRequest.model_validate(item))
+        except ValidationError as e:
+            for err in e.errors(include_url=False):
+                errors.append({**err, "loc": ("body", i, *err["loc"])})
+    if errors:
+        raise RequestValidationError(errors)
+
+    return payloads
+
+
+def _predict_proba_payloads(payloads: List[PredictRequest], b: ModelBundle) -> List[float]:
+    # Churn probabilities for N payloads with one transform + one predict_proba
+    if b.fast_scorer is not None:
+        with _stage("transform"):
+            X_transformed = b.fast_scorer.transform_records(p.model_dump(exclude={"mode"}) for p in payloads)
+    else:
+        with _stage("payload_to_dataframe"):
+            X_raw = _payloads_to_dataframe(payloads)
+        with _stage("transform"):
+            X_transformed = b.preprocessor.transform(X_raw)
+    with _stage("predict_proba"):
+        return b.scoring_model.predict_proba(X_transformed)[:, 1].tolist()
+
+
+def _predict_proba_batched(items: List[Tuple[PredictRequest, ModelBundle]]) -> List[float]:
+    # MicroBatcher score_fn: a batch that straddles a hot-swap is scored per bundle
+    groups: Dict[int, Tuple[ModelBundle, List[int]]] = {}
+    for i, (_, b) in enumerate(items):
+        groups.setdefault(id(b), (b, []))[1].append(i)
+    if len(groups) == 1:
+        return _predict_proba_payloads([req for req, _ in items], items[0][1])
+
+    out = [0.0] * len(items)
+    for b, idx in groups.values():
+        for i, p in zip(idx, _predict_proba_payloads([items[i][0] for i in idx], b)):
+            out[i] = p
+    return out
+
+
+def _build_drift_monitor(reference_path: Path = REFERENCE_PATH) -> Optional[DriftMonitor]:
+    if not DRIFT_MONITORING:
+        return None
+    if not reference_path.exists():
+        logger.warning("Drift monitoring disabled: %s not found (python -m src.drift_reference)", reference_path)
+        return None
+    return DriftMonitor(load_reference(reference_path), windows_s=DRIFT_WINDOWS_S, slots=DRIFT_SLOTS)
+
 
-    X_raw = _payload_to_dataframe(req)
-    X_transformed = preprocessor.transform(X_raw)
+drift_monitor = _build_drift_monitor()
 
-    churn_probability = float(model.predict_proba(X_transformed)[0, 1])
+shadow_scorer = ShadowScorer(
+    _write_log, SHADOW_SAMPLE_RATE, max_queue=SHADOW_QUEUE_SIZE
+) if SHADOW_SAMPLE_RATE > 0 else None
+
+
+def _shadow(payloads: List[PredictRequest], records: List[LogRecord]) -> None:
+    # Queue the sampled rows (served records[i] for payloads[i]) for the shadow candidate
+    picked = shadow_scorer.pick(len(records)) if shadow_scorer is not None else ()
+    if picked:
+        shadow_scorer.submit([
+            (records[i][0], records[i][1], records[i][2], payloads[i].model_dump(exclude={"mode"}),
+             records[i][4], records[i][5])
+            for i in picked
+        ])
+
+
+def _respond(req: PredictRequest, churn_probability: float, b: ModelBundle,
+             pending: Optional[List[LogRecord]] = None) -> PredictResponse:
+    # Apply the mode threshold, log (or collect into `pending`), and build the response for one scored row
+    request_id = str(uuid.uuid4())
+    threshold = _threshold_for_mode(req.mode, b)
     churn_flag = int(churn_probability >= threshold)
 
-    _log_prediction(
+    if drift_monitor is not None:
+        drift_monitor.observe(vars(req), churn_probability)
+
+    record = _log_prediction(
+        ts_utc=datetime.now(timezone.utc).isoformat(),
         request_id=request_id,
         mode=req.mode,
         threshold=threshold,
         churn_probability=churn_probability,
         churn_flag=churn_flag,
+        model_version=b.version,
+        pending=pending,
     )
+    _shadow([req], [record])
 
     return PredictResponse(
         request_id=request_id,
@@ -150,18 +632,602 @@ def predict(req: PredictRequest):
         churn_flag=churn_flag,
     )
 
+
+def _predict_proba_one(req: PredictRequest, b: ModelBundle) -> float:
+    X_transformed = _transform_payload(req, b)
+    with _stage("predict_proba"):
+        return float(b.scoring_model.predict_proba(X_transformed)[0, 1])
+
+
+def _predict_one(req: PredictRequest) -> PredictResponse:
+    b = get_bundle()
+    return _respond(req, _predict_proba_one(req, b), b)
+
+
+# The threshold is applied after the cache, so `mode` is not part of the key; the
+# registry version is (see predict). Any change to the unversioned model/preprocessor
+# files on disk invalidates every entry, and so does a hot-swap.
+prediction_cache = PredictionCache(
+    max_size=PREDICTION_CACHE_SIZE,
+    ttl_s=PREDICTION_CACHE_TTL_S,
+    version_fn=lambda: artifact_fingerprint([PREPROCESSOR_PATH, MODEL_PATH, PACKED_MODEL_DIR / "meta.json"]),
+) if PREDICTION_CACHE_SIZE > 0 else None
+
+
+# (probability, base_value, contributions) per payload; keyed like the prediction cache
+explain_cache = PredictionCache(
+    max_size=EXPLAIN_CACHE_SIZE,
+    ttl_s=PREDICTION_CACHE_TTL_S,
+    version_fn=lambda: artifact_fingerprint([PREPROCESSOR_PATH, MODEL_PATH]),
+) if EXPLAIN_CACHE_SIZE > 0 else None
+
+
+async def _score_batched(items: List[Tuple[PredictRequest, ModelBundle]]) -> List[float]:
+    # MicroBatcher score_fn: with an inference pool each flush takes one admission slot per bundle
+    # (503 when saturated) like an unbatched /predict; otherwise the batch runs in the threadpool
+    if inference_pool is None:
+        return await run_in_threadpool(_predict_proba_batched, items)
+
+    groups: Dict[int, Tuple[ModelBundle, List[int]]] = {}
+    for i, (_, b) in enumerate(items):
+        groups.setdefault(id(b), (b, []))[1].append(i)
+    out = [0.0] * len(items)
+    for b, idx in groups.values():
+        features = [items[i][0].model_dump(exclude={"mode"}) for i in idx]
+        for i, p in zip(idx, await _pool_score(features, b)):
+            out[i] = p
+    return out
+
+
+batcher = MicroBatcher(
+    _score_batched, window_ms=BATCH_WINDOW_MS, max_batch=BATCH_MAX_SIZE
+) if PREDICT_BATCHING else None
+
+
+def _score_batch(payloads: List[PredictRequest]) -> List[PredictResponse]:
+    # Single transform + single predict_proba + single bulk insert for N rows
+    if not payloads:
+        return []
+
+    b = get_bundle()
+    return _respond_batch(payloads, _predict_proba_payloads(payloads, b), b)
+
+
+def _respond_batch(payloads: List[PredictRequest], probabilities, b: ModelBundle) -> List[PredictResponse]:
+    # Thresholds, drift, one bulk insert and shadow sampling for N scored rows
+    ts_utc = datetime.now(timezone.utc).isoformat()
+    responses: List[PredictResponse] = []
+    records: List[LogRecord] = []
+    for req, p in zip(payloads, probabilities):
+        request_id = str(uuid.uuid4())
+        threshold = _threshold_for_mode(req.mode, b)
+        churn_probability = float(p)
+        churn_flag = int(churn_probability >= threshold)
+        if drift_monitor is not None:
+            drift_monitor.observe(vars(req), churn_probability)
+
+        records.append((ts_utc, request_id, req.mode, threshold, churn_probability, churn_flag, b.version, 0))
+        responses.append(PredictResponse(
+            request_id=request_id,
+            mode=req.mode,
+            threshold=threshold,
+            churn_probability=churn_probability,
+            churn_flag=churn_flag,
+        ))
+
+    _log_predictions(records)
+    _shadow(payloads, records)
+    return responses
+
+
+# ------------------------
+# FastAPI
+# ------------------------
+inference_pool: Optional[InferencePool] = None
+explain_pool: Optional[InferencePool] = None
+slow_profiler: Optional[SlowRequestProfiler] = None
+
+
+@lru_cache(maxsize=8)
+def _pool_artifacts(version: Optional[str]) -> tuple:
+    """init_worker arguments for a version; pool workers reload when a call names another one."""
+    prep_path, model_path, packed_dir = _artifact_paths(version)
+    packed = str(packed_dir) if MODEL_BACKEND == "packed" else None
+    if SHARED_MODEL and SHARED_MODEL_DIR:
+        packed = SHARED_MODEL_DIR
+    # Shared workers never load the sklearn model, so they use the packed forest at every batch size
+    max_rows = 0 if SHARED_MODEL else PACKED_MAX_ROWS
+    return str(prep_path), str(model_path), packed, "r" if SHARED_MODEL else None, version, max_rows
+
+
+@lru_cache(maxsize=8)
+def _explain_artifacts(version: Optional[str]) -> tuple:
+    """init_explain_worker arguments for a version (always the sklearn model file)."""
+    prep_path, model_path, _ = _artifact_paths(version)
+    return str(prep_path), str(model_path), EXPLAIN_FIELDS, EXPLAIN_METHOD, version
+
+
+def _prestart_pool(pool: InferencePool) -> None:
+    # Start every worker now (models loaded, TreeExplainers built) rather than on first use. Executors
+    # only spawn workers when none is idle, so this is also what lets registry preloads reach all of them
+    try:
+        pool.prestart()
+    except Exception:
+        logger.exception("%s pool failed to start; workers start on first use instead", pool.name)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global inference_pool, explain_pool, slow_profiler
+
+    threading.Thread(target=_startup, name="artifact-startup", daemon=True).start()
+    _ensure_monitoring_schema(DB_PATH)
+    if SLOW_REQUEST_MS > 0:
+        slow_profiler = SlowRequestProfiler(SLOW_REQUEST_MS, interval_ms=PROFILER_INTERVAL_MS)
+    if PREDICTION_LOG_MODE == "async":
+        log_writer.start()
+    if shadow_scorer is not None:
+        shadow_scorer.start()
+    if EXECUTION_MODE in ("thread", "process"):
+        inference_pool = InferencePool(
+            EXECUTION_MODE,
+            workers=INFERENCE_WORKERS,
+            max_queue=INFERENCE_MAX_QUEUE,
+            initargs=_pool_artifacts(_promoted("production")),
+        )
+        threading.Thread(target=_prestart_pool, args=(inference_pool,), name="inference-startup", daemon=True).start()
+    if EXPLAIN_EXECUTION in ("thread", "process"):
+        explain_pool = InferencePool(
+            EXPLAIN_EXECUTION,
+            workers=EXPLAIN_WORKERS,
+            max_queue=EXPLAIN_MAX_QUEUE,
+            initargs=_explain_artifacts(_promoted("production")),
+            initializer=init_explain_worker,
+            name="explain",
+        )
+        threading.Thread(target=_prestart_pool, args=(explain_pool,), name="explain-startup", daemon=True).start()
+    yield
+    if registry_watcher is not None:
+        registry_watcher.close()
+    if inference_pool is not None:
+        inference_pool.shutdown()
+        inference_pool = None
+    if explain_pool is not None:
+        explain_pool.shutdown()
+        explain_pool = None
+    if shadow_scorer is not None:
+        shadow_scorer.close()
+    if slow_profiler is not None:
+        slow_profiler.close()
+        slow_profiler = None
+    # Flush queued prediction_log rows before the process exits
+    log_writer.close()
+
+
+app = FastAPI(title="Telco Churn Scoring API", version="1.0.0", lifespan=lifespan)
+
+_route_paths: set = set()
+
+
+async def _instrument(request: Request, call_next):
+    # Request counters / latency / in-flight gauge, and the slow-request profiler hook
+    if not _route_paths:
+        _route_paths.update(r.path for r in app.routes)
+    endpoint = request.url.path if request.url.path in _route_paths else "other"
+    request.state.start = start = time.perf_counter()
+    profiled = slow_profiler.begin() if slow_profiler is not None else None
+
+    if METRICS_ENABLED:
+        IN_FLIGHT.inc(endpoint)
+    status = "exception"
+    try:
+        response = await call_next(request)
+        status = str(response.status_code)
+        return response
+    finally:
+        if METRICS_ENABLED:
+            IN_FLIGHT.dec(endpoint)
+            REQUEST_SECONDS.observe(endpoint, value=time.perf_counter() - start)
+            REQUESTS.inc(endpoint, status)
+            if status == "exception" or int(status) >= 400:
+                ERRORS.inc(endpoint, status)
+        if profiled is not None:
+            slow_profiler.end(profiled, endpoint)
+
+
+# Not installed at all when both are off, so the disabled cost is zero
+if METRICS_ENABLED or SLOW_REQUEST_MS > 0:
+    app.middleware("http")(_instrument)
+
+
+@app.get("/health")
+def health():
+    # Liveness only: the process is up (see /ready for "can score")
+    return {"status": "ok"}
+
+
+@app.get("/ready")
+def ready():
+    """200 once artifacts are loaded and warmed up, 503 before (or if startup failed)."""
+    if not startup_state["ready"]:
+        raise HTTPException(
+            status_code=503,
+            detail={"status": "error" if startup_state["error"] else "loading", "error": startup_state["error"]},
+            headers={"Retry-After": "1"},
+        )
+    return {"status": "ready", "version": bundle.version, "startup_s": bundle.timings}
+
+
+def _require_ready() -> None:
+    if not startup_state["ready"]:
+        raise HTTPException(status_code=503, detail="model is loading", headers={"Retry-After": "1"})
+
+
+async def _pool_score(features: List[Dict[str, Any]], b: ModelBundle) -> List[float]:
+    # Churn probabilities from the dedicated inference pool; 503 instead of queueing when it is full
+    try:
+        return await inference_pool.run(score_records, features, _pool_artifacts(b.version))
+    except PoolSaturated as e:
+        raise HTTPException(
+            status_code=503,
+            detail={"error": "inference pool saturated", **e.stats},
+            headers={"Retry-After": "1"},
+        )
+
+
+async def _score_async(req: PredictRequest, features: Dict[str, Any], b: ModelBundle) -> float:
+    # Churn probability via whichever execution path is configured
+    if batcher is not None:
+        return await batcher.submit((req, b))
+
+    if inference_pool is not None:
+        return (await _pool_score([features], b))[0]
+
+    return await run_in_threadpool(_predict_proba_one, req, b)
+
+
+@app.post("/predict", response_model=PredictResponse)
+async def predict(req: PredictRequest, request: Request):
+    _require_ready()
+    if METRICS_ENABLED:
+        # Arrival -> handler entry: body read, JSON decode, pydantic validation
+        _stage_hist["parse"].observe(time.perf_counter() - request.state.start)
+        PREDICTIONS.inc("/predict", req.mode)
+    features = req.model_dump(exclude={"mode"})
+    b = get_bundle()
+
+    cache_key = f"{b.version}:{payload_key(features)}" if prediction_cache is not None else None
+    churn_probability = prediction_cache.get(cache_key) if cache_key else None
+    if churn_probability is None:
+        with _stage("score"):
+            churn_probability = await _score_async(req, features, b)
+        if cache_key:
+            prediction_cache.put(cache_key, churn_probability)
+
+    pending: List[LogRecord] = []
+    response = _respond(req, churn_probability, b, pending)
+    await _log_predictions_async(pending)
+    return response
+
+
+@app.post("/predict/batch", response_model=List[PredictResponse])
+async def predict_batch(request: Request):
+    """
+    Score N customers in one call. Body is a JSON array of PredictRequest
+    objects, or NDJSON with Content-Type: application/x-ndjson.
+    Results are returned in input order.
+    """
+    _require_ready()
+    with _stage("parse"):
+        body = await request.body()
+        payloads = _parse_batch_body(body, request.headers.get("content-type", ""))
+    if METRICS_ENABLED:
+        for mode, n in Tally(p.mode for p in payloads).items():
+            PREDICTIONS.inc("/predict/batch", mode, amount=n)
+    if inference_pool is None or not payloads:
+        # CPU-bound sklearn work runs off the event loop
+        return await run_in_threadpool(_score_batch, payloads)
+
+    # Same bounded pool (and 503 when saturated) as /predict; one call for the whole batch
+    b = get_bundle()
+    with _stage("score"):
+        probabilities = await _pool_score([p.model_dump(exclude={"mode"}) for p in payloads], b)
+    return await run_in_threadpool(_respond_batch, payloads, probabilities, b)
+
+
+def _require_explain() -> None:
+    if explain_pool is None:
+        raise HTTPException(status_code=501, detail="explanations are disabled (EXPLAIN_EXECUTION=off)")
+
+
+async def _explain_rows(features: List[Dict[str, Any]], b: ModelBundle) -> List[tuple]:
+    """(probability, base_value, contributions) per row; cache misses go to the explain pool in one call."""
+    keys = [f"{b.version}:{payload_key(f)}" for f in features] if explain_cache is not None else None
+    rows = [explain_cache.get(k) for k in keys] if keys else [None] * len(features)
+    missing = [i for i, r in enumerate(rows) if r is None]
+    if not missing:
+        return rows
+
+    try:
+        probabilities, base_value, contributions = await explain_pool.run(
+            explain_records, [features[i] for i in missing], _explain_artifacts(b.version)
+        )
+    except PoolSaturated as e:
+        raise HTTPException(
+            status_code=503,
+            detail={"error": "explain pool saturated", **e.stats},
+            headers={"Retry-After": "1"},
+        )
+    except RuntimeError as e:  # explainer unavailable for this model, or the pool died
+        raise HTTPException(status_code=503, detail=str(e))
+
+    for i, p, c in zip(missing, probabilities, contributions):
+        rows[i] = (p, base_value, c)
+        if keys:
+            explain_cache.put(keys[i], rows[i])
+    return rows
+
+
+def _explained(response: PredictResponse, row: tuple, features: Dict[str, Any], top_k: int) -> ExplainResponse:
+    _, base_value, contributions = row
+    return ExplainResponse(
+        **response.model_dump(),
+        base_value=base_value,
+        drivers=top_drivers(EXPLAIN_FIELDS, contributions, features, top_k),
+    )
+
+
+@app.post("/predict/explain", response_model=ExplainResponse)
+async def predict_explain(req: PredictRequest, top_k: int = Query(EXPLAIN_TOP_K, ge=1, le=len(EXPLAIN_FIELDS))):
+    """
+    Score one customer and return its `top_k` SHAP drivers, aggregated to
+    PredictRequest fields. Logged like /predict.
+    """
+    _require_ready()
+    _require_explain()
+    if METRICS_ENABLED:
+        PREDICTIONS.inc("/predict/explain", req.mode)
+    b = get_bundle()
+    features = req.model_dump(exclude={"mode"})
+    [row] = await _explain_rows([features], b)
+
+    pending: List[LogRecord] = []
+    response = _respond(req, row[0], b, pending)
+    await _log_predictions_async(pending)
+    return _explained(response, row, features, top_k)
+
+
+@app.post("/predict/explain/batch", response_model=List[ExplainResponse])
+async def predict_explain_batch(
+    request: Request, top_k: int = Query(EXPLAIN_TOP_K, ge=1, le=len(EXPLAIN_FIELDS)),
+):
+    """
+    /predict/explain for up to MAX_EXPLAIN_BATCH customers (same body formats
+    as /predict/batch), explained in one vectorized SHAP call.
+    """
+    _require_ready()
+    _require_explain()
+    with _stage("parse"):
+        body = await request.body()
+        payloads = _parse_batch_body(body, request.headers.get("content-type", ""), max_rows=MAX_EXPLAIN_BATCH)
+    if METRICS_ENABLED:
+        for mode, n in Tally(p.mode for p in payloads).items():
+            PREDICTIONS.inc("/predict/explain/batch", mode, amount=n)
+    b = get_bundle()
+    features = [p.model_dump(exclude={"mode"}) for p in payloads]
+    rows = await _explain_rows(features, b)
+
+    responses = await run_in_threadpool(_respond_batch, payloads, [r[0] for r in rows], b)
+    return [_explained(resp, row, f, top_k) for resp, row, f in zip(responses, rows, features)]
+
+
+# ------------------------
+# Dashboard aggregates
+# ------------------------
+# Computed in SQLite, cached until the training snapshot changes (see api/insights.py)
+training_aggregates = TrainingAggregates(DB_PATH)
+
+
+def _insight(name: str) -> Dict[str, Any]:
+    aggregates = training_aggregates.get()
+    return {
+        "source": aggregates["source"],
+        "snapshot_date": aggregates["snapshot_date"],
+        "stale": aggregates["stale"],
+        "groups": aggregates[name],
+    }
+
+
+@app.get("/insights/churn_by_contract")
+def insights_churn_by_contract():
+    return _insight("churn_by_contract")
+
+
+@app.get("/insights/churn_by_tenure_band")
+def insights_churn_by_tenure_band():
+    return _insight("churn_by_tenure_band")
+
+
+@app.get("/insights/monthly_charges_by_churn")
+def insights_monthly_charges_by_churn():
+    """Box plot statistics per churn_target: quartiles, whisker fences, outlier counts."""
+    return _insight("monthly_charges_by_churn")
+
+
 @app.get("/")
 def root():
     return {"message": "Telco Churn API is running. Visit /docs to test /predict."}
 
+def _collect_components() -> None:
+    for stat, value in log_writer.stats().items():
+        COMPONENTS.set("log_writer", stat, value=value)
+    if inference_pool is not None:
+        for stat in ("in_flight", "queue_depth", "completed", "failed", "rejected"):
+            COMPONENTS.set("inference_pool", stat, value=inference_pool.stats()[stat])
+    if prediction_cache is not None:
+        cache_stats = prediction_cache.stats()
+        for stat in ("size", "hits", "misses", "evictions"):
+            COMPONENTS.set("prediction_cache", stat, value=cache_stats[stat])
+    if explain_pool is not None:
+        for stat in ("in_flight", "queue_depth", "completed", "failed", "rejected"):
+            COMPONENTS.set("explain_pool", stat, value=explain_pool.stats()[stat])
+    if explain_cache is not None:
+        cache_stats = explain_cache.stats()
+        for stat in ("size", "hits", "misses", "evictions"):
+            COMPONENTS.set("explain_cache", stat, value=cache_stats[stat])
+    if registry_watcher is not None:
+        COMPONENTS.set("model_registry", "swaps", value=registry_watcher.swaps)
+    insight_stats = training_aggregates.stats()
+    for stat in ("hits", "refreshes"):
+        COMPONENTS.set("insights", stat, value=insight_stats[stat])
+    if shadow_scorer is not None:
+        shadow_stats = shadow_scorer.stats()
+        for stat in ("queue_depth", "scored", "dropped", "failed"):
+            COMPONENTS.set("shadow", stat, value=shadow_stats[stat])
+
+
+metrics_registry.add_collector(_collect_components)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus text exposition (format 0.0.4)."""
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/monitoring/slow_requests")
+def monitoring_slow_requests(limit: Optional[int] = None):
+    """Stack samples of the most recent requests slower than SLOW_REQUEST_MS, newest first."""
+    if slow_profiler is None:
+        return {"enabled": False}
+    return {
+        "enabled": True,
+        "threshold_ms": SLOW_REQUEST_MS,
+        "interval_ms": PROFILER_INTERVAL_MS,
+        "reports": slow_profiler.recent(limit),
+    }
+
+
+@app.get("/monitoring/log_writer")
+def monitoring_log_writer():
+    return {"mode": PREDICTION_LOG_MODE, "running": log_writer.running, **log_writer.stats()}
+
+
+@app.get("/monitoring/batching")
+def monitoring_batching():
+    if batcher is None:
+        return {"enabled": False}
+    return {"enabled": True, **batcher.stats()}
+
+
+@app.get("/monitoring/inference_pool")
+def monitoring_inference_pool():
+    if inference_pool is None:
+        return {"mode": EXECUTION_MODE, "enabled": False}
+    return {"mode": EXECUTION_MODE, "enabled": True, **inference_pool.stats()}
+
+
+@app.get("/monitoring/cache")
+def monitoring_cache():
+    if prediction_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **prediction_cache.stats()}
+
+
+@app.get("/monitoring/explain")
+def monitoring_explain():
+    if explain_pool is None:
+        return {"mode": EXPLAIN_EXECUTION, "enabled": False}
+    return {
+        "mode": EXPLAIN_EXECUTION,
+        "enabled": True,
+        "method": EXPLAIN_METHOD,
+        "pool": explain_pool.stats(),
+        "cache": explain_cache.stats() if explain_cache is not None else {"enabled": False},
+    }
+
+
+@app.get("/monitoring/model")
+def monitoring_model():
+    """Served version + thresholds, registry watcher state, and shadow-vs-served agreement."""
+    b = bundle
+    return {
+        "version": b.version if b is not None else None,
+        "thresholds": b.thresholds if b is not None else None,
+        "registry": {"dir": str(MODEL_REGISTRY_DIR), "enabled": registry_watcher is not None,
+                     **(registry_watcher.stats() if registry_watcher is not None else {})},
+        "shadow": {"enabled": shadow_scorer is not None,
+                   **(shadow_scorer.stats() if shadow_scorer is not None else {})},
+    }
+
+
+def _as_utc(ts: Optional[datetime]) -> Optional[datetime]:
+    if ts is None:
+        return None
+    return ts.replace(tzinfo=timezone.utc) if ts.tzinfo is None else ts.astimezone(timezone.utc)
+
+
+@app.get("/monitoring/drift")
+def monitoring_drift():
+    """PSI / KS of live traffic vs the training reference, per feature and window (from sketches only)."""
+    if drift_monitor is None:
+        return {"enabled": False}
+    return {
+        "enabled": True,
+        "reference": {
+            "created_at_utc": drift_monitor.reference.get("created_at_utc"),
+            "n_rows": drift_monitor.reference.get("n_rows"),
+        },
+        "features": drift_monitor.report(),
+    }
+
+
 @app.get("/monitoring/summary")
-def monitoring_summary(limit: int = 1000):
+def monitoring_summary(
+    limit: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    minutes: int = 60,
+):
+    """
+    Prediction aggregates for the window [start, end) (default: the last
+    `minutes`), answered from the minute/hour rollups. `limit` keeps the
+    original behaviour: the last `limit` raw prediction_log rows.
+    """
+    if limit is None:
+        end = _as_utc(end) or datetime.now(timezone.utc)
+        start = _as_utc(start) or end - timedelta(minutes=minutes)
+        if start >= end:
+            raise HTTPException(status_code=422, detail="start must be before end")
+
+        _ensure_monitoring_schema(DB_PATH)
+        conn = sqlite3.connect(DB_PATH)
+        groups = query_rollups(conn, start, end)
+        conn.close()
+
+        by_flag: Dict[int, List[float]] = {}
+        for g in groups:
+            acc = by_flag.setdefault(g["churn_flag"], [0, 0.0])
+            acc[0] += g["count"]
+            acc[1] += g["avg_probability"] * g["count"]
+
+        return {
+            "window": {"start": start.isoformat(), "end": end.isoformat()},
+            "by_flag": [
+                {"churn_flag": flag, "avg_probability": s / n, "count": n}
+                for flag, (n, s) in sorted(by_flag.items())
+            ],
+            "by_mode_flag": groups,
+            "histogram_edges": [k / HIST_BUCKETS for k in range(HIST_BUCKETS + 1)],
+        }
+
+    _ensure_monitoring_schema(DB_PATH)
     conn = sqlite3.connect(DB_PATH)
     cur = conn.cursor()
     rows = cur.execute(
         """
         SELECT churn_flag, AVG(churn_probability) AS avg_prob, COUNT(*) AS n
-        FROM (SELECT * FROM prediction_log ORDER BY id DESC LIMIT ?)
+        FROM (SELECT * FROM prediction_log WHERE is_shadow = 0 ORDER BY id DESC LIMIT ?)
         GROUP BY churn_flag
         """,
         (limit,),
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, List, Sequence, Set, Union
+
+from fastapi.concurrency import run_in_threadpool
+
+from api.metrics import Histogram
+
+BATCH_SIZE_BUCKETS = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512]
+QUEUE_WAIT_MS_BUCKETS = [0.1, 0.25, 0.5, 1, 2, 5, 10, 25, 50, 100]
+
+
+class MicroBatcher:
+    """
+    Dynamic request coalescing for single-row scoring.
+
+    Concurrent `submit()` calls are gathered for up to `window_ms` or until
+    `max_batch` items are waiting, scored with one call to `score_fn`, and
+    each caller's future is resolved with its own result. A plain `score_fn`
+    runs in the threadpool so the event loop stays free; a coroutine function
+    is awaited directly (e.g. to hand the batch to an executor of its own).
+    """
+
+    def __init__(
+        self,
+        score_fn: Callable[[List[Any]], Union[Sequence[Any], Awaitable[Sequence[Any]]]],
+        window_ms: float = 2.0,
+        max_batch: int = 64,
+    ):
+        self.score_fn = score_fn
+        self._is_async = asyncio.iscoroutinefunction(score_fn)
+        self.window_s = window_ms / 1000.0
+        self.max_batch = max_batch
+
+        self._pending: List[tuple] = []  # (item, future, enqueued_at)
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.batch_size = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait_ms = Histogram(QUEUE_WAIT_MS_BUCKETS)
+
+    async def submit(self, item: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future, time.perf_counter()))
+
+        if len(self._pending) >= self.max_batch:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_s, self._dispatch)
+
+        return await future
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        task = asyncio.ensure_future(self._run(batch))
+        # Keep a reference until done so the task is not garbage-collected
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[tuple]) -> None:
+        started = time.perf_counter()
+        self.batch_size.observe(len(batch))
+        for _, _, enqueued_at in batch:
+            self.queue_wait_ms.observe((started - enqueued_at) * 1000)
+
+        try:
+            items = [item for item, _, _ in batch]
+            if self._is_async:
+                results = await self.score_fn(items)
+            else:
+                results = await run_in_threadpool(self.score_fn, items)
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():  # caller may have been cancelled (client disconnect)
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "window_ms": self.window_s * 1000,
+            "max_batch": self.max_batch,
+            "pending": len(self._pending),
+            "batch_size": self.batch_size.snapshot(),
+            "queue_wait_ms": self.queue_wait_ms.snapshot(),
+        }
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+from src.drift_reference import SCORE, bin_index, ks, n_bins, psi
+
+# Conventional PSI bands
+PSI_MODERATE = 0.1
+PSI_SIGNIFICANT = 0.25
+
+
+class SlidingBinCounts:
+    """
+    Bin counts over the last `window_s` seconds, kept as a ring of `slots`
+    sub-windows plus running totals: observe() is O(1) and expired slots
+    are subtracted from the totals as the ring advances.
+    """
+
+    def __init__(self, n_bins: int, window_s: float, slots: int = 60):
+        self.n_bins = n_bins
+        self.window_s = window_s
+        self.slot_s = window_s / slots
+        self._ring = [[0] * n_bins for _ in range(slots)]
+        self._slot_ids = [-1] * slots
+        self.totals = [0] * n_bins
+        self.count = 0
+
+    def _clear(self, i: int) -> None:
+        old = self._ring[i]
+        for b, c in enumerate(old):
+            if c:
+                self.totals[b] -= c
+                self.count -= c
+                old[b] = 0
+
+    def _advance(self, now: float) -> int:
+        slot_id = int(now // self.slot_s)
+        i = slot_id % len(self._ring)
+        if self._slot_ids[i] != slot_id:
+            # Slot reused for a newer sub-window: drop what it held
+            self._clear(i)
+            self._slot_ids[i] = slot_id
+        return i
+
+    def observe(self, bin_idx: int, now: float) -> None:
+        i = self._advance(now)
+        self._ring[i][bin_idx] += 1
+        self.totals[bin_idx] += 1
+        self.count += 1
+
+    def expire(self, now: float) -> None:
+        """Drop slots that fell out of the window (readers call this before using totals)."""
+        current = int(now // self.slot_s)
+        for i, slot_id in enumerate(self._slot_ids):
+            if slot_id != -1 and current - slot_id >= len(self._ring):
+                self._clear(i)
+                self._slot_ids[i] = -1
+
+
+class DriftMonitor:
+    """
+    Streaming drift sketches for the model score and selected inputs, one
+    SlidingBinCounts per (feature, window). Live values are binned with the
+    reference's own bins, so PSI / KS are computed from the counts alone.
+    """
+
+    def __init__(self, reference: Dict[str, Any], windows_s: Sequence[float], slots: int = 60):
+        self.reference = reference
+        self.specs = reference["features"]
+        self.windows_s = list(windows_s)
+        self._sketches = {
+            name: [SlidingBinCounts(n_bins(spec), w, slots) for w in self.windows_s]
+            for name, spec in self.specs.items()
+        }
+        self._lock = threading.Lock()
+
+    def observe(self, features: Mapping[str, Any], probability: float, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        bins = {
+            name: bin_index(spec, probability if name == SCORE else features.get(name))
+            for name, spec in self.specs.items()
+        }
+        with self._lock:
+            for name, b in bins.items():
+                for sketch in self._sketches[name]:
+                    sketch.observe(b, now)
+
+    def report(self, now: Optional[float] = None) -> Dict[str, Any]:
+        now = time.time() if now is None else now
+        with self._lock:
+            for sketches in self._sketches.values():
+                for sketch in sketches:
+                    sketch.expire(now)
+            counts = {
+                name: [(s.window_s, s.count, list(s.totals)) for s in sketches]
+                for name, sketches in self._sketches.items()
+            }
+
+        out: Dict[str, Any] = {}
+        for name, spec in self.specs.items():
+            expected = spec["proportions"]
+            per_window = []
+            for window_s, n, totals in counts[name]:
+                entry: Dict[str, Any] = {"window_s": window_s, "count": n, "psi": None, "ks": None, "status": "no_data"}
+                if n:
+                    actual = [c / n for c in totals]
+                    entry["psi"] = psi(expected, actual)
+                    if spec["type"] == "numeric":
+                        entry["ks"] = ks(expected, actual)
+                    entry["status"] = (
+                        "significant" if entry["psi"] >= PSI_SIGNIFICANT
+                        else "moderate" if entry["psi"] >= PSI_MODERATE
+                        else "stable"
+                    )
+                per_window.append(entry)
+            out[name] = per_window
+        return out
@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import joblib
+
+from src.fast_scorer import FastScorer
+from src.forest_evaluator import HybridForest, PackedForest
+
+logger = logging.getLogger("churn_api.executor")
+
+# Worker-local artifacts: one copy per worker thread / process
+_local = threading.local()
+
+# The _local attributes that make up one loaded version (the artifacts key last)
+SCORE_STATE = ("preprocessor", "model", "fast_scorer", "artifacts")
+EXPLAIN_STATE = ("explainer", "explain_error", "explain_fast_scorer", "explain_preprocessor", "explain_artifacts")
+
+
+class PoolSaturated(Exception):
+    """Raised instead of queueing when the inference pool is at capacity."""
+
+    def __init__(self, stats: Dict[str, Any]):
+        super().__init__("inference pool saturated")
+        self.stats = stats
+
+
+def init_worker(preprocessor_path: str, model_path: str, packed_model_dir: Optional[str],
+                mmap_mode: Optional[str] = None, version: Optional[str] = None, packed_max_rows: int = 0) -> None:
+    """
+    Executor initializer: load this worker's own preprocessor + model (packed
+    arrays mapped if mmap_mode; with packed_max_rows, the sklearn model too
+    for calls above that many rows).
+    """
+    preprocessor = joblib.load(preprocessor_path)
+    if packed_model_dir and Path(packed_model_dir).exists():
+        model = PackedForest.load(packed_model_dir, mmap_mode=mmap_mode)
+        if packed_max_rows > 0:
+            model = HybridForest(model, joblib.load(model_path), packed_max_rows)
+    else:
+        model = joblib.load(model_path)
+
+    try:
+        fast_scorer = FastScorer.from_preprocessor(preprocessor)
+    except ValueError:
+        fast_scorer = None
+
+    _local.preprocessor = preprocessor
+    _local.model = model
+    _local.fast_scorer = fast_scorer
+    _local.artifacts = (preprocessor_path, model_path, packed_model_dir, mmap_mode, version, packed_max_rows)
+
+
+def score_records(records: List[dict], artifacts: Optional[tuple] = None) -> List[float]:
+    """
+    Churn probabilities for raw feature dicts, using the worker's artifacts.
+    `artifacts` (init_worker's arguments) names the version the caller
+    expects; a worker still holding another one reloads first.
+    """
+    if artifacts is not None and artifacts != _local.artifacts:
+        _switch(init_worker, SCORE_STATE, artifacts)
+    if _local.fast_scorer is not None:
+        X_transformed = _local.fast_scorer.transform_records(records)
+    else:
+        import pandas as pd
+        X_transformed = _local.preprocessor.transform(pd.DataFrame(records))
+    return _local.model.predict_proba(X_transformed)[:, 1].tolist()
+
+
+def init_explain_worker(preprocessor_path: str, model_path: str, fields: tuple, method: str = "exact",
+                        version: Optional[str] = None) -> None:
+    """Executor initializer for explanations: this worker's preprocessor + one TreeExplainer over the model."""
+    from src.explainer import ChurnExplainer
+
+    preprocessor = joblib.load(preprocessor_path)
+    _local.explain_artifacts = (preprocessor_path, model_path, fields, method, version)
+    try:
+        _local.explainer = ChurnExplainer(preprocessor, joblib.load(model_path), fields, method=method)
+        _local.explain_error = None
+    except Exception as e:  # e.g. shap missing or not a tree model: report per call, keep the pool alive
+        _local.explainer = None
+        _local.explain_error = f"{type(e).__name__}: {e}"
+    try:
+        _local.explain_fast_scorer = FastScorer.from_preprocessor(preprocessor)
+    except ValueError:
+        _local.explain_fast_scorer = None
+    _local.explain_preprocessor = preprocessor
+
+
+def explain_records(records: List[dict], artifacts: Optional[tuple] = None):
+    """
+    (probabilities, base_value, contributions rows) for raw feature dicts, one
+    vectorized shap call. `artifacts` works as in score_records.
+    """
+    if artifacts is not None and artifacts != getattr(_local, "explain_artifacts", None):
+        _switch(init_explain_worker, EXPLAIN_STATE, artifacts)
+    if _local.explainer is None:
+        raise RuntimeError(f"explanations unavailable: {_local.explain_error}")
+    if not records:
+        return [], _local.explainer.base_value, []
+
+    if _local.explain_fast_scorer is not None:
+        X_transformed = _local.explain_fast_scorer.transform_records(records)
+    else:
+        import pandas as pd
+        X_transformed = _local.explain_preprocessor.transform(pd.DataFrame(records))
+    probabilities, contributions = _local.explainer.explain(X_transformed)
+    return probabilities.tolist(), _local.explainer.base_value, contributions.tolist()
+
+
+# Versions loading ahead of a swap: {worker thread ident: {state key: {"artifacts", "state"}}}
+_preloads: Dict[int, Dict[str, dict]] = {}
+_preloads_lock = threading.Lock()
+
+
+def _switch(init: Callable, state: tuple, artifacts: tuple) -> None:
+    """Make `artifacts` this worker's current version: its preloaded copy when ready, else load it now."""
+    with _preloads_lock:
+        entry = _preloads.get(threading.get_ident(), {}).pop(state[-1], None)
+    if entry is not None and entry["artifacts"] == artifacts and entry["state"] is not None:
+        for name, value in entry["state"].items():
+            setattr(_local, name, value)
+    else:
+        init(*artifacts)
+
+
+def _load_ahead(worker: int, init: Callable, state: tuple, artifacts: tuple) -> None:
+    # Background thread: init() fills this thread's own _local, which is then handed to the worker
+    try:
+        init(*artifacts)
+        loaded = {name: getattr(_local, name, None) for name in state}
+    except Exception as e:
+        loaded = {"error": f"{type(e).__name__}: {e}"}
+    with _preloads_lock:
+        entry = _preloads.get(worker, {}).get(state[-1])
+        if entry is not None and entry["artifacts"] == artifacts:
+            entry["state"] = None if "error" in loaded else loaded
+            entry["error"] = loaded.get("error")
+
+
+def preload_worker(artifacts: tuple, explain: bool = False) -> Tuple[str, bool]:
+    """
+    Start loading `artifacts` for this worker on a background thread, next to
+    the version it serves, which keeps answering calls meanwhile. The first
+    call naming the new version switches over without loading and drops the
+    old one. Returns (worker id, finished); call again to poll.
+    """
+    init, state = (init_explain_worker, EXPLAIN_STATE) if explain else (init_worker, SCORE_STATE)
+    key, worker = state[-1], threading.get_ident()
+    with _preloads_lock:
+        slot = _preloads.setdefault(worker, {})
+        entry = slot.get(key)
+        if getattr(_local, key, None) == artifacts:
+            finished = True
+        elif entry is not None and entry["artifacts"] == artifacts:
+            finished = entry["state"] is not None or entry.get("error") is not None
+        else:
+            slot[key] = {"artifacts": artifacts, "state": None}
+            threading.Thread(
+                target=_load_ahead, args=(worker, init, state, artifacts), name="preload", daemon=True,
+            ).start()
+            finished = False
+    return f"{os.getpid()}:{worker}", finished
+
+
+def _at_barrier(barrier, hold_s: float, fn: Callable, *args) -> Any:
+    # Run fn, then hold this worker until every call of the round has started, so each
+    # call lands on a different worker; a worker stuck on a long call breaks the barrier
+    result = fn(*args)
+    try:
+        barrier.wait(hold_s)
+    except threading.BrokenBarrierError:
+        pass
+    return result
+
+
+class InferencePool:
+    """
+    Dedicated, size-limited thread or process pool for CPU-bound scoring.
+
+    At most `workers + max_queue` calls are admitted at once; beyond that
+    `run()` raises PoolSaturated immediately so the API can answer 503
+    instead of building an unbounded backlog.
+    """
+
+    def __init__(self, kind: str, workers: int, max_queue: int, initargs: tuple,
+                 initializer: Callable = init_worker, name: str = "inference"):
+        if kind == "thread":
+            executor: Executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix=name,
+                initializer=initializer, initargs=initargs,
+            )
+        elif kind == "process":
+            # spawn: never fork a process that already runs writer/loop threads
+            executor = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                initializer=initializer, initargs=initargs,
+            )
+        else:
+            raise ValueError(f"Unknown pool kind: {kind!r}")
+
+        self.kind = kind
+        self.name = name
+        self.workers = workers
+        self.capacity = workers + max_queue
+        self._executor = executor
+
+        # Only touched from the event loop thread
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    async def run(self, fn: Callable, *args) -> Any:
+        if self.in_flight >= self.capacity:
+            self.rejected += 1
+            raise PoolSaturated(self.stats())
+
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._executor, partial(fn, *args))
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+        self.completed += 1
+        return result
+
+    def prestart(self) -> None:
+        """Start every worker now (runs the initializer) instead of on first use; blocks."""
+        futures = [self._executor.submit(time.sleep, 0.05) for _ in range(self.workers)]
+        for f in futures:
+            f.result()
+
+    def preload(self, fn: Callable, *args, rounds: int = 40, poll_s: float = 0.25, hold_s: float = 1.0) -> int:
+        """
+        Call `fn(*args)` -> (worker id, finished), e.g. preload_worker, once on
+        every worker per round, for at most `rounds` rounds `poll_s` apart,
+        until all report finished; blocks. A barrier holds each call (for at
+        most `hold_s`) until the whole round has started, which puts the calls
+        on distinct workers. `fn` only starts the work, so requests never queue
+        behind more than a round. Bypasses admission. Returns how many workers
+        finished; the others are logged and load on first use.
+        """
+        finished: Dict[str, bool] = {}
+        manager = multiprocessing.get_context("spawn").Manager() if self.kind == "process" else None
+        try:
+            for i in range(rounds):
+                barrier = manager.Barrier(self.workers) if manager else threading.Barrier(self.workers)
+                futures = [self._executor.submit(_at_barrier, barrier, hold_s, fn, *args) for _ in range(self.workers)]
+                for f in futures:
+                    worker, done = f.result()
+                    finished[worker] = finished.get(worker, False) or done
+                if len(finished) >= self.workers and all(finished.values()):
+                    break
+                if i < rounds - 1:
+                    time.sleep(poll_s)
+        finally:
+            if manager is not None:
+                manager.shutdown()
+
+        pending = sorted(w for w, done in finished.items() if not done)
+        unreached = self.workers - len(finished)
+        if pending or unreached > 0:
+            logger.warning("%s pool preload: %d worker(s) still loading %s, %d never reached after %d rounds",
+                           self.name, len(pending), pending, max(unreached, 0), rounds)
+        return sum(finished.values())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "in_flight": self.in_flight,
+            "queue_depth": max(0, self.in_flight - self.workers),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.feature_engineering import TENURE_BINS, TENURE_LABELS
+from src.load_star_schema import TRAINING_TABLE, TRAINING_VIEW, training_table_status
+
+QUARTILES = (0.25, 0.5, 0.75)
+WHISKER_IQR = 1.5  # box plot fences at Q1 - 1.5 IQR / Q3 + 1.5 IQR, as plotly draws them
+
+
+def tenure_band_sql(column: str = "tenure_months") -> str:
+    """
+    CASE expression with the same right-inclusive bins as TelecomFeatureEngineer
+    (pd.cut); anything else falls in the top band, as in sql/churn_analysis.sql.
+    """
+    whens = " ".join(
+        f"WHEN {column} > {lo} AND {column} <= {hi} THEN '{label}'"
+        for lo, hi, label in zip(TENURE_BINS[:-1], TENURE_BINS[1:], TENURE_LABELS)
+    )
+    return f"CASE {whens} ELSE '{TENURE_LABELS[-1]}' END"
+
+
+def _interpolate(values: Dict[int, float], n: int, q: float) -> float:
+    """Linear-interpolated quantile (numpy / plotly 'linear') from the two ranks around q * (n - 1)."""
+    pos = q * (n - 1)
+    lo = int(pos)
+    hi = min(lo + 1, n - 1)
+    return values[lo] + (values[hi] - values[lo]) * (pos - lo)
+
+
+class TrainingAggregates:
+    """
+    Dashboard aggregates over the training dataset, computed in SQLite and
+    cached until the underlying snapshot changes.
+
+    Reads the materialized churn_training_dataset when the DB has it (older
+    DBs: vw_churn_training_dataset). The cache key is a snapshot fingerprint
+    that costs a couple of index lookups: the etl_watermark rows written by
+    src/load_star_schema.py, or the newest fact row when there are none.
+    Every call re-checks it; the aggregates are recomputed only when it moved.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._fingerprint: Optional[tuple] = None
+        self._cached: Optional[Dict[str, Any]] = None
+        self.hits = 0
+        self.refreshes = 0
+        self.last_refresh_ms: Optional[float] = None
+
+    # ------------------------
+    # Snapshot
+    # ------------------------
+    @staticmethod
+    def _has_table(conn: sqlite3.Connection, name: str) -> bool:
+        return conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+        ).fetchone() is not None
+
+    def _snapshot(self, conn: sqlite3.Connection) -> Tuple[str, tuple]:
+        """(source relation, fingerprint of its current contents)."""
+        if self._has_table(conn, TRAINING_TABLE) and self._has_table(conn, "etl_watermark"):
+            marks = conn.execute(
+                "SELECT name, snapshot_date, updated_at_utc FROM etl_watermark ORDER BY name"
+            ).fetchall()
+            return TRAINING_TABLE, tuple(marks)
+        # MAX(rowid) is one b-tree seek; dims are only rewritten together with new facts by the loader
+        fact = conn.execute(
+            "SELECT MAX(snapshot_id), MAX(snapshot_date) FROM fact_customer_snapshot"
+        ).fetchone()
+        return TRAINING_VIEW, tuple(fact)
+
+    # ------------------------
+    # Aggregates
+    # ------------------------
+    @staticmethod
+    def _churn_by(conn: sqlite3.Connection, source: str, expr: str) -> List[Dict[str, Any]]:
+        rows = conn.execute(
+            f"""
+            SELECT {expr} AS grp, AVG(churn_target) AS churn_rate, COUNT(*) AS customers
+            FROM {source}
+            GROUP BY grp
+            ORDER BY grp
+            """
+        ).fetchall()
+        return [{"group": g, "churn_rate": float(rate), "customers": int(n)} for g, rate, n in rows]
+
+    @staticmethod
+    def _box_stats(conn: sqlite3.Connection, source: str, column: str) -> List[Dict[str, Any]]:
+        """Quartiles, whisker fences and outlier counts of `column` per churn_target; no raw rows leave SQLite."""
+        ranks = sorted({r for q in QUARTILES for r in (f"CAST({q} * (n - 1) AS INTEGER)",
+                                                       f"MIN(CAST({q} * (n - 1) AS INTEGER) + 1, n - 1)")})
+        rows = conn.execute(
+            f"""
+            WITH ranked AS (
+                SELECT churn_target AS grp, {column} AS v,
+                       ROW_NUMBER() OVER (PARTITION BY churn_target ORDER BY {column}) - 1 AS i,
+                       COUNT(*) OVER (PARTITION BY churn_target) AS n
+                FROM {source}
+                WHERE {column} IS NOT NULL
+            )
+            SELECT grp, n, i, v FROM ranked
+            WHERE i IN ({", ".join(ranks)})
+            ORDER BY grp, i
+            """
+        ).fetchall()
+
+        groups: Dict[int, Dict[str, Any]] = {}
+        for grp, n, i, v in rows:
+            groups.setdefault(grp, {"n": n, "values": {}})["values"][i] = float(v)
+
+        out = []
+        for grp, g in sorted(groups.items()):
+            n = g["n"]
+            q1, median, q3 = (_interpolate(g["values"], n, q) for q in QUARTILES)
+            lo, hi = q1 - WHISKER_IQR * (q3 - q1), q3 + WHISKER_IQR * (q3 - q1)
+            mn, mx, lower, upper, below, above = conn.execute(
+                f"""
+                SELECT MIN(v), MAX(v),
+                       MIN(CASE WHEN v >= :lo THEN v END), MAX(CASE WHEN v <= :hi THEN v END),
+                       SUM(v < :lo), SUM(v > :hi)
+                FROM (SELECT {column} AS v FROM {source} WHERE churn_target = :grp AND {column} IS NOT NULL)
+                """,
+                {"lo": lo, "hi": hi, "grp": grp},
+            ).fetchone()
+            out.append({
+                "churn_target": int(grp),
+                "count": int(n),
+                "min": float(mn),
+                "q1": q1,
+                "median": median,
+                "q3": q3,
+                "max": float(mx),
+                "lower_fence": float(lower),
+                "upper_fence": float(upper),
+                "outliers_below": int(below),
+                "outliers_above": int(above),
+            })
+        return out
+
+    def _compute(self, conn: sqlite3.Connection, source: str) -> Dict[str, Any]:
+        status = training_table_status(conn.cursor()) if source == TRAINING_TABLE else None
+        return {
+            "source": source,
+            "stale": bool(status and status["stale"]),
+            "snapshot_date": conn.execute(f"SELECT MAX(snapshot_date) FROM {source}").fetchone()[0],
+            "churn_by_contract": self._churn_by(conn, source, "contract_type"),
+            "churn_by_tenure_band": self._churn_by(conn, source, tenure_band_sql()),
+            "monthly_charges_by_churn": self._box_stats(conn, source, "monthly_charges"),
+        }
+
+    def get(self) -> Dict[str, Any]:
+        """All aggregates, recomputed only when the snapshot fingerprint changed since the last call."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            source, fingerprint = self._snapshot(conn)
+            with self._lock:
+                if self._cached is not None and fingerprint == self._fingerprint:
+                    self.hits += 1
+                    return self._cached
+                # Under the lock: concurrent first requests compute once
+                start = time.perf_counter()
+                self._cached = self._compute(conn, source)
+                self._fingerprint = fingerprint
+                self.refreshes += 1
+                self.last_refresh_ms = (time.perf_counter() - start) * 1000
+                return self._cached
+        finally:
+            conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "cached": self._cached is not None,
+                "source": self._cached["source"] if self._cached else None,
+                "snapshot_date": self._cached["snapshot_date"] if self._cached else None,
+                "hits": self.hits,
+                "refreshes": self.refreshes,
+                "last_refresh_ms": self.last_refresh_ms,
+            }
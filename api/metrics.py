@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Sequence, Tuple
+
+
+class Histogram:
+    """Fixed-bucket histogram (cumulative 'le' buckets, Prometheus-style)."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = sorted(float(b) for b in buckets)
+        self._counts = [0] * (len(self.buckets) + 1)  # last slot = +Inf
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[i] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+
+        cumulative, running = {}, 0
+        for le, c in zip([*map(str, self.buckets), "+Inf"], counts):
+            running += c
+            cumulative[le] = running
+        return {"buckets": cumulative, "count": count, "sum": total}
+
+
+# ------------------------
+# Prometheus exposition
+# ------------------------
+def _escape(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_str(names: Sequence[str], values: Sequence[object], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    """Monotonic counter with one value per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels) -> float:
+        with self._lock:
+            return self._values.get(labels, 0.0)
+
+    def lines(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_label_str(self.labelnames, k)} {float(v)!r}" for k, v in items]
+
+
+class Gauge(Counter):
+    """Value that goes up and down (in-flight requests, queue depth)."""
+
+    kind = "gauge"
+
+    def dec(self, *labels, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels, value: float) -> None:
+        with self._lock:
+            self._values[labels] = float(value)
+
+
+class HistogramFamily:
+    """One Histogram per label set, rendered as _bucket / _sum / _count series."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = buckets
+        self._children: Dict[Tuple, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *labels) -> Histogram:
+        child = self._children.get(labels)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(labels, Histogram(self.buckets))
+        return child
+
+    def observe(self, *labels, value: float) -> None:
+        self.labels(*labels).observe(value)
+
+    def lines(self) -> List[str]:
+        with self._lock:
+            children = sorted(self._children.items())
+        out = []
+        for key, hist in children:
+            snap = hist.snapshot()
+            for le, n in snap["buckets"].items():
+                le_label = f'le="{le}"'
+                out.append(f"{self.name}_bucket{_label_str(self.labelnames, key, le_label)} {n}")
+            out.append(f"{self.name}_sum{_label_str(self.labelnames, key)} {float(snap['sum'])!r}")
+            out.append(f"{self.name}_count{_label_str(self.labelnames, key)} {snap['count']}")
+        return out
+
+
+class Registry:
+    """
+    Metrics rendered together in the Prometheus text format (version 0.0.4).
+    Collectors are callables run at scrape time, for values that already
+    live elsewhere (queue depths, pool stats).
+    """
+
+    def __init__(self):
+        self._metrics: List[object] = []
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, fn: Callable[[], None]) -> None:
+        self._collectors.append(fn)
+
+    def render(self) -> str:
+        for fn in self._collectors:
+            fn()
+        out = []
+        for m in self._metrics:
+            out.append(f"# HELP {m.name} {m.help}")
+            out.append(f"# TYPE {m.name} {m.kind}")
+            out.extend(m.lines())
+        return "\n".join(out) + "\n"
+
+
+class StageTimer:
+    """`with StageTimer(hist):` observes the block's wall time in seconds."""
+
+    __slots__ = ("_hist", "_start")
+
+    def __init__(self, hist: Histogram):
+        self._hist = hist
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._hist.observe(time.perf_counter() - self._start)
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import joblib
+
+from src.model_registry import STAGES, current_version
+
+logger = logging.getLogger("churn_api")
+
+# Synthetic customer used to warm up the scoring paths (never logged)
+WARMUP_RECORD = {
+    "gender": "Female", "senior_citizen": 0, "partner": "Yes", "dependents": "No",
+    "country": "United States", "state": "California",
+    "contract_type": "Month-to-month", "paperless_billing": "Yes",
+    "payment_method": "Electronic check",
+    "phone_service": "Yes", "multiple_lines": "No", "internet_service": "Fiber optic",
+    "online_security": "No", "online_backup": "No", "device_protection": "No",
+    "tech_support": "No", "streaming_tv": "Yes", "streaming_movies": "Yes",
+    "tenure_months": 12, "monthly_charges": 80.0, "total_charges": 960.0, "cltv": 3500.0,
+}
+
+
+class ModelBundle:
+    """
+    Everything the scoring paths need from the artifacts, built once and
+    swapped in as a unit: the fitted preprocessor, the sklearn model (None
+    when a shared packed forest is served), the model actually used for
+    predict_proba (sklearn or packed) and the optional FastScorer.
+    `timings` holds the load phases in seconds; `version` is the registry
+    version (None for the unversioned artifacts/ files) and `thresholds`
+    the decision threshold per mode that goes with this model.
+    """
+
+    def __init__(self, preprocessor, model, scoring_model, fast_scorer, timings: Dict[str, float],
+                 version: Optional[str] = None, thresholds: Optional[Dict[str, float]] = None):
+        self.preprocessor = preprocessor
+        self.model = model
+        self.scoring_model = scoring_model
+        self.fast_scorer = fast_scorer
+        self.timings = timings
+        self.version = version
+        self.thresholds = thresholds or {}
+
+
+@contextmanager
+def timed(timings: Dict[str, float], phase: str):
+    start = time.perf_counter()
+    yield
+    timings[phase] = time.perf_counter() - start
+    logger.info("startup: %s took %.3fs", phase, timings[phase])
+
+
+def timed_load(timings: Dict[str, float], phase: str, path: Path, **kwargs):
+    with timed(timings, phase):
+        return joblib.load(path, **kwargs)
+
+
+def load_artifacts(preprocessor_path: Path, model_path: Path, timings: Dict[str, float],
+                   parallel: bool = True, mmap_mode: Optional[str] = None):
+    """
+    joblib.load both artifacts, concurrently when `parallel` (file reads and
+    array copies overlap with unpickling). With mmap_mode="r" the model's
+    NumPy arrays are mapped from an uncompressed joblib file instead of read.
+    """
+    with timed(timings, "load_artifacts"):
+        if not parallel:
+            return (
+                timed_load(timings, "load_preprocessor", preprocessor_path),
+                timed_load(timings, "load_model", model_path, mmap_mode=mmap_mode),
+            )
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="artifact-load") as pool:
+            prep = pool.submit(timed_load, timings, "load_preprocessor", preprocessor_path)
+            clf = pool.submit(timed_load, timings, "load_model", model_path, mmap_mode=mmap_mode)
+            return prep.result(), clf.result()
+
+
+def warmup_records(n: int) -> List[Dict[str, Any]]:
+    # Spread tenure / charges so every tenure band and tree path family is touched
+    return [
+        {**WARMUP_RECORD, "tenure_months": (7 * i) % 73, "monthly_charges": 20.0 + (i % 10) * 10.0,
+         "total_charges": 20.0 + ((7 * i) % 73) * (20.0 + (i % 10) * 10.0)}
+        for i in range(n)
+    ]
+
+
+def warm_up(bundle: ModelBundle, rows: int) -> None:
+    """
+    Score synthetic rows through every path the API uses (fast single row,
+    fast batch, pandas batch) so sklearn/pandas lazy imports and first-call
+    costs are paid before the instance reports ready.
+    """
+    import pandas as pd
+
+    records = warmup_records(rows)
+    if bundle.fast_scorer is not None:
+        bundle.scoring_model.predict_proba(bundle.fast_scorer.transform_record(records[0]))
+        bundle.scoring_model.predict_proba(bundle.fast_scorer.transform_records(records))
+    bundle.scoring_model.predict_proba(bundle.preprocessor.transform(pd.DataFrame(records[:1])))
+    bundle.scoring_model.predict_proba(bundle.preprocessor.transform(pd.DataFrame(records)))
+
+
+class RegistryWatcher:
+    """
+    Polls the model registry's stage pointers (src/model_registry.py) every
+    `poll_s` seconds from a daemon thread and calls `on_change(stage,
+    version)` there whenever a stage points somewhere new, so loading and
+    warming a version never happens on a request thread. A version that
+    fails to load is not retried until its pointer changes again.
+    """
+
+    def __init__(self, registry_dir: Path, on_change: Callable[[str, Optional[str]], None],
+                 poll_s: float = 5.0, seen: Optional[Dict[str, Optional[str]]] = None,
+                 stages: Sequence[str] = STAGES):
+        self.registry_dir = registry_dir
+        self.on_change = on_change
+        self.poll_s = poll_s
+        self.stages = list(stages)
+        self.seen: Dict[str, Optional[str]] = {stage: None for stage in self.stages}
+        self.seen.update(seen or {})
+        self.errors: Dict[str, str] = {}
+        self.swaps = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def check(self) -> None:
+        for stage in self.stages:
+            try:
+                version = current_version(stage, self.registry_dir)
+            except (OSError, ValueError, KeyError) as e:  # unreadable pointer: keep serving
+                self.errors[stage] = repr(e)
+                continue
+            if version == self.seen[stage]:
+                continue
+            self.seen[stage] = version
+            try:
+                self.on_change(stage, version)
+            except Exception as e:
+                logger.exception("registry: failed to switch %s to %s", stage, version)
+                self.errors[stage] = repr(e)
+                continue
+            self.errors.pop(stage, None)
+            self.swaps += 1
+
+    def _run(self) -> None:
+        self.check()
+        while not self._stop.wait(self.poll_s):
+            self.check()
+
+    def start(self) -> None:
+        if self.poll_s <= 0:
+            self.check()  # startup only: pick up a shadow candidate, never re-check
+            return
+        self._thread = threading.Thread(target=self._run, name="registry-watcher", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"poll_s": self.poll_s, "versions": dict(self.seen), "swaps": self.swaps, "errors": dict(self.errors)}
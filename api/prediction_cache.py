@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Hashable, Iterable, Optional
+
+
+def payload_key(features: dict) -> str:
+    """Stable hash of a canonicalized feature payload (sorted keys, compact JSON)."""
+    canonical = json.dumps(features, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def artifact_fingerprint(paths: Iterable[Path]) -> tuple:
+    """(path, mtime_ns, size) for each artifact; changes whenever a file is replaced."""
+    out = []
+    for p in paths:
+        p = Path(p)
+        try:
+            st = p.stat()
+            out.append((str(p), st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            out.append((str(p), None, None))
+    return tuple(out)
+
+
+class PredictionCache:
+    """
+    Bounded LRU cache of churn probabilities keyed by `payload_key`.
+
+    Entries optionally expire after `ttl_s`. `version_fn` (e.g. an artifact
+    fingerprint) is re-checked at most every `check_interval_s`; when it
+    changes the whole cache is invalidated.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10_000,
+        ttl_s: Optional[float] = None,
+        version_fn: Optional[Callable[[], Hashable]] = None,
+        check_interval_s: float = 5.0,
+    ):
+        self.max_size = max_size
+        self.ttl_s = ttl_s
+        self.version_fn = version_fn
+        self.check_interval_s = check_interval_s
+
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (value, stored_at)
+        self._lock = threading.Lock()
+        self._version = version_fn() if version_fn else None
+        self._last_check = time.monotonic()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _check_version(self, now: float) -> None:
+        if self.version_fn is None or now - self._last_check < self.check_interval_s:
+            return
+        self._last_check = now
+        version = self.version_fn()
+        if version != self._version:
+            self._version = version
+            self._data.clear()
+            self.invalidations += 1
+
+    def get(self, key: str) -> Optional[float]:
+        now = time.monotonic()
+        with self._lock:
+            self._check_version(now)
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, stored_at = entry
+            if self.ttl_s is not None and now - stored_at > self.ttl_s:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: float) -> None:
+        with self._lock:
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "ttl_s": self.ttl_s,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
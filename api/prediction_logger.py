@@ -0,0 +1,415 @@
+from __future__ import annotations
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("churn_api.prediction_log")
+
+# (ts_utc, request_id, mode, threshold, churn_probability, churn_flag, model_version, is_shadow)
+# Shadow rows share the request_id of the served row they were scored alongside.
+LogRecord = Tuple[str, str, str, float, float, int, Optional[str], int]
+
+INSERT_SQL = """
+    INSERT INTO prediction_log
+        (ts_utc, request_id, mode, threshold, churn_probability, churn_flag, model_version, is_shadow)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Columns added after the original prediction_log schema (sql/monitoring.sql)
+LOG_COLUMNS_ADDED = {"model_version": "TEXT", "is_shadow": "INTEGER NOT NULL DEFAULT 0"}
+
+_STOP = object()
+
+# ------------------------
+# Rollups
+# ------------------------
+# Fixed-width probability histogram: bucket k covers [k/10, (k+1)/10), 1.0 -> last bucket
+HIST_BUCKETS = 10
+HIST_COLS = [f"h{k}" for k in range(HIST_BUCKETS)]
+
+# Rollup table -> length of the ts_utc prefix used as its bucket key
+# ("2026-01-28T14:05" per minute, "2026-01-28T14" per hour)
+ROLLUP_TABLES = {"prediction_rollup_minute": 16, "prediction_rollup_hour": 13}
+
+ROLLUP_VALUE_COLS = ["n", "prob_sum", "prob_sumsq"] + HIST_COLS
+
+MONITORING_SQL = "\n".join(
+    f"""
+    CREATE TABLE IF NOT EXISTS {table} (
+        bucket TEXT NOT NULL,
+        mode TEXT NOT NULL,
+        churn_flag INTEGER NOT NULL,
+        n INTEGER NOT NULL,
+        prob_sum REAL NOT NULL,
+        prob_sumsq REAL NOT NULL,
+        {", ".join(f"{h} INTEGER NOT NULL" for h in HIST_COLS)},
+        PRIMARY KEY (bucket, mode, churn_flag)
+    );
+    """
+    for table in ROLLUP_TABLES
+) + """
+    CREATE INDEX IF NOT EXISTS idx_prediction_log_ts ON prediction_log(ts_utc);
+"""
+
+
+def _hist_bucket(p: float) -> int:
+    return min(max(int(p * HIST_BUCKETS), 0), HIST_BUCKETS - 1)
+
+
+def _rollup_upsert_sql(table: str) -> str:
+    cols = ["bucket", "mode", "churn_flag"] + ROLLUP_VALUE_COLS
+    return f"""
+        INSERT INTO {table} ({", ".join(cols)})
+        VALUES ({", ".join("?" * len(cols))})
+        ON CONFLICT(bucket, mode, churn_flag) DO UPDATE SET
+            {", ".join(f"{c} = {c} + excluded.{c}" for c in ROLLUP_VALUE_COLS)}
+    """
+
+
+def update_rollups(conn: sqlite3.Connection, records: Sequence[LogRecord]) -> None:
+    """Fold served (non-shadow) records into the minute/hour rollups (caller owns the transaction)."""
+    for table, key_len in ROLLUP_TABLES.items():
+        acc: Dict[tuple, list] = defaultdict(lambda: [0, 0.0, 0.0] + [0] * HIST_BUCKETS)
+        for ts_utc, _request_id, mode, _threshold, p, flag, _version, is_shadow in records:
+            if is_shadow:
+                continue
+            a = acc[(ts_utc[:key_len], mode, int(flag))]
+            a[0] += 1
+            a[1] += p
+            a[2] += p * p
+            a[3 + _hist_bucket(p)] += 1
+        if acc:
+            conn.executemany(_rollup_upsert_sql(table), [(*k, *v) for k, v in acc.items()])
+
+
+def rebuild_rollups(conn: sqlite3.Connection) -> None:
+    """Recompute both rollup tables from the served prediction_log rows still present."""
+    hist = ", ".join(
+        f"SUM(MIN(MAX(CAST(churn_probability * {HIST_BUCKETS} AS INTEGER), 0), {HIST_BUCKETS - 1}) = {k})"
+        for k in range(HIST_BUCKETS)
+    )
+    with conn:
+        for table, key_len in ROLLUP_TABLES.items():
+            conn.execute(f"DELETE FROM {table};")
+            conn.execute(
+                f"""
+                INSERT INTO {table} (bucket, mode, churn_flag, {", ".join(ROLLUP_VALUE_COLS)})
+                SELECT substr(ts_utc, 1, {key_len}), mode, churn_flag,
+                       COUNT(*), SUM(churn_probability), SUM(churn_probability * churn_probability),
+                       {hist}
+                FROM prediction_log
+                WHERE is_shadow = 0
+                GROUP BY 1, 2, 3;
+                """
+            )
+
+
+def ensure_log_columns(conn: sqlite3.Connection) -> None:
+    """Add model_version / is_shadow to a prediction_log created with the original schema."""
+    columns = {r[1] for r in conn.execute("PRAGMA table_info(prediction_log);")}
+    if not columns:
+        return
+    with conn:
+        for name, decl in LOG_COLUMNS_ADDED.items():
+            if name not in columns:
+                conn.execute(f"ALTER TABLE prediction_log ADD COLUMN {name} {decl};")
+
+
+def ensure_monitoring_schema(conn: sqlite3.Connection) -> None:
+    """Add log columns, create rollup tables + ts_utc index; backfill rollups the first time (safe to rerun)."""
+    existing = {
+        r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table';")
+    }
+    ensure_log_columns(conn)
+    conn.executescript(MONITORING_SQL)
+    if not set(ROLLUP_TABLES) <= existing:
+        rebuild_rollups(conn)
+
+
+def _bucket_key(ts: datetime, key_len: int) -> str:
+    return ts.astimezone(timezone.utc).isoformat()[:key_len]
+
+
+def query_rollups(conn: sqlite3.Connection, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+    """
+    Aggregates per (mode, churn_flag) over [start, end) at minute resolution
+    (partial minutes at either edge are included). Whole hours come from the
+    hour rollup and only the ragged edges from the minute rollup, so the
+    rows read grow with hours, not with predictions.
+    """
+    start = start.replace(second=0, microsecond=0)
+    if end.second or end.microsecond:
+        end = end.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    first_hour = start.replace(minute=0) + (timedelta(hours=1) if start.minute else timedelta(0))
+    last_hour = end.replace(minute=0)
+
+    ranges = []  # (table, lo, hi) half-open bucket key ranges
+    if first_hour < last_hour:
+        ranges.append(("prediction_rollup_minute", start, first_hour))
+        ranges.append(("prediction_rollup_hour", first_hour, last_hour))
+        ranges.append(("prediction_rollup_minute", last_hour, end))
+    else:
+        ranges.append(("prediction_rollup_minute", start, end))
+
+    acc: Dict[tuple, list] = defaultdict(lambda: [0] * len(ROLLUP_VALUE_COLS))
+    for table, lo, hi in ranges:
+        if lo >= hi:
+            continue
+        key_len = ROLLUP_TABLES[table]
+        rows = conn.execute(
+            f"""
+            SELECT mode, churn_flag, {", ".join(f"SUM({c})" for c in ROLLUP_VALUE_COLS)}
+            FROM {table}
+            WHERE bucket >= ? AND bucket < ?
+            GROUP BY mode, churn_flag
+            """,
+            (_bucket_key(lo, key_len), _bucket_key(hi, key_len)),
+        ).fetchall()
+        for mode, flag, *values in rows:
+            a = acc[(mode, int(flag))]
+            for i, v in enumerate(values):
+                a[i] += v or 0
+
+    out = []
+    for (mode, flag), (n, s, ss, *hist) in sorted(acc.items()):
+        if not n:
+            continue
+        mean = s / n
+        out.append({
+            "mode": mode,
+            "churn_flag": flag,
+            "count": int(n),
+            "avg_probability": mean,
+            "std_probability": max(ss / n - mean * mean, 0.0) ** 0.5,
+            "histogram": [int(h) for h in hist],
+        })
+    return out
+
+
+def compact(
+    conn: sqlite3.Connection,
+    keep_raw_days: float,
+    keep_minute_days: Optional[float] = None,
+    batch_rows: int = 50_000,
+    now: Optional[datetime] = None,
+) -> Dict[str, int]:
+    """
+    Retention: delete raw prediction_log rows older than `keep_raw_days`
+    (their rollups stay), and minute rollups older than `keep_minute_days`
+    (hour rollups are kept). Deletes in batches so the writer is never
+    blocked for long, then truncates the WAL.
+    """
+    now = now or datetime.now(timezone.utc)
+    cutoff = (now - timedelta(days=keep_raw_days)).isoformat()
+    deleted_raw = 0
+    while True:
+        with conn:
+            cur = conn.execute(
+                """
+                DELETE FROM prediction_log WHERE id IN (
+                    SELECT id FROM prediction_log WHERE ts_utc < ? LIMIT ?
+                )
+                """,
+                (cutoff, batch_rows),
+            )
+        deleted_raw += cur.rowcount
+        if cur.rowcount < batch_rows:
+            break
+
+    deleted_minute = 0
+    if keep_minute_days is not None:
+        minute_cutoff = _bucket_key(now - timedelta(days=keep_minute_days), ROLLUP_TABLES["prediction_rollup_minute"])
+        with conn:
+            deleted_minute = conn.execute(
+                "DELETE FROM prediction_rollup_minute WHERE bucket < ?;", (minute_cutoff,)
+            ).rowcount
+
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+    return {"raw_rows_deleted": deleted_raw, "minute_rollups_deleted": deleted_minute}
+
+
+def connect(db_path: Path, wal: bool = True) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    if wal:
+        # WAL lets readers (monitoring, dashboard) run while the writer commits
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA synchronous=NORMAL;")
+    return conn
+
+
+def insert_predictions(conn: sqlite3.Connection, records: Sequence[LogRecord]) -> None:
+    # One executemany inside one transaction; rollups commit together with the raw rows
+    with conn:
+        conn.executemany(INSERT_SQL, records)
+        update_rollups(conn, records)
+
+
+class PredictionLogWriter:
+    """
+    Background writer for prediction_log.
+
+    Request handlers call `submit()`, which only enqueues; a single thread
+    drains the bounded queue and writes with `executemany` in one
+    transaction every `flush_rows` rows or `flush_interval_ms`, whichever
+    comes first. When the queue is full, `on_full="block"` waits up to
+    `block_timeout_s` (backpressure) and `on_full="drop"` drops the record
+    and counts it.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        max_queue: int = 10_000,
+        flush_rows: int = 500,
+        flush_interval_ms: float = 50.0,
+        on_full: str = "block",
+        block_timeout_s: float = 1.0,
+    ):
+        if on_full not in ("block", "drop"):
+            raise ValueError(f"on_full must be 'block' or 'drop', got {on_full!r}")
+        self.db_path = db_path
+        self.flush_rows = flush_rows
+        self.flush_interval_s = flush_interval_ms / 1000.0
+        self.on_full = on_full
+        self.block_timeout_s = block_timeout_s
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.flushes = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._thread = threading.Thread(target=self._run, name="prediction-log-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, records: Sequence[LogRecord]) -> int:
+        """Enqueue records; returns how many were accepted."""
+        accepted = 0
+        block = self.on_full == "block"
+        for record in records:
+            try:
+                self._queue.put(record, block=block, timeout=self.block_timeout_s if block else None)
+                accepted += 1
+            except queue.Full:
+                with self._lock:
+                    self.dropped += 1
+        with self._lock:
+            self.enqueued += accepted
+        return accepted
+
+    def offer(self, records: Sequence[LogRecord]) -> List[LogRecord]:
+        """
+        Enqueue without ever waiting (for callers on the event loop); returns
+        the records that did not fit, which the caller hands to `submit` from
+        a thread so LOG_ON_FULL still applies to them.
+        """
+        accepted = 0
+        for record in records:
+            try:
+                self._queue.put_nowait(record)
+            except queue.Full:
+                break
+            accepted += 1
+        with self._lock:
+            self.enqueued += accepted
+        return list(records[accepted:])
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Flush everything still queued and stop the writer thread."""
+        if not self.running:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "queue_capacity": self._queue.maxsize,
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "dropped": self.dropped,
+                "failed": self.failed,
+                "flushes": self.flushes,
+            }
+
+    # ------------------------
+    # Writer thread
+    # ------------------------
+    def _flush(self, conn: sqlite3.Connection, batch: List[LogRecord]) -> None:
+        try:
+            insert_predictions(conn, batch)
+            with self._lock:
+                self.written += len(batch)
+                self.flushes += 1
+        except sqlite3.Error:
+            logger.exception("Failed to write %d prediction_log rows", len(batch))
+            with self._lock:
+                self.failed += len(batch)
+
+    def _run(self) -> None:
+        conn = connect(self.db_path)
+        ensure_monitoring_schema(conn)
+        batch: List[LogRecord] = []
+        deadline = None
+        stopping = False
+
+        try:
+            while not stopping:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+
+                # Drain whatever else is already waiting, up to one flush worth
+                while item is not None:
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    batch.append(item)
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_interval_s
+                    if len(batch) >= self.flush_rows:
+                        break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        item = None
+
+                if batch and (stopping or len(batch) >= self.flush_rows or time.monotonic() >= deadline):
+                    self._flush(conn, batch)
+                    batch = []
+                    deadline = None
+
+            # Shutdown: anything enqueued after _STOP (racing submitters)
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _STOP:
+                    batch.append(item)
+            if batch:
+                self._flush(conn, batch)
+        finally:
+            conn.close()
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+# Innermost (stdlib module, function) of a thread that is parked, not working: condition and
+# queue waits, the event loop's select, an executor worker blocked on its C work queue.
+# Blocking C calls have no frame of their own, so these are what a parked thread shows;
+# matching the module as well keeps application functions named wait/get/select sampled.
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("socket.py", "accept"),
+    ("concurrent/futures/thread.py", "_worker"),
+}
+
+_IDLE_MODULES: Dict[str, Tuple[str, ...]] = {}
+for _module, _name in IDLE_FRAMES:
+    _IDLE_MODULES[_name] = _IDLE_MODULES.get(_name, ()) + (os.sep + _module.replace("/", os.sep),)
+
+
+def is_idle(code) -> bool:
+    modules = _IDLE_MODULES.get(code.co_name)
+    return modules is not None and code.co_filename.endswith(modules)
+
+
+class SlowRequestProfiler:
+    """
+    Sampling profiler for slow requests.
+
+    While at least one request is in flight, a daemon thread records the
+    stack of every other thread every `interval_ms` into a short ring
+    buffer. When a request finishes after more than `threshold_ms`, the
+    samples taken during it are folded into a report (most frequent stacks
+    first); the last `max_reports` reports are kept. Samples cover all
+    threads, so work done in the threadpool on behalf of the request is
+    included, along with anything else that was running at the time; idle
+    threads (parked in IDLE_FRAMES) are skipped.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float,
+        interval_ms: float = 5.0,
+        max_reports: int = 20,
+        max_depth: int = 40,
+        buffer_s: float = 30.0,
+    ):
+        self.threshold_s = threshold_ms / 1000.0
+        self.interval_s = interval_ms / 1000.0
+        self.max_depth = max_depth
+        self.reports: deque = deque(maxlen=max_reports)
+
+        self._samples: deque = deque(maxlen=max(1, int(buffer_s / self.interval_s)))  # (ts, thread, stack)
+        self._active = 0
+        self._wake = threading.Condition()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="slow-request-profiler", daemon=True)
+        self._thread.start()
+
+    def _stack(self, frame) -> Tuple[str, ...]:
+        out = []
+        while frame is not None and len(out) < self.max_depth:
+            code = frame.f_code
+            out.append(f"{code.co_filename}:{frame.f_lineno} {code.co_name}")
+            frame = frame.f_back
+        return tuple(reversed(out))
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        names = {}
+        while True:
+            with self._wake:
+                while not self._active and not self._stopped:
+                    self._wake.wait()
+                if self._stopped:
+                    return
+            now = time.perf_counter()
+            if len(names) != threading.active_count():
+                names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != own and not is_idle(frame.f_code):
+                    self._samples.append((now, names.get(ident, str(ident)), self._stack(frame)))
+            time.sleep(self.interval_s)
+
+    def begin(self) -> float:
+        with self._wake:
+            self._active += 1
+            self._wake.notify()
+        return time.perf_counter()
+
+    def end(self, start: float, endpoint: str) -> None:
+        elapsed = time.perf_counter() - start
+        with self._wake:
+            self._active -= 1
+        if elapsed < self.threshold_s:
+            return
+
+        samples = [(name, stack) for ts, name, stack in list(self._samples) if ts >= start]
+        stacks = Counter(samples)
+        self.reports.append({
+            "ts_utc": datetime.now(timezone.utc).isoformat(),
+            "endpoint": endpoint,
+            "duration_ms": elapsed * 1000.0,
+            "samples": len(samples),
+            "top_stacks": [
+                {"thread": name, "count": n, "stack": list(stack)}
+                for (name, stack), n in stacks.most_common(10)
+            ],
+        })
+
+    def recent(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        reports = list(self.reports)[::-1]
+        return reports[:limit] if limit else reports
+
+    def close(self) -> None:
+        with self._wake:
+            self._stopped = True
+            self._wake.notify()
+        self._thread.join(timeout=1.0)
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from api.model_bundle import ModelBundle
+from api.prediction_logger import LogRecord
+
+logger = logging.getLogger("churn_api.shadow")
+
+# (ts_utc, request_id, mode, features, served_probability, served_flag)
+ShadowItem = Tuple[str, str, str, Dict[str, Any], float, int]
+
+_STOP = object()
+
+
+class ShadowScorer:
+    """
+    Scores a sampled fraction of served rows with a candidate bundle, off the
+    request path.
+
+    Request handlers call `pick(n)` to choose which of their n rows to
+    shadow, then `submit()`, which only enqueues (rows are dropped and
+    counted when the bounded queue is full). A daemon thread drains the
+    queue in batches, scores them with the candidate, writes the shadow rows
+    through `log_fn` (same request_id as the served row, is_shadow=1) and
+    keeps running served-vs-candidate agreement stats, reset whenever the
+    candidate changes.
+    """
+
+    def __init__(
+        self,
+        log_fn: Callable[[List[LogRecord]], None],
+        sample_rate: float,
+        max_queue: int = 1000,
+        batch_rows: int = 256,
+    ):
+        self.log_fn = log_fn
+        self.sample_rate = sample_rate
+        self.batch_rows = batch_rows
+        self.bundle: Optional[ModelBundle] = None
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._rng = np.random.default_rng()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._reset_stats()
+
+    def _reset_stats(self) -> None:
+        self.scored = 0
+        self.dropped = 0
+        self.failed = 0
+        self._abs_diff_sum = 0.0
+        self._max_abs_diff = 0.0
+        self._flag_agree = 0
+        self._served_sum = 0.0
+        self._shadow_sum = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def set_bundle(self, bundle: Optional[ModelBundle]) -> None:
+        """Swap the candidate (None = stop shadowing); queued rows are scored by the new one."""
+        with self._lock:
+            self.bundle = bundle
+            self._reset_stats()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._thread = threading.Thread(target=self._run, name="shadow-scorer", daemon=True)
+        self._thread.start()
+
+    def close(self, timeout: float = 5.0) -> None:
+        if not self.running:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    # ------------------------
+    # Request side
+    # ------------------------
+    def pick(self, n: int) -> Sequence[int]:
+        """Indices of the rows (out of n) to shadow; empty when no candidate is loaded."""
+        if self.bundle is None or not self.running:
+            return ()
+        if n == 1:
+            return (0,) if self._rng.random() < self.sample_rate else ()
+        return np.flatnonzero(self._rng.random(n) < self.sample_rate).tolist()
+
+    def submit(self, items: Sequence[ShadowItem]) -> None:
+        for item in items:
+            try:
+                self._queue.put_nowait(item)
+            except queue.Full:
+                with self._lock:
+                    self.dropped += 1
+
+    # ------------------------
+    # Scorer thread
+    # ------------------------
+    def _score(self, bundle: ModelBundle, items: List[ShadowItem]) -> None:
+        features = [item[3] for item in items]
+        if bundle.fast_scorer is not None:
+            X = bundle.fast_scorer.transform_records(features)
+        else:
+            import pandas as pd
+            X = bundle.preprocessor.transform(pd.DataFrame(features))
+        probabilities = bundle.scoring_model.predict_proba(X)[:, 1]
+
+        records: List[LogRecord] = []
+        abs_diff_sum, max_abs_diff, agree, served_sum = 0.0, 0.0, 0, 0.0
+        for (ts_utc, request_id, mode, _features, served_p, served_flag), p in zip(items, probabilities):
+            p = float(p)
+            threshold = bundle.thresholds[mode]
+            flag = int(p >= threshold)
+            # Served row's timestamp, so both rows of a request fall in the same bucket
+            records.append((ts_utc, request_id, mode, threshold, p, flag, bundle.version, 1))
+            diff = abs(p - served_p)
+            abs_diff_sum += diff
+            max_abs_diff = max(max_abs_diff, diff)
+            agree += flag == served_flag
+            served_sum += served_p
+        self.log_fn(records)
+
+        with self._lock:
+            if self.bundle is not bundle:
+                return  # candidate swapped while scoring: keep the new candidate's stats clean
+            self.scored += len(items)
+            self._abs_diff_sum += abs_diff_sum
+            self._max_abs_diff = max(self._max_abs_diff, max_abs_diff)
+            self._flag_agree += agree
+            self._served_sum += served_sum
+            self._shadow_sum += float(probabilities.sum())
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch: List[ShadowItem] = []
+            item = self._queue.get()
+            while item is not None:
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_rows:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = None
+
+            bundle = self.bundle
+            if not batch or bundle is None:
+                continue
+            try:
+                self._score(bundle, batch)
+            except Exception:
+                logger.exception("Shadow scoring failed for %d rows (version %s)", len(batch), bundle.version)
+                with self._lock:
+                    self.failed += len(batch)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            n = self.scored
+            return {
+                "version": self.bundle.version if self.bundle is not None else None,
+                "sample_rate": self.sample_rate,
+                "queue_depth": self._queue.qsize(),
+                "scored": n,
+                "dropped": self.dropped,
+                "failed": self.failed,
+                "mean_abs_diff": self._abs_diff_sum / n if n else None,
+                "max_abs_diff": self._max_abs_diff if n else None,
+                "flag_agreement": self._flag_agree / n if n else None,
+                "mean_served_probability": self._served_sum / n if n else None,
+                "mean_shadow_probability": self._shadow_sum / n if n else None,
+            }
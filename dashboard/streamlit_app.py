@@ -3,6 +3,7 @@ import sqlite3
 import requests
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 import streamlit as st
 
 st.set_page_config(page_title="Telco Churn Dashboard", layout="wide")
@@ -13,6 +14,7 @@ st.set_page_config(page_title="Telco Churn Dashboard", layout="wide")
 DEFAULT_API_URL = "http://api:8000"
 API_URL = os.getenv("API_URL", DEFAULT_API_URL).rstrip("/")
 DB_PATH = os.getenv("DB_PATH", "data/telco_churn.db")  # works locally; not on Streamlit Cloud unless you ship DB
+INSIGHTS_TTL_S = int(os.getenv("INSIGHTS_TTL_S", "300"))  # client-side cache of the /insights aggregates
 
 st.title("Telco Churn — Dashboard")
 st.caption(f"API_URL = {API_URL}")
@@ -27,32 +29,43 @@ def call_predict(payload: dict):
     r.raise_for_status()
     return r.json()
 
-def load_training_view_from_sqlite():
-    conn = sqlite3.connect(DB_PATH)
-    df = pd.read_sql_query("SELECT * FROM vw_churn_training_dataset", conn)
-    conn.close()
-    return df
+@st.cache_data(ttl=INSIGHTS_TTL_S, show_spinner=False)
+def get_insight(name: str) -> dict:
+    # Aggregates only (a few rows); the API caches them until the training snapshot changes
+    r = requests.get(f"{API_URL}/insights/{name}", timeout=20)
+    r.raise_for_status()
+    return r.json()
 
 def safe_get_monitoring_summary():
     # Preferred: call API monitoring endpoint (works in cloud)
     try:
-        r = requests.get(f"{API_URL}/monitoring/summary?limit=1000", timeout=20)
+        # Rollup form (last 60 minutes); ?limit=N would scan the raw prediction_log
+        r = requests.get(f"{API_URL}/monitoring/summary", timeout=20)
         if r.status_code == 200:
             return r.json(), "api"
     except Exception:
         pass
 
-    # Fallback: local DB read (works locally only)
+    # Fallback: local DB read (works locally only); hourly rollups, or the raw log on
+    # databases the API has not yet migrated
     try:
         conn = sqlite3.connect(DB_PATH)
-        df = pd.read_sql_query(
+        has_rollups = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'prediction_rollup_hour';"
+        ).fetchone()
+        if has_rollups:
+            sql = """
+                SELECT churn_flag, SUM(prob_sum) / SUM(n) AS avg_probability, SUM(n) AS count
+                FROM prediction_rollup_hour
+                GROUP BY churn_flag
             """
-            SELECT churn_flag, AVG(churn_probability) AS avg_probability, COUNT(*) AS count
-            FROM prediction_log
-            GROUP BY churn_flag
-            """,
-            conn,
-        )
+        else:
+            sql = """
+                SELECT churn_flag, AVG(churn_probability) AS avg_probability, COUNT(*) AS count
+                FROM prediction_log
+                GROUP BY churn_flag
+            """
+        df = pd.read_sql_query(sql, conn)
         conn.close()
         return {"by_flag": df.to_dict(orient="records")}, "db"
     except Exception:
@@ -144,42 +157,55 @@ with tab1:
 
 
 # ----------------------------
-# Tab 2: Insights (from SQL view)
+# Tab 2: Insights (aggregates from the API)
 # ----------------------------
 with tab2:
-    st.subheader("Churn Insights (from vw_churn_training_dataset)")
+    st.subheader("Churn Insights (training dataset)")
 
     st.info(
-        "Locally, this tab reads your SQLite database and plots key churn patterns. "
-        "On Streamlit Cloud, you can keep this tab by switching it to call an API endpoint that returns aggregates."
+        "Aggregates are computed by the API in SQL over the training dataset and cached until the next load, "
+        f"so this tab never pulls raw rows. Refreshed here at most every {INSIGHTS_TTL_S}s."
     )
 
     try:
-        df = load_training_view_from_sqlite()
+        by_contract = get_insight("churn_by_contract")
+        by_tenure = get_insight("churn_by_tenure_band")
+        charges = get_insight("monthly_charges_by_churn")
+        st.caption(f"Source: {by_contract['source']} (snapshot {by_contract['snapshot_date']})")
+        if by_contract["stale"]:
+            st.warning("Training table is older than the last fact load; rerun src/load_star_schema.py to refresh it.")
 
         c1, c2 = st.columns(2)
 
         with c1:
             # churn rate by contract type
-            grp = df.groupby("contract_type")["churn_target"].mean().reset_index()
-            fig = px.bar(grp, x="contract_type", y="churn_target", title="Churn Rate by Contract Type")
+            grp = pd.DataFrame(by_contract["groups"]).rename(columns={"group": "contract_type"})
+            fig = px.bar(grp, x="contract_type", y="churn_rate", hover_data=["customers"],
+                         title="Churn Rate by Contract Type")
             st.plotly_chart(fig, use_container_width=True)
 
         with c2:
             # churn rate by tenure band
-            tenure_band = pd.cut(
-                df["tenure_months"], bins=[-1, 12, 24, 48, 1200], labels=["0-12", "13-24", "25-48", "49+"]
-            )
-            grp2 = df.assign(tenure_band=tenure_band).groupby("tenure_band")["churn_target"].mean().reset_index()
-            fig2 = px.bar(grp2, x="tenure_band", y="churn_target", title="Churn Rate by Tenure Band")
+            grp2 = pd.DataFrame(by_tenure["groups"]).rename(columns={"group": "tenure_band"})
+            fig2 = px.bar(grp2, x="tenure_band", y="churn_rate", hover_data=["customers"],
+                          title="Churn Rate by Tenure Band")
             st.plotly_chart(fig2, use_container_width=True)
 
-        # monthly charges distribution
-        fig3 = px.box(df, x="churn_target", y="monthly_charges", title="Monthly Charges by Churn")
+        # monthly charges distribution, drawn from precomputed quartiles and whisker fences
+        box = pd.DataFrame(charges["groups"])
+        fig3 = go.Figure(go.Box(
+            x=box["churn_target"].astype(str),
+            q1=box["q1"],
+            median=box["median"],
+            q3=box["q3"],
+            lowerfence=box["lower_fence"],
+            upperfence=box["upper_fence"],
+        ))
+        fig3.update_layout(title="Monthly Charges by Churn", xaxis_title="churn_target", yaxis_title="monthly_charges")
         st.plotly_chart(fig3, use_container_width=True)
 
     except Exception as e:
-        st.error(f"Could not load SQLite view locally: {e}")
+        st.error(f"Could not load churn insights from the API: {e}")
 
 
 # ----------------------------
@@ -0,0 +1,87 @@
+"""
+Benchmark: per-row /predict vs /predict/batch scoring throughput (rows/sec).
+
+Runs in-process against api.app (no HTTP server) and logs predictions into a
+temporary copy of the SQLite DB, so data/telco_churn.db is left untouched.
+Both sides use the same preprocessing: the FastScorer (transform_record per
+row, transform_records per batch) or, with --preprocessing pandas,
+preprocessor.transform.
+
+Usage (from the project root):
+    python scripts/bench_batch_predict.py --rows 2000 --batch-size 500
+    python scripts/bench_batch_predict.py --preprocessing pandas
+"""
+import argparse
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import api.app as app_module  # noqa: E402
+from api.app import PredictRequest  # noqa: E402
+
+FEATURE_COLUMNS = list(PredictRequest.model_fields.keys())
+
+
+def load_payloads(db_path: Path, n_rows: int):
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    cols = ", ".join(c for c in FEATURE_COLUMNS if c != "mode")
+    rows = conn.execute(f"SELECT {cols} FROM vw_churn_training_dataset").fetchall()
+    conn.close()
+
+    payloads = [PredictRequest(**dict(r)) for r in rows]
+    # Repeat the sample until we have n_rows
+    return [payloads[i % len(payloads)] for i in range(n_rows)]
+
+
+def bench_per_row(payloads):
+    start = time.perf_counter()
+    for p in payloads:
+        app_module._predict_one(p)
+    return time.perf_counter() - start
+
+
+def bench_batch(payloads, batch_size: int):
+    start = time.perf_counter()
+    for i in range(0, len(payloads), batch_size):
+        app_module._score_batch(payloads[i:i + batch_size])
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--preprocessing", choices=["fast", "pandas"], default="fast")
+    args = parser.parse_args()
+
+    bundle = app_module.get_bundle()
+    if args.preprocessing == "pandas":
+        bundle.fast_scorer = None
+    elif bundle.fast_scorer is None:
+        raise SystemExit("FastScorer unavailable for this preprocessor; use --preprocessing pandas")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_db = Path(tmp) / "telco_churn.db"
+        shutil.copy(app_module.DB_PATH, tmp_db)
+        app_module.DB_PATH = tmp_db
+
+        payloads = load_payloads(tmp_db, args.rows)
+
+        t_row = bench_per_row(payloads)
+        t_batch = bench_batch(payloads, args.batch_size)
+
+    print(f"rows: {args.rows}, preprocessing: {args.preprocessing}")
+    print(f"per-row /predict : {args.rows / t_row:10.1f} rows/sec ({t_row:.2f}s)")
+    print(f"/predict/batch   : {args.rows / t_batch:10.1f} rows/sec ({t_batch:.2f}s, batch_size={args.batch_size})")
+    print(f"speedup          : {t_row / t_batch:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark: offline batch scoring throughput from 1 to N worker processes.
+
+Replicates the training view to --rows rows in a temporary Parquet file,
+then runs src.batch_score once per worker count (fresh output each time)
+and reports overall rows/sec, speedup over 1 worker and parallel efficiency.
+
+Usage (from the project root):
+    python scripts/bench_batch_score.py --rows 1000000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.batch_score import DB_PATH, ParquetSink, print_report, run  # noqa: E402
+
+
+def build_input(path: Path, n_rows: int) -> None:
+    conn = sqlite3.connect(DB_PATH)
+    sample = pd.read_sql_query("SELECT * FROM vw_churn_training_dataset", conn)
+    conn.close()
+    reps = -(-n_rows // len(sample))
+    df = pd.concat(
+        [sample.assign(customer_id=sample["customer_id"] + f"-{i}") for i in range(reps)],
+        ignore_index=True,
+    ).head(n_rows)
+    df.to_parquet(path, index=False)
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--shard-size", type=int, default=50_000)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, 8, cpus} & set(range(1, cpus + 1))))
+    parser.add_argument("--model-backend", choices=["sklearn", "packed"], default="sklearn")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        input_path = tmp / "customers.parquet"
+        build_input(input_path, args.rows)
+
+        results = []
+        for workers in args.workers:
+            sink = ParquetSink(tmp / f"scores-{workers}", resume=False)
+            report = run(input_path, sink, workers, args.shard_size, model_backend=args.model_backend)
+            print_report(report)
+            results.append(report)
+
+    base = results[0]["rows_per_sec"] / results[0]["workers"]
+    print(f"\n{'workers':>7} {'rows/sec':>12} {'speedup':>8} {'efficiency':>10}")
+    for r in results:
+        speedup = r["rows_per_sec"] / base
+        print(f"{r['workers']:>7} {r['rows_per_sec']:>12,.0f} {speedup:>7.1f}x {speedup / r['workers']:>9.0%}")
+
+
+if __name__ == "__main__":
+    main()
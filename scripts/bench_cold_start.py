@@ -0,0 +1,97 @@
+"""
+Benchmark: API cold start, from process spawn to the first prediction.
+
+For each startup configuration, starts a fresh uvicorn server and records
+the wall time until /health answers (process up), until /ready answers
+(artifacts loaded and warmed up), and until the first /predict returns,
+plus the latency of that first /predict. Phase timings reported by /ready
+(load_preprocessor, load_model, fast_scorer, scoring_model, warmup) are
+printed for the last run of each configuration.
+
+Prediction logs go to a temporary copy of the SQLite DB.
+
+Usage (from the project root):
+    python scripts/bench_cold_start.py --runs 3
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import requests
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.bench_execution_modes import DB_PATH, PAYLOAD, free_port  # noqa: E402
+
+CONFIGS = {
+    "sequential, no warm-up": {"ARTIFACT_LOAD_PARALLEL": "0", "WARMUP_ROWS": "0", "MODEL_MMAP": "0"},
+    "parallel, no warm-up": {"ARTIFACT_LOAD_PARALLEL": "1", "WARMUP_ROWS": "0", "MODEL_MMAP": "0"},
+    "parallel + warm-up": {"ARTIFACT_LOAD_PARALLEL": "1", "WARMUP_ROWS": "64", "MODEL_MMAP": "0"},
+    "parallel + warm-up + mmap": {"ARTIFACT_LOAD_PARALLEL": "1", "WARMUP_ROWS": "64", "MODEL_MMAP": "1"},
+}
+
+
+def wait_for(url: str, start: float, timeout_s: float = 120.0) -> float:
+    while time.perf_counter() - start < timeout_s:
+        try:
+            if requests.get(url, timeout=1).status_code == 200:
+                return time.perf_counter() - start
+        except requests.ConnectionError:
+            pass
+        time.sleep(0.01)
+    raise RuntimeError(f"{url} not available after {timeout_s:.0f}s")
+
+
+def cold_start(env_overrides: dict, db_copy: Path):
+    port = free_port()
+    env = dict(os.environ, **env_overrides)
+    code = (
+        "import sys, uvicorn; sys.path.insert(0, '.');"
+        "import api.app as a; from pathlib import Path;"
+        f"a.DB_PATH = Path({str(db_copy)!r}); a.log_writer.db_path = a.DB_PATH;"
+        f"uvicorn.run(a.app, host='127.0.0.1', port={port}, log_level='warning')"
+    )
+    base = f"http://127.0.0.1:{port}"
+
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-c", code], cwd=PROJECT_ROOT, env=env)
+    try:
+        t_health = wait_for(f"{base}/health", start)
+        t_ready = wait_for(f"{base}/ready", start)
+        t0 = time.perf_counter()
+        requests.post(f"{base}/predict", json=PAYLOAD, timeout=30).raise_for_status()
+        first_ms = (time.perf_counter() - t0) * 1000
+        phases = requests.get(f"{base}/ready", timeout=5).json()["startup_s"]
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+    return t_health, t_ready, t_ready + first_ms / 1000, first_ms, phases
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--configs", nargs="+", default=list(CONFIGS), choices=list(CONFIGS))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_copy = Path(tmp) / "telco_churn.db"
+        shutil.copy(DB_PATH, db_copy)
+
+        for name in args.configs:
+            runs = [cold_start(CONFIGS[name], db_copy) for _ in range(args.runs)]
+            health, ready, first, first_ms = (statistics.median(r[i] for r in runs) for i in range(4))
+            print(f"{name:<26} health {health:6.2f}s  ready {ready:6.2f}s  "
+                  f"first prediction {first:6.2f}s  (first /predict {first_ms:7.1f} ms)")
+            print("    " + "  ".join(f"{k}={v:.3f}s" for k, v in runs[-1][4].items()))
+
+
+if __name__ == "__main__":
+    main()
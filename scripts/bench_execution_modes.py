@@ -0,0 +1,121 @@
+"""
+Benchmark: /predict req/s at 1, 8 and 64 concurrent clients for each
+EXECUTION_MODE (threadpool / thread / process).
+
+Starts a uvicorn server per mode on a free port, drives it with threaded
+HTTP clients for a fixed duration and counts 503 (pool saturated) answers.
+Prediction logs go to a temporary copy of the SQLite DB.
+
+Usage (from the project root):
+    python scripts/bench_execution_modes.py --seconds 10
+"""
+import argparse
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DB_PATH = PROJECT_ROOT / "data" / "telco_churn.db"
+
+MODES = ["threadpool", "thread", "process"]
+CONCURRENCY = [1, 8, 64]
+
+PAYLOAD = {
+    "gender": "Male", "senior_citizen": 0, "partner": "Yes", "dependents": "No",
+    "country": "United States", "state": "California",
+    "contract_type": "Month-to-month", "paperless_billing": "Yes",
+    "payment_method": "Electronic check",
+    "phone_service": "Yes", "multiple_lines": "No", "internet_service": "Fiber optic",
+    "online_security": "No", "online_backup": "No", "device_protection": "No",
+    "tech_support": "No", "streaming_tv": "Yes", "streaming_movies": "Yes",
+    "tenure_months": 5, "monthly_charges": 95.2, "total_charges": 450.0, "cltv": 3500,
+    "mode": "default",
+}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(mode: str, port: int, db_copy: Path) -> subprocess.Popen:
+    env = dict(os.environ, EXECUTION_MODE=mode)
+    # Point the app at the temp DB by running it with a patched DB_PATH
+    code = (
+        "import sys, uvicorn; sys.path.insert(0, '.');"
+        "import api.app as a; from pathlib import Path;"
+        f"a.DB_PATH = Path({str(db_copy)!r}); a.log_writer.db_path = a.DB_PATH;"
+        f"uvicorn.run(a.app, host='127.0.0.1', port={port}, log_level='warning')"
+    )
+    proc = subprocess.Popen([sys.executable, "-c", code], cwd=PROJECT_ROOT, env=env)
+    url = f"http://127.0.0.1:{port}/ready"
+    for _ in range(600):
+        try:
+            if requests.get(url, timeout=1).status_code == 200:
+                return proc
+        except requests.ConnectionError:
+            pass
+        time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError(f"server for mode={mode} did not start")
+
+
+def drive(port: int, clients: int, seconds: float):
+    ok, rejected, errors = [0] * clients, [0] * clients, [0] * clients
+    stop_at = time.perf_counter() + seconds
+    url = f"http://127.0.0.1:{port}/predict"
+
+    def client(i):
+        session = requests.Session()
+        while time.perf_counter() < stop_at:
+            r = session.post(url, json=PAYLOAD, timeout=30)
+            if r.status_code == 200:
+                ok[i] += 1
+            elif r.status_code == 503:
+                rejected[i] += 1
+            else:
+                errors[i] += 1
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return sum(ok) / seconds, sum(rejected), sum(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--modes", nargs="+", default=MODES)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_copy = Path(tmp) / "telco_churn.db"
+        shutil.copy(DB_PATH, db_copy)
+
+        for mode in args.modes:
+            port = free_port()
+            proc = start_server(mode, port, db_copy)
+            try:
+                drive(port, 4, 1.0)  # warm-up
+                for clients in CONCURRENCY:
+                    rps, rejected, errors = drive(port, clients, args.seconds)
+                    print(f"mode={mode:<10} clients={clients:>3}  {rps:8.1f} req/s"
+                          f"  503s={rejected}  errors={errors}")
+            finally:
+                proc.terminate()
+                proc.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
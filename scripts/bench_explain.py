@@ -0,0 +1,143 @@
+"""
+Benchmark: SHAP explanation cost, and its effect on plain /predict traffic.
+
+1. In-process ChurnExplainer (src/explainer.py) on rows of
+   vw_churn_training_dataset: explainer build time, then latency and
+   rows/s per batch size for the exact and approximate methods.
+2. Per EXPLAIN_EXECUTION (thread / process): a uvicorn server is started;
+   /predict p50/p99 from one sequential client is measured alone and again
+   while background clients keep /predict/explain/batch busy. Also reports
+   the explain throughput reached and the latency of a cached explanation.
+
+Prediction logs go to a temporary copy of the SQLite DB.
+
+Usage (from the project root):
+    python scripts/bench_explain.py --requests 500 --explain-batch 20
+"""
+import argparse
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import joblib
+import pandas as pd
+import requests
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.bench_execution_modes import DB_PATH, PAYLOAD, free_port  # noqa: E402
+from scripts.bench_metrics_overhead import start_server  # noqa: E402
+from src.drift_reference import MODEL_PATH, PREPROCESSOR_PATH  # noqa: E402
+from src.explainer import METHODS, ChurnExplainer  # noqa: E402
+
+BATCH_SIZES = [1, 10, 100]
+FIELDS = [f for f in PAYLOAD if f != "mode"]  # same order as PredictRequest
+
+
+def bench_in_process(max_rows: int) -> None:
+    conn = sqlite3.connect(DB_PATH)
+    df = pd.read_sql_query(f"SELECT * FROM vw_churn_training_dataset LIMIT {int(max_rows)}", conn)
+    conn.close()
+    preprocessor = joblib.load(PREPROCESSOR_PATH)
+    model = joblib.load(MODEL_PATH)
+    X = preprocessor.transform(df[FIELDS])
+
+    for method in METHODS:
+        start = time.perf_counter()
+        explainer = ChurnExplainer(preprocessor, model, FIELDS, method=method)
+        build_ms = (time.perf_counter() - start) * 1000
+        for n in [b for b in BATCH_SIZES if b <= max_rows]:
+            start = time.perf_counter()
+            explainer.explain(X[:n])
+            elapsed = time.perf_counter() - start
+            print(f"in-process {method:<12} build {build_ms:6.1f} ms  batch {n:>4}: "
+                  f"{elapsed * 1000:9.1f} ms  ({n / elapsed:8.1f} rows/s)")
+
+
+def predict_latencies(port: int, n: int):
+    session = requests.Session()
+    url = f"http://127.0.0.1:{port}/predict"
+    latencies = []
+    for i in range(n):
+        payload = dict(PAYLOAD, cltv=1000 + i)  # miss the prediction cache
+        start = time.perf_counter()
+        session.post(url, json=payload, timeout=60).raise_for_status()
+        latencies.append(time.perf_counter() - start)
+    lat = sorted(latencies)
+    return statistics.median(lat) * 1000, lat[int(0.99 * (len(lat) - 1))] * 1000
+
+
+def explain_load(port: int, clients: int, batch: int, stop: threading.Event, counts: list) -> list:
+    url = f"http://127.0.0.1:{port}/predict/explain/batch"
+
+    def client(i):
+        session = requests.Session()
+        k = 0
+        while not stop.is_set():
+            rows = [dict(PAYLOAD, cltv=10_000 + 1000 * i + k + j) for j in range(batch)]  # never cached
+            k += batch
+            r = session.post(url, json=rows, timeout=300)
+            if r.status_code == 200:
+                counts[i] += batch
+
+    threads = [threading.Thread(target=client, args=(i,), daemon=True) for i in range(clients)]
+    for t in threads:
+        t.start()
+    return threads
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500, help="/predict calls per measurement")
+    parser.add_argument("--explain-batch", type=int, default=20)
+    parser.add_argument("--explain-clients", type=int, default=2)
+    parser.add_argument("--rows", type=int, default=100, help="largest in-process batch")
+    parser.add_argument("--method", default="exact", help="EXPLAIN_METHOD for the server runs")
+    args = parser.parse_args()
+
+    bench_in_process(args.rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_copy = Path(tmp) / "telco_churn.db"
+        shutil.copy(DB_PATH, db_copy)
+
+        for execution in ["thread", "process"]:
+            env = {"EXPLAIN_EXECUTION": execution, "EXPLAIN_METHOD": args.method}
+            port = free_port()
+            proc = start_server(env, port, db_copy)
+            try:
+                session = requests.Session()
+                # First call waits for the explain workers; the repeat is answered from the cache
+                session.post(f"http://127.0.0.1:{port}/predict/explain", json=PAYLOAD, timeout=300)
+                start = time.perf_counter()
+                session.post(f"http://127.0.0.1:{port}/predict/explain", json=PAYLOAD, timeout=60)
+                cached_ms = (time.perf_counter() - start) * 1000
+
+                predict_latencies(port, 100)  # warm-up
+                idle_p50, idle_p99 = predict_latencies(port, args.requests)
+
+                stop, counts = threading.Event(), [0] * args.explain_clients
+                threads = explain_load(port, args.explain_clients, args.explain_batch, stop, counts)
+                start = time.perf_counter()
+                busy_p50, busy_p99 = predict_latencies(port, args.requests)
+                elapsed = time.perf_counter() - start
+                stop.set()
+                for t in threads:
+                    t.join(timeout=300)
+            finally:
+                proc.terminate()
+                proc.wait(timeout=30)
+
+            print(f"EXPLAIN_EXECUTION={execution:<8} /predict p50/p99 alone {idle_p50:7.2f}/{idle_p99:8.2f} ms  "
+                  f"under explain load {busy_p50:7.2f}/{busy_p99:8.2f} ms  "
+                  f"explain {sum(counts) / elapsed:7.1f} rows/s  cached explain {cached_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
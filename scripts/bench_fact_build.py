@@ -0,0 +1,131 @@
+"""
+Benchmark: fact build with SQL string joins vs in-memory natural-key hash maps.
+
+The sample workbook is replicated with fresh customer IDs to 10x and 100x its
+size (--scales) and loaded into a fresh DB (created from sql/schema.sql in a
+temp dir) twice per scale:
+  - join: stage rows, then resolve contract/services keys with the original
+          3- and 9-column TEXT joins inside INSERT ... SELECT
+  - hash: KeyResolver (nk_hash -> key maps) and executemany of resolved rows
+Both paths upsert dim_customer the same way; only key resolution differs.
+
+Usage (from the project root):
+    python scripts/bench_fact_build.py --scales 10 100
+"""
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.load_star_schema import (  # noqa: E402
+    CONTRACT_COLS, FACT_INSERT_COLS, SERVICES_COLS, SNAPSHOT_DATE, STG_COLS,
+    KeyResolver, read_raw, standardize, upsert_customers, write_facts,
+)
+
+XLSX_PATH = PROJECT_ROOT / "data" / "raw" / "Telco_customer_churn.xlsx"
+SCHEMA_PATH = PROJECT_ROOT / "sql" / "schema.sql"
+
+# Original fact build: surrogate keys via multi-column string joins
+JOIN_FACT_SQL = f"""
+    INSERT INTO fact_customer_snapshot ({", ".join(FACT_INSERT_COLS)})
+    SELECT
+        dc.customer_key, dcon.contract_key, ds.services_key,
+        r.tenure_months, r.monthly_charges, r.total_charges, r.cltv,
+        r.churn_label, r.snapshot_date, r.row_hash
+    FROM stg_chunk r
+    JOIN dim_customer dc
+      ON dc.customer_id = r.customer_id
+    JOIN dim_contract dcon
+      ON dcon.contract_type = r.contract_type
+     AND dcon.paperless_billing = r.paperless_billing
+     AND dcon.payment_method = r.payment_method
+    JOIN dim_services ds
+      ON ds.phone_service = r.phone_service
+     AND ds.multiple_lines = r.multiple_lines
+     AND ds.internet_service = r.internet_service
+     AND ds.online_security = r.online_security
+     AND ds.online_backup = r.online_backup
+     AND ds.device_protection = r.device_protection
+     AND ds.tech_support = r.tech_support
+     AND ds.streaming_tv = r.streaming_tv
+     AND ds.streaming_movies = r.streaming_movies;
+"""
+
+
+def replicate(sample: pd.DataFrame, scale: int) -> pd.DataFrame:
+    parts = []
+    for rep in range(scale):
+        part = sample.copy()
+        part["CustomerID"] = part["CustomerID"] + f"-{rep}"
+        parts.append(part)
+    return pd.concat(parts, ignore_index=True)
+
+
+def fresh_db(path: Path) -> sqlite3.Connection:
+    path.unlink(missing_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA_PATH.read_text())
+    return conn
+
+
+def build_join(cur, stg: pd.DataFrame) -> None:
+    upsert_customers(cur, stg)
+    for table, cols in [("dim_contract", CONTRACT_COLS), ("dim_services", SERVICES_COLS)]:
+        cur.executemany(
+            f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))}) ON CONFLICT DO NOTHING",
+            stg[cols].drop_duplicates().itertuples(index=False, name=None)
+        )
+    cur.execute(f"CREATE TEMP TABLE stg_chunk ({', '.join(STG_COLS)});")
+    cur.executemany(
+        f"INSERT INTO stg_chunk VALUES ({', '.join('?' * len(STG_COLS))})",
+        stg[STG_COLS].itertuples(index=False, name=None)
+    )
+    cur.execute(JOIN_FACT_SQL)
+    cur.execute("DROP TABLE stg_chunk;")
+
+
+def build_hash(cur, stg: pd.DataFrame) -> None:
+    write_facts(cur, KeyResolver(cur), stg)
+
+
+def timed(db_path: Path, build, stg: pd.DataFrame) -> float:
+    conn = fresh_db(db_path)
+    cur = conn.cursor()
+    start = time.perf_counter()
+    with conn:
+        build(cur, stg)
+    elapsed = time.perf_counter() - start
+    n = cur.execute("SELECT COUNT(*) FROM fact_customer_snapshot;").fetchone()[0]
+    conn.close()
+    if n != len(stg):
+        raise RuntimeError(f"expected {len(stg)} fact rows, got {n}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", type=int, nargs="+", default=[10, 100])
+    args = parser.parse_args()
+
+    sample = read_raw(XLSX_PATH)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "telco_churn.db"
+        for scale in args.scales:
+            stg = standardize(replicate(sample, scale), SNAPSHOT_DATE)
+            t_join = timed(db_path, build_join, stg)
+            t_hash = timed(db_path, build_hash, stg)
+            print(f"{scale:>4}x ({len(stg):>9,} rows)  "
+                  f"join {t_join:7.2f}s ({len(stg) / t_join:10,.0f} rows/sec)  "
+                  f"hash {t_hash:7.2f}s ({len(stg) / t_hash:10,.0f} rows/sec)  "
+                  f"speedup {t_join / t_hash:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
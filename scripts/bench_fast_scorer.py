@@ -0,0 +1,79 @@
+"""
+Benchmark: single-row preprocessing latency (p50/p99) of the FastScorer
+vs the pandas path (_payload_to_dataframe + preprocessor.transform), with
+and without model.predict_proba.
+
+Usage (from the project root):
+    python scripts/bench_fast_scorer.py --n 2000
+"""
+import argparse
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.fast_scorer import FastScorer  # noqa: E402
+
+DB_PATH = PROJECT_ROOT / "data" / "telco_churn.db"
+PREPROCESSOR_PATH = PROJECT_ROOT / "artifacts" / "preprocessor.joblib"
+MODEL_PATH = PROJECT_ROOT / "artifacts" / "churn_model_rf.joblib"
+
+DROP_COLS = ["customer_id", "snapshot_date", "churn_target"]
+
+
+def timed(fn, records):
+    lat = []
+    for r in records:
+        t0 = time.perf_counter()
+        fn(r)
+        lat.append(time.perf_counter() - t0)
+    lat_ms = np.array(lat) * 1000
+    return np.percentile(lat_ms, 50), np.percentile(lat_ms, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=2000)
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(DB_PATH)
+    df = pd.read_sql_query("SELECT * FROM vw_churn_training_dataset", conn)
+    conn.close()
+    records = df.drop(columns=DROP_COLS).head(args.n).to_dict(orient="records")
+
+    preprocessor = joblib.load(PREPROCESSOR_PATH)
+    model = joblib.load(MODEL_PATH)
+    scorer = FastScorer.from_preprocessor(preprocessor)
+
+    def pandas_path(r):
+        return preprocessor.transform(pd.DataFrame([r]))
+
+    def fast_path(r):
+        return scorer.transform_record(r)
+
+    cases = [
+        ("pandas transform", pandas_path),
+        ("fast transform", fast_path),
+        ("pandas + predict_proba", lambda r: model.predict_proba(pandas_path(r))),
+        ("fast + predict_proba", lambda r: model.predict_proba(fast_path(r))),
+    ]
+
+    # warm-up
+    for _, fn in cases:
+        fn(records[0])
+
+    print(f"rows: {len(records)}")
+    for name, fn in cases:
+        p50, p99 = timed(fn, records)
+        print(f"{name:<24} p50={p50:8.3f} ms  p99={p99:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
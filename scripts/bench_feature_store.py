@@ -0,0 +1,76 @@
+"""
+Benchmark: training reads via pd.read_sql_query vs the columnar feature store.
+
+Replicates the training dataset over --snapshots snapshot dates into a temp
+SQLite table and into parquet and arrow feature stores, then times:
+  - pd.read_sql_query("SELECT * ...")  (what the notebooks do)
+  - load_features() of all columns, per format
+  - load_features() of the numeric model inputs only, per format
+
+Usage (from the project root):
+    python scripts/bench_feature_store.py --snapshots 150
+"""
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.feature_store import DB_PATH, FORMATS, build_features, load_features, write_snapshot  # noqa: E402
+from src.preprocessor import NUMERIC_FEATURES  # noqa: E402
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--snapshots", type=int, default=150)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(DB_PATH)
+    base = pd.read_sql_query("SELECT * FROM vw_churn_training_dataset", conn)
+    conn.close()
+    dates = pd.date_range(end=base["snapshot_date"].iloc[0], periods=args.snapshots, freq="D").strftime("%Y-%m-%d")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        db_path = tmp / "bench.db"
+        conn = sqlite3.connect(db_path)
+        for d in dates:
+            part = base.assign(snapshot_date=d)
+            part.to_sql("training", conn, if_exists="append", index=False)
+            features = build_features(part)
+            for fmt in FORMATS:
+                write_snapshot(features, tmp, fmt)
+        conn.commit()
+        n_rows = len(base) * len(dates)
+        print(f"rows: {n_rows:,} ({len(dates)} snapshots)")
+
+        t_sql = timed(lambda: pd.read_sql_query("SELECT * FROM training", conn), args.repeat)
+        print(f"{'read_sql_query (all columns)':<34} {t_sql:7.3f}s  {n_rows / t_sql:12,.0f} rows/sec")
+        for fmt in FORMATS:
+            t_all = timed(lambda: load_features(tmp, fmt=fmt), args.repeat)
+            t_num = timed(lambda: load_features(tmp, columns=NUMERIC_FEATURES, fmt=fmt), args.repeat)
+            print(f"{fmt + ' (all columns)':<34} {t_all:7.3f}s  {n_rows / t_all:12,.0f} rows/sec  "
+                  f"speedup {t_sql / t_all:5.1f}x")
+            print(f"{fmt + ' (numeric inputs)':<34} {t_num:7.3f}s  {n_rows / t_num:12,.0f} rows/sec  "
+                  f"speedup {t_sql / t_num:5.1f}x")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
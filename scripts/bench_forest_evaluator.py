@@ -0,0 +1,73 @@
+"""
+Benchmark: sklearn RandomForest predict_proba vs PackedForest for batch
+sizes from 1 to 10k (rows drawn from the transformed training view), and
+the HybridForest the API serves with MODEL_BACKEND=packed (packed up to
+--packed-max-rows, sklearn above). Prints the batch size where sklearn
+starts winning, to tune PACKED_MAX_ROWS.
+
+Usage (from the project root):
+    python scripts/bench_forest_evaluator.py
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.forest_evaluator import (  # noqa: E402
+    MODEL_PATH, PREPROCESSOR_PATH, HybridForest, PackedForest, load_training_matrix, max_abs_diff,
+)
+
+BATCH_SIZES = [1, 16, 64, 128, 256, 1024, 10_000]
+
+
+def bench(fn, X, batch_size, min_seconds=2.0):
+    n = X.shape[0]
+    calls, rows = 0, 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < min_seconds:
+        i = (calls * batch_size) % max(1, n - batch_size)
+        fn(X[i:i + batch_size])
+        calls += 1
+        rows += batch_size
+    elapsed = time.perf_counter() - start
+    return elapsed / calls * 1000, rows / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--packed-max-rows", type=int, default=64, help="PACKED_MAX_ROWS for the hybrid")
+    args = parser.parse_args()
+
+    preprocessor = joblib.load(PREPROCESSOR_PATH)
+    model = joblib.load(MODEL_PATH)
+    packed = PackedForest.from_sklearn(model)
+    hybrid = HybridForest(packed, model, args.packed_max_rows)
+
+    X = load_training_matrix(preprocessor)
+    if hasattr(X, "toarray"):
+        X = X.toarray()
+    X = np.asarray(X, dtype=np.float64)
+    reps = int(np.ceil(max(BATCH_SIZES) * 2 / X.shape[0]))
+    X = np.vstack([X] * reps)
+
+    print(f"max |sklearn - packed|: {max_abs_diff(model, packed, X[:7043]):.3e}")
+    crossover = None
+    for batch_size in BATCH_SIZES:
+        ms = {}
+        for name, fn in [("sklearn", model.predict_proba), ("packed", packed.predict_proba),
+                         ("hybrid", hybrid.predict_proba)]:
+            ms[name], rps = bench(fn, X, batch_size)
+            print(f"batch={batch_size:>6}  {name:<8} {ms[name]:10.3f} ms/call  {rps:12.0f} rows/sec")
+        if crossover is None and ms["sklearn"] < ms["packed"]:
+            crossover = batch_size
+    print(f"sklearn is faster from batch={crossover} rows" if crossover else "packed is faster at every size")
+
+
+if __name__ == "__main__":
+    main()
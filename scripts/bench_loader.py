@@ -0,0 +1,84 @@
+"""
+Benchmark: star-schema load rows/sec and peak RSS, whole-file vs streamed.
+
+Builds a synthetic CSV of --rows rows by replicating the sample workbook
+with fresh customer IDs, then loads it into a fresh DB (created from
+sql/schema.sql in a temp dir) once with --chunksize 0 (whole file in memory,
+like the original loader) and once per streamed chunk size. Each load runs
+in its own process so peak RSS is measured per run.
+
+Usage (from the project root):
+    python scripts/bench_loader.py --rows 1000000 --chunksizes 50000 200000
+"""
+import argparse
+import re
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+XLSX_PATH = PROJECT_ROOT / "data" / "raw" / "Telco_customer_churn.xlsx"
+SCHEMA_PATH = PROJECT_ROOT / "sql" / "schema.sql"
+
+CHILD = """
+import resource, sys
+sys.path.insert(0, {root!r})
+from src.load_star_schema import main
+main(["--input", {csv!r}, "--chunksize", "{chunksize}"])
+print("PEAK_RSS_KB", resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def build_csv(path: Path, n_rows: int) -> None:
+    sample = pd.read_excel(XLSX_PATH)
+    written, rep = 0, 0
+    while written < n_rows:
+        part = sample.head(n_rows - written).copy()
+        part["CustomerID"] = part["CustomerID"] + f"-{rep}"
+        part.to_csv(path, mode="a", header=(rep == 0), index=False)
+        written += len(part)
+        rep += 1
+
+
+def run_load(workdir: Path, csv_path: Path, chunksize: int):
+    db_dir = workdir / "data"
+    db_dir.mkdir(parents=True, exist_ok=True)
+    db_path = db_dir / "telco_churn.db"
+    db_path.unlink(missing_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA_PATH.read_text())
+    conn.close()
+
+    code = CHILD.format(root=str(PROJECT_ROOT), csv=str(csv_path), chunksize=chunksize)
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", code], cwd=workdir, capture_output=True, text=True, check=True)
+    elapsed = time.perf_counter() - start
+    peak_kb = int(re.search(r"PEAK_RSS_KB (\d+)", out.stdout).group(1))
+    return elapsed, peak_kb / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunksizes", type=int, nargs="+", default=[50_000, 200_000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        csv_path = tmp / "raw.csv"
+        build_csv(csv_path, args.rows)
+        print(f"input: {args.rows:,} rows, {csv_path.stat().st_size / 1e6:.0f} MB CSV")
+
+        for chunksize in [0, *args.chunksizes]:
+            elapsed, peak_mb = run_load(tmp, csv_path, chunksize)
+            label = "whole file" if chunksize == 0 else f"chunks of {chunksize:,}"
+            print(f"{label:<20} {args.rows / elapsed:10,.0f} rows/sec  {elapsed:7.1f}s  peak RSS {peak_mb:8.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark: cost of the /metrics instrumentation on /predict.
+
+1. Per-call cost of one stage timer, enabled (StageTimer) vs disabled
+   (the shared no-op context the app uses when METRICS_ENABLED=0).
+2. End-to-end /predict latency from one sequential client against a
+   uvicorn server started with metrics off, metrics on, and metrics on
+   plus the slow-request profiler (SLOW_REQUEST_MS).
+
+Prediction logs go to a temporary copy of the SQLite DB.
+
+Usage (from the project root):
+    python scripts/bench_metrics_overhead.py --requests 3000
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from contextlib import nullcontext
+from pathlib import Path
+
+import requests
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from api.metrics import Histogram, StageTimer  # noqa: E402
+from scripts.bench_execution_modes import DB_PATH, PAYLOAD, free_port  # noqa: E402
+
+CONFIGS = {
+    "metrics off": {"METRICS_ENABLED": "0", "SLOW_REQUEST_MS": "0"},
+    "metrics on": {"METRICS_ENABLED": "1", "SLOW_REQUEST_MS": "0"},
+    "metrics + profiler": {"METRICS_ENABLED": "1", "SLOW_REQUEST_MS": "50"},
+}
+
+
+def bench_stage_timer(n: int = 200_000) -> None:
+    hist = Histogram([0.001, 0.01, 0.1])
+    noop = nullcontext()
+
+    def enabled():
+        with StageTimer(hist):
+            pass
+
+    def disabled():
+        with noop:
+            pass
+
+    for name, fn in [("disabled", disabled), ("enabled", enabled)]:
+        per_call = min(timeit.repeat(fn, number=n, repeat=5)) / n
+        print(f"stage timer {name:<9} {per_call * 1e9:8.0f} ns/call")
+
+
+def start_server(env_overrides: dict, port: int, db_copy: Path) -> subprocess.Popen:
+    env = dict(os.environ, **env_overrides)
+    code = (
+        "import sys, uvicorn; sys.path.insert(0, '.');"
+        "import api.app as a; from pathlib import Path;"
+        f"a.DB_PATH = Path({str(db_copy)!r}); a.log_writer.db_path = a.DB_PATH;"
+        f"uvicorn.run(a.app, host='127.0.0.1', port={port}, log_level='warning')"
+    )
+    proc = subprocess.Popen([sys.executable, "-c", code], cwd=PROJECT_ROOT, env=env)
+    url = f"http://127.0.0.1:{port}/ready"
+    for _ in range(600):
+        try:
+            if requests.get(url, timeout=1).status_code == 200:
+                return proc
+        except requests.ConnectionError:
+            pass
+        time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("server did not start")
+
+
+def drive(port: int, n: int):
+    session = requests.Session()
+    url = f"http://127.0.0.1:{port}/predict"
+    latencies = []
+    for i in range(n):
+        # Vary the payload so the prediction cache does not answer every call
+        payload = dict(PAYLOAD, cltv=1000 + i)
+        start = time.perf_counter()
+        r = session.post(url, json=payload, timeout=30)
+        latencies.append(time.perf_counter() - start)
+        r.raise_for_status()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=3000)
+    args = parser.parse_args()
+
+    bench_stage_timer()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_copy = Path(tmp) / "telco_churn.db"
+        shutil.copy(DB_PATH, db_copy)
+
+        baseline = None
+        for name, env in CONFIGS.items():
+            port = free_port()
+            proc = start_server(env, port, db_copy)
+            try:
+                drive(port, 200)  # warm-up
+                lat = sorted(drive(port, args.requests))
+            finally:
+                proc.terminate()
+                proc.wait(timeout=30)
+
+            p50 = statistics.median(lat) * 1000
+            p99 = lat[int(0.99 * (len(lat) - 1))] * 1000
+            baseline = baseline or p50
+            print(f"{name:<20} p50 {p50:7.3f} ms  p99 {p99:7.3f} ms  "
+                  f"({(p50 / baseline - 1) * 100:+.1f}% p50 vs metrics off)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark: memory of the transformed feature matrix per preprocessor output
+mode (onehot / sparse / ordinal, see src/preprocessor.py).
+
+Each mode is fitted on vw_churn_training_dataset, then transforms N rows
+sampled with replacement from it through transform_iter (chunked), and the
+chunks are stacked into one matrix. Reports the matrix's bytes per million
+rows, its dtype/format and the transform time.
+
+Usage (from the project root):
+    python scripts/bench_preprocessor_memory.py --rows 1000000
+"""
+import argparse
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.preprocessor import OUTPUT_DTYPES, build_preprocessor, transform_iter  # noqa: E402
+
+DB_PATH = PROJECT_ROOT / "data" / "telco_churn.db"
+DROP_COLS = ["customer_id", "snapshot_date", "churn_target"]
+
+
+def matrix_bytes(X) -> int:
+    if sp.issparse(X):
+        X = X.tocsr()
+        return X.data.nbytes + X.indices.nbytes + X.indptr.nbytes
+    if isinstance(X, pd.DataFrame):
+        return int(X.memory_usage(index=False).sum())
+    return np.asarray(X).nbytes
+
+
+def stack(chunks):
+    chunks = list(chunks)
+    if isinstance(chunks[0], pd.DataFrame):
+        return pd.concat(chunks, ignore_index=True)
+    return sp.vstack(chunks, format="csr") if sp.issparse(chunks[0]) else np.vstack(chunks)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(DB_PATH)
+    df = pd.read_sql_query("SELECT * FROM vw_churn_training_dataset", conn).drop(columns=DROP_COLS)
+    conn.close()
+    idx = np.random.default_rng(0).integers(0, len(df), args.rows)
+    X_raw = df.iloc[idx].reset_index(drop=True)
+
+    for mode in OUTPUT_DTYPES:
+        prep = build_preprocessor(output=mode).fit(df)
+        start = time.perf_counter()
+        X = stack(transform_iter(prep, X_raw, args.chunk_rows))
+        elapsed = time.perf_counter() - start
+
+        layout = "CSR" if sp.issparse(X) else "frame" if isinstance(X, pd.DataFrame) else "dense"
+        dtype = "+".join(sorted({str(t) for t in X.dtypes})) if isinstance(X, pd.DataFrame) else str(X.dtype)
+        per_million = matrix_bytes(X) / 2**20 * 1_000_000 / args.rows
+        print(f"{mode:<8} {layout:<5} {dtype:<13} {X.shape[1]:>3} columns  "
+              f"{per_million:7.1f} MiB per 1M rows  (transform {elapsed:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark: memory and throughput of multi-worker serving, with and without
+a shared model.
+
+For 1, 4 and 16 uvicorn workers, starts the API with:
+  - sklearn: every worker unpickles its own RandomForest (default setup)
+  - packed:  every worker loads its own copy of the packed forest arrays
+  - shared:  every worker maps the same packed .npy files read-only
+             (SHARED_MODEL=1; add --shm to copy them to /dev/shm first)
+then drives /predict from 32 client threads and reports req/s plus the
+summed RSS and PSS of the workers. RSS counts shared pages once per
+process; PSS splits them between the processes that map them, so it is
+the number that shows the saving. Linux only (/proc/<pid>/smaps_rollup).
+
+Needs the packed export: python -m src.forest_evaluator
+Prediction logs go to a temporary copy of the SQLite DB.
+
+Usage (from the project root):
+    python scripts/bench_shared_model.py --seconds 10
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import requests
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.bench_execution_modes import DB_PATH, drive, free_port  # noqa: E402
+
+WORKERS = [1, 4, 16]
+CLIENTS = 32
+CONFIGS = {
+    "sklearn": {"MODEL_BACKEND": "sklearn", "SHARED_MODEL": "0"},
+    "packed": {"MODEL_BACKEND": "packed", "SHARED_MODEL": "0"},
+    "shared": {"MODEL_BACKEND": "packed", "SHARED_MODEL": "1"},
+}
+
+# uvicorn --workers needs an import string; this module points the app at the temp DB
+APP_MODULE = """
+from pathlib import Path
+import api.app as a
+a.DB_PATH = Path({db!r})
+a.log_writer.db_path = a.DB_PATH
+app = a.app
+"""
+
+
+def children(pid: int):
+    out = []
+    for task in Path(f"/proc/{pid}/task").iterdir():
+        for child in (task / "children").read_text().split():
+            out.append(int(child))
+            out.extend(children(int(child)))
+    return out
+
+
+def memory_kb(pid: int) -> dict:
+    fields = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+        name, value = line.split(":", 1)
+        fields[name] = int(value.split()[0])
+    return {"rss": fields["Rss"], "pss": fields["Pss"]}
+
+
+def start_server(env_overrides: dict, workers: int, port: int, app_dir: Path) -> subprocess.Popen:
+    # Cache off: the clients repeat one payload and every request must reach the model
+    env = dict(os.environ, PYTHONPATH=str(PROJECT_ROOT), PREDICTION_CACHE_SIZE="0", **env_overrides)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "bench_app:app", "--app-dir", str(app_dir),
+         "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=PROJECT_ROOT, env=env,
+    )
+    # Requests land on any worker: wait until every worker has loaded and answers ready
+    url = f"http://127.0.0.1:{port}/ready"
+    streak = 0
+    for _ in range(3000):
+        try:
+            streak = streak + 1 if requests.get(url, timeout=1).status_code == 200 else 0
+        except requests.ConnectionError:
+            streak = 0
+        if streak >= 4 * workers:
+            return proc
+        time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError(f"{workers} workers did not become ready")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--workers", type=int, nargs="+", default=WORKERS)
+    parser.add_argument("--configs", nargs="+", default=list(CONFIGS), choices=list(CONFIGS))
+    parser.add_argument("--shm", action="store_true", help="shared config: copy the arrays to /dev/shm")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        db_copy = tmp / "telco_churn.db"
+        shutil.copy(DB_PATH, db_copy)
+        (tmp / "bench_app.py").write_text(APP_MODULE.format(db=str(db_copy)))
+
+        for name in args.configs:
+            env = dict(CONFIGS[name])
+            if name == "shared" and args.shm:
+                env["SHARED_MODEL_DIR"] = "/dev/shm/churn_model_rf_packed"
+            for workers in args.workers:
+                port = free_port()
+                proc = start_server(env, workers, port, tmp)
+                try:
+                    drive(port, 4, 1.0)  # warm-up
+                    rps, rejected, errors = drive(port, CLIENTS, args.seconds)
+                    mem = [memory_kb(pid) for pid in children(proc.pid)]
+                finally:
+                    proc.terminate()
+                    proc.wait(timeout=60)
+                rss = sum(m["rss"] for m in mem) / 1024
+                pss = sum(m["pss"] for m in mem) / 1024
+                print(f"{name:<8} workers={workers:>2}  {rps:8.1f} req/s  "
+                      f"RSS {rss:8.0f} MiB  PSS {pss:8.0f} MiB  errors={errors + rejected}")
+
+
+if __name__ == "__main__":
+    main()
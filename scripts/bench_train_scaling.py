@@ -0,0 +1,86 @@
+"""
+Benchmark: wall-clock of the cross-validated search in src/train.py as the
+number of pool workers grows, and the saving from the fold cache.
+
+The preprocessed folds are built once (cold, timed) into a temporary cache
+directory, then the same candidate grid is searched on them with 1, 2, 4 ...
+--max-workers processes. Reports search seconds, speedup over one worker and
+parallel efficiency; speedup is bounded by the number of physical cores.
+
+Usage (from the project root):
+    python scripts/bench_train_scaling.py --models random_forest --folds 5 --max-workers 8
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from sklearn.model_selection import train_test_split  # noqa: E402
+
+from src.train import (  # noqa: E402
+    DROP_COLS, SEED, TARGET, TEST_SIZE, available_models, cached_folds, candidates, init_worker,
+    load_training_data, search,
+)
+
+
+def make_pool(workers: int) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn"), initializer=init_worker,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--models", nargs="+", default=None)
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--output", default="onehot")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    df = load_training_data()
+    X = df.drop(columns=DROP_COLS + [TARGET])
+    y = df[TARGET].astype(int).to_numpy()
+    X_train, _, y_train, _ = train_test_split(X, y, test_size=TEST_SIZE, stratify=y, random_state=SEED)
+    X_train = X_train.reset_index(drop=True)
+    cands = candidates(args.models or available_models())
+
+    workers = [1]
+    while workers[-1] * 2 <= args.max_workers:
+        workers.append(workers[-1] * 2)
+    if workers[-1] != args.max_workers:
+        workers.append(args.max_workers)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        with make_pool(args.max_workers) as pool:
+            start = time.perf_counter()
+            fold_paths, built = cached_folds(pool, X_train, y_train, args.folds, args.output, SEED, Path(cache_dir))
+            cold = time.perf_counter() - start
+            start = time.perf_counter()
+            cached_folds(pool, X_train, y_train, args.folds, args.output, SEED, Path(cache_dir))
+            warm = time.perf_counter() - start
+        print(f"folds: {built} built in {cold:.2f}s, cache hit in {warm:.3f}s")
+        print(f"{len(cands)} candidates x {args.folds} folds = {len(cands) * args.folds} fits "
+              f"({os.cpu_count()} CPUs visible)")
+
+        print(f"{'workers':>8} {'search_s':>10} {'speedup':>8} {'efficiency':>11}")
+        base = None
+        for n in workers:
+            with make_pool(n) as pool:
+                # Spawn the workers before timing so interpreter start-up is not counted
+                list(pool.map(int, range(n)))
+                start = time.perf_counter()
+                search(pool, fold_paths, cands, SEED)
+                elapsed = time.perf_counter() - start
+            base = base or elapsed
+            print(f"{n:>8} {elapsed:>10.2f} {base / elapsed:>7.2f}x {base / elapsed / n:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark: reading vw_churn_training_dataset vs the materialized
+churn_training_dataset table.
+
+Copies data/telco_churn.db into a temp dir, replicates the fact rows over
+earlier snapshot dates until there are at least --rows facts, refreshes the
+materialized table, then times the same reads against both sources:
+  - full read into pandas (notebooks, dashboard)
+  - one snapshot_date
+  - churn rate by contract type (sql/churn_analysis.sql)
+
+Usage (from the project root):
+    python scripts/bench_training_table.py --rows 1000000
+"""
+import argparse
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.load_star_schema import (  # noqa: E402
+    FACT_INSERT_COLS, SNAPSHOT_DATE, TRAINING_TABLE, TRAINING_VIEW,
+    ensure_schema, refresh_training_table,
+)
+
+DB_PATH = PROJECT_ROOT / "data" / "telco_churn.db"
+
+QUERIES = {
+    "full read": "SELECT * FROM {source}",
+    "one snapshot": f"SELECT * FROM {{source}} WHERE snapshot_date = '{SNAPSHOT_DATE}'",
+    "by contract type": """
+        SELECT contract_type, ROUND(100.0 * AVG(churn_target), 2) AS churn_rate_pct, COUNT(*) AS customers
+        FROM {source}
+        GROUP BY contract_type
+    """,
+}
+
+
+def replicate_facts(conn: sqlite3.Connection, n_rows: int) -> int:
+    """Copy the base snapshot's facts to earlier dates until there are >= n_rows facts."""
+    base = conn.execute(
+        "SELECT COUNT(*) FROM fact_customer_snapshot WHERE snapshot_date = ?;", (SNAPSHOT_DATE,)
+    ).fetchone()[0]
+    cols = ", ".join(FACT_INSERT_COLS)
+    select = ", ".join("date(snapshot_date, ?)" if c == "snapshot_date" else c for c in FACT_INSERT_COLS)
+    with conn:
+        for k in range(1, -(-n_rows // base)):
+            conn.execute(
+                f"""
+                INSERT INTO fact_customer_snapshot ({cols})
+                SELECT {select} FROM fact_customer_snapshot WHERE snapshot_date = ?;
+                """,
+                (f"-{k} days", SNAPSHOT_DATE),
+            )
+    return conn.execute("SELECT COUNT(*) FROM fact_customer_snapshot;").fetchone()[0]
+
+
+def timed(conn: sqlite3.Connection, sql: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pd.read_sql_query(sql, conn)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "telco_churn.db"
+        shutil.copy(DB_PATH, db_path)
+        conn = sqlite3.connect(db_path)
+        ensure_schema(conn)
+
+        n_facts = replicate_facts(conn, args.rows)
+        start = time.perf_counter()
+        with conn:
+            refresh_training_table(conn.cursor(), SNAPSHOT_DATE, full=True)
+        print(f"facts: {n_facts:,}  full refresh: {time.perf_counter() - start:.1f}s")
+
+        for name, sql in QUERIES.items():
+            t_view = timed(conn, sql.format(source=TRAINING_VIEW), args.repeat)
+            t_table = timed(conn, sql.format(source=TRAINING_TABLE), args.repeat)
+            print(f"{name:<18} view {t_view:7.3f}s  table {t_table:7.3f}s  speedup {t_view / t_table:5.1f}x")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
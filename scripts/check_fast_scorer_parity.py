@@ -0,0 +1,61 @@
+"""
+Parity check: FastScorer vs preprocessor.transform over the whole
+vw_churn_training_dataset. Exits non-zero on any mismatch.
+
+Usage (from the project root):
+    python scripts/check_fast_scorer_parity.py
+"""
+import sqlite3
+import sys
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.fast_scorer import FastScorer  # noqa: E402
+
+DB_PATH = PROJECT_ROOT / "data" / "telco_churn.db"
+PREPROCESSOR_PATH = PROJECT_ROOT / "artifacts" / "preprocessor.joblib"
+
+DROP_COLS = ["customer_id", "snapshot_date", "churn_target"]
+
+
+def main():
+    conn = sqlite3.connect(DB_PATH)
+    df = pd.read_sql_query("SELECT * FROM vw_churn_training_dataset", conn)
+    conn.close()
+    X = df.drop(columns=DROP_COLS)
+
+    preprocessor = joblib.load(PREPROCESSOR_PATH)
+    scorer = FastScorer.from_preprocessor(preprocessor)
+
+    expected = preprocessor.transform(X)
+    if hasattr(expected, "toarray"):
+        expected = expected.toarray()
+    expected = np.asarray(expected, dtype=np.float64)
+
+    # Row-by-row, exactly as the API calls it
+    records = X.to_dict(orient="records")
+    actual = np.vstack([scorer.transform_record(r) for r in records])
+
+    # NaN == NaN for parity purposes
+    same = (expected == actual) | (np.isnan(expected) & np.isnan(actual))
+    bad_rows = np.flatnonzero(~same.all(axis=1))
+
+    print(f"rows checked: {len(X)}, features: {expected.shape[1]}")
+    if expected.shape != actual.shape:
+        print(f"❌ shape mismatch: {expected.shape} vs {actual.shape}")
+        sys.exit(1)
+    if len(bad_rows):
+        cols = np.flatnonzero(~same[bad_rows[0]])
+        print(f"❌ {len(bad_rows)} mismatching rows; first row {bad_rows[0]}, columns {cols.tolist()}")
+        sys.exit(1)
+    print("✅ FastScorer output is identical to preprocessor.transform")
+
+
+if __name__ == "__main__":
+    main()
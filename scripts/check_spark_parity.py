@@ -0,0 +1,97 @@
+"""
+Parity check: spark/spark_features.py vs the sklearn pipeline on the whole
+vw_churn_training_dataset, in Spark local mode. Compares the engineered
+columns, the encoded feature matrix (exact) and, when the model artifact is
+present, churn probabilities from the pandas-UDF scorer. Exits non-zero on
+any mismatch.
+
+Usage (from the project root):
+    python scripts/check_spark_parity.py
+"""
+import sqlite3
+import sys
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from spark.spark_features import KEY_COLS, build_features, get_spark, score  # noqa: E402
+from src.fast_scorer import FastScorer  # noqa: E402
+from src.forest_evaluator import PARITY_TOLERANCE  # noqa: E402
+
+DB_PATH = PROJECT_ROOT / "data" / "telco_churn.db"
+PREPROCESSOR_PATH = PROJECT_ROOT / "artifacts" / "preprocessor.joblib"
+MODEL_PATH = PROJECT_ROOT / "artifacts" / "churn_model_rf.joblib"
+
+DROP_COLS = ["customer_id", "snapshot_date", "churn_target"]
+ENGINEERED = ["avg_monthly_spend", "tenure_band", "addon_count"]
+
+
+def same(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    # NaN == NaN for parity purposes
+    return (a == b) | (pd.isna(a) & pd.isna(b))
+
+
+def main():
+    conn = sqlite3.connect(DB_PATH)
+    df = pd.read_sql_query("SELECT * FROM vw_churn_training_dataset", conn)
+    conn.close()
+    df = df.sort_values(KEY_COLS, ignore_index=True)
+    X = df.drop(columns=DROP_COLS)
+
+    preprocessor = joblib.load(PREPROCESSOR_PATH)
+    tables = FastScorer.from_preprocessor(preprocessor)
+    engineered = preprocessor.steps[0][1].transform(X)
+    expected = preprocessor.transform(X)
+    if hasattr(expected, "toarray"):
+        expected = expected.toarray()
+    expected = np.asarray(expected, dtype=np.float64)
+
+    spark = get_spark("telco-churn-parity")
+    features = build_features(spark.createDataFrame(df), tables)
+    model = joblib.load(MODEL_PATH) if MODEL_PATH.exists() else None
+    if model is not None:
+        features = score(features, model)
+    out = features.toPandas().sort_values(KEY_COLS, ignore_index=True)
+    spark.stop()
+
+    failed = False
+    print(f"rows checked: {len(df)}, features: {expected.shape[1]}")
+
+    for c in ENGINEERED:
+        ok = same(engineered[c].to_numpy(), out[c].to_numpy())
+        if not ok.all():
+            print(f"❌ {c}: {int((~ok).sum())} mismatching rows; first row {int(np.flatnonzero(~ok)[0])}")
+            failed = True
+
+    actual = np.vstack(out["features"].to_numpy())
+    if actual.shape != expected.shape:
+        print(f"❌ shape mismatch: {expected.shape} vs {actual.shape}")
+        sys.exit(1)
+    ok = same(expected, actual)
+    bad_rows = np.flatnonzero(~ok.all(axis=1))
+    if len(bad_rows):
+        cols = np.flatnonzero(~ok[bad_rows[0]])
+        print(f"❌ features: {len(bad_rows)} mismatching rows; first row {bad_rows[0]}, columns {cols.tolist()}")
+        failed = True
+
+    if model is None:
+        print(f"(model not found at {MODEL_PATH}; scoring parity skipped)")
+    else:
+        diff = float(np.max(np.abs(model.predict_proba(expected)[:, 1] - out["churn_probability"].to_numpy())))
+        print(f"max |sklearn - spark| churn_probability: {diff:.3e}")
+        if diff > PARITY_TOLERANCE:
+            print(f"❌ scoring parity failed (> {PARITY_TOLERANCE})")
+            failed = True
+
+    if failed:
+        sys.exit(1)
+    print("✅ Spark features (and scores) match the sklearn pipeline")
+
+
+if __name__ == "__main__":
+    main()
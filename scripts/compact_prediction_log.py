@@ -0,0 +1,46 @@
+"""
+Retention / compaction for prediction_log.
+
+Raw rows older than --keep-raw-days are deleted in batches (their counts,
+sums and histograms stay in the minute/hour rollups); minute rollups older
+than --keep-minute-days are dropped (hour rollups are kept). --vacuum
+reclaims the freed pages afterwards. Safe to run while the API is writing.
+
+Usage (from the project root, e.g. daily from cron):
+    python scripts/compact_prediction_log.py --keep-raw-days 30 --keep-minute-days 7
+"""
+import argparse
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from api.prediction_logger import compact, connect, ensure_monitoring_schema  # noqa: E402
+
+DB_PATH = PROJECT_ROOT / "data" / "telco_churn.db"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", type=Path, default=DB_PATH)
+    parser.add_argument("--keep-raw-days", type=float, default=30)
+    parser.add_argument("--keep-minute-days", type=float, default=7)
+    parser.add_argument("--batch-rows", type=int, default=50_000)
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM afterwards (needs exclusive access)")
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    # Rollups must exist (and be backfilled) before raw rows can be dropped
+    ensure_monitoring_schema(conn)
+    result = compact(conn, args.keep_raw_days, args.keep_minute_days, args.batch_rows)
+    if args.vacuum:
+        conn.execute("VACUUM;")
+    conn.close()
+
+    print(f"✅ deleted {result['raw_rows_deleted']:,} raw prediction_log rows "
+          f"and {result['minute_rollups_deleted']:,} minute rollups")
+
+
+if __name__ == "__main__":
+    main()
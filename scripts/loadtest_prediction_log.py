@@ -0,0 +1,105 @@
+"""
+Load test: per-request SQLite connect/insert/commit (old _log_prediction)
+vs the background PredictionLogWriter, under concurrent request threads.
+
+Reports throughput and p50/p99 latency of the logging call as seen by the
+request handler. Uses a temporary DB, so data/telco_churn.db is untouched.
+
+Usage (from the project root):
+    python scripts/loadtest_prediction_log.py --threads 32 --requests 500
+"""
+import argparse
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from api.prediction_logger import PredictionLogWriter, insert_predictions  # noqa: E402
+
+SCHEMA_PATH = PROJECT_ROOT / "sql" / "monitoring.sql"
+
+
+def make_record():
+    return (datetime.now(timezone.utc).isoformat(), str(uuid.uuid4()), "default", 0.48, 0.5, 1, None, 0)
+
+
+def log_sync(db_path):
+    def _log(record):
+        conn = sqlite3.connect(db_path, timeout=30)
+        insert_predictions(conn, [record])
+        conn.close()
+    return _log
+
+
+def run(log_fn, threads, requests_per_thread):
+    latencies = [[] for _ in range(threads)]
+
+    def worker(i):
+        for _ in range(requests_per_thread):
+            record = make_record()
+            t0 = time.perf_counter()
+            log_fn(record)
+            latencies[i].append(time.perf_counter() - t0)
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    lat_ms = np.concatenate([np.array(x) for x in latencies]) * 1000
+    return len(lat_ms) / elapsed, np.percentile(lat_ms, 50), np.percentile(lat_ms, 99)
+
+
+def fresh_db(tmp: Path, name: str) -> Path:
+    db_path = tmp / name
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA_PATH.read_text())
+    conn.close()
+    return db_path
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=500, help="requests per thread")
+    parser.add_argument("--flush-rows", type=int, default=500)
+    parser.add_argument("--flush-ms", type=float, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+
+        sync_db = fresh_db(tmp, "sync.db")
+        rps, p50, p99 = run(log_sync(sync_db), args.threads, args.requests)
+        print(f"sync  connect+commit : {rps:10.0f} req/s  p50={p50:7.3f} ms  p99={p99:7.3f} ms")
+
+        async_db = fresh_db(tmp, "async.db")
+        writer = PredictionLogWriter(async_db, flush_rows=args.flush_rows, flush_interval_ms=args.flush_ms)
+        writer.start()
+        rps, p50, p99 = run(lambda r: writer.submit([r]), args.threads, args.requests)
+        t0 = time.perf_counter()
+        writer.close()
+        drain_s = time.perf_counter() - t0
+        print(f"async writer         : {rps:10.0f} req/s  p50={p50:7.3f} ms  p99={p99:7.3f} ms"
+              f"  (final drain {drain_s * 1000:.0f} ms)")
+
+        conn = sqlite3.connect(async_db)
+        n = conn.execute("SELECT COUNT(*) FROM prediction_log").fetchone()[0]
+        conn.close()
+        print(f"async rows written: {n} / {args.threads * args.requests}, stats: {writer.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+PySpark feature engineering + batch scoring for the churn model.
+
+Spark-native versions of:
+  - TelecomFeatureEngineer (avg_monthly_spend, tenure_band, addon_count)
+  - the fitted build_preprocessor ColumnTransformer (median / most-frequent
+    imputation, one-hot encoding with handle_unknown="ignore")
+compiled from the fitted artifacts/preprocessor.joblib, so the `features`
+array column has the same layout and values as preprocessor.transform.
+
+Scoring broadcasts the fitted model once and scores each partition with an
+iterator pandas UDF (one predict_proba per Arrow batch).
+
+Usage (from the project root; local mode unless SPARK_MASTER is set):
+    python spark/spark_features.py score --input data/feature_store/churn_training.parquet \\
+        --output data/scores.parquet
+    python spark/spark_features.py features --input <parquet|csv> --output <dir>
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import Iterator
+
+import joblib
+import numpy as np
+import pandas as pd
+from pyspark.sql import DataFrame, SparkSession
+from pyspark.sql import functions as F
+from pyspark.sql.functions import pandas_udf
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.fast_scorer import FastScorer, NUMERIC_INPUTS  # noqa: E402
+
+ARTIFACTS_DIR = PROJECT_ROOT / "artifacts"
+PREPROCESSOR_PATH = ARTIFACTS_DIR / "preprocessor.joblib"
+MODEL_PATH = ARTIFACTS_DIR / "churn_model_rf.joblib"
+DEFAULT_INPUT = PROJECT_ROOT / "data" / "feature_store" / "churn_training.parquet"
+
+DEFAULT_THRESHOLD = 0.48
+KEY_COLS = ["customer_id", "snapshot_date"]
+
+
+def get_spark(app_name: str = "telco-churn-features") -> SparkSession:
+    return (
+        SparkSession.builder
+        .master(os.getenv("SPARK_MASTER", "local[*]"))
+        .appName(app_name)
+        # pd.to_numeric(errors="coerce"): bad numerics become null instead of failing
+        .config("spark.sql.ansi.enabled", "false")
+        .config("spark.sql.execution.arrow.pyspark.enabled", "true")
+        .getOrCreate()
+    )
+
+
+def compile_preprocessor(preprocessor_path: Path = PREPROCESSOR_PATH) -> FastScorer:
+    """Imputer fills, one-hot tables and tenure bins of the fitted pipeline."""
+    return FastScorer.from_preprocessor(joblib.load(preprocessor_path))
+
+
+# ------------------------
+# Feature engineering
+# ------------------------
+def _tenure_band(tenure, bins, labels):
+    # pd.cut(right=True) + astype(str); out-of-range -> null, filled by the imputer in encode()
+    expr = F.lit(None).cast("string")
+    for lo, hi, label in reversed(list(zip(bins[:-1], bins[1:], labels))):
+        expr = F.when((tenure > F.lit(lo)) & (tenure <= F.lit(hi)), F.lit(label)).otherwise(expr)
+    return expr
+
+
+def engineer(df: DataFrame, tables: FastScorer) -> DataFrame:
+    """Spark equivalent of TelecomFeatureEngineer.transform."""
+    for c in NUMERIC_INPUTS:
+        df = df.withColumn(c, F.col(c).cast("double"))
+
+    # fillna(0): pandas treats both null and NaN as missing
+    tenure = F.when(F.col("tenure_months").isNull() | F.isnan("tenure_months"), F.lit(0.0)) \
+        .otherwise(F.col("tenure_months"))
+    df = df.withColumn(
+        "avg_monthly_spend",
+        F.when(tenure > 0, F.col("total_charges") / F.col("tenure_months")).otherwise(F.lit(0.0)),
+    )
+    df = df.withColumn("tenure_band", _tenure_band(tenure, tables.tenure_bins, tables.tenure_labels))
+
+    addons = [F.when(F.col(c) == "Yes", 1).otherwise(0) for c in tables.addon_cols if c in df.columns]
+    addon_count = sum(addons[1:], addons[0]) if addons else F.lit(0)
+    return df.withColumn("addon_count", addon_count.cast("long"))
+
+
+def encode(df: DataFrame, tables: FastScorer) -> DataFrame:
+    """
+    Add `features` (array<double>) with the fitted ColumnTransformer layout:
+    imputed numerics, then one-hot categoricals (unknown -> all zeros).
+    """
+    exprs = [F.lit(0.0)] * tables.n_features
+
+    for col, fill, idx in tables.numeric:
+        v = F.col(col).cast("double")
+        if fill is not None:
+            v = F.when(v.isNull() | F.isnan(v), F.lit(fill)).otherwise(v)
+        exprs[idx] = v
+
+    for col, _missing, fill, table in tables.categorical:
+        v = F.col(col)
+        if fill is not None:
+            v = F.when(v.isNull(), F.lit(fill)).otherwise(v)
+        for category, idx in table.items():
+            exprs[idx] = F.when(v == F.lit(category), F.lit(1.0)).otherwise(F.lit(0.0))
+
+    return df.withColumn("features", F.array(*exprs))
+
+
+def build_features(df: DataFrame, tables: FastScorer) -> DataFrame:
+    return encode(engineer(df, tables), tables)
+
+
+# ------------------------
+# Scoring
+# ------------------------
+def score(df: DataFrame, model, threshold: float = DEFAULT_THRESHOLD) -> DataFrame:
+    """Add churn_probability / churn_flag to a frame with a `features` column."""
+    spark = df.sparkSession
+    model_bc = spark.sparkContext.broadcast(model)
+
+    @pandas_udf("double")
+    def churn_probability(batches: Iterator[pd.Series]) -> Iterator[pd.Series]:
+        model = model_bc.value  # deserialized once per task
+        for features in batches:
+            if features.empty:
+                yield pd.Series([], dtype="float64")
+                continue
+            yield pd.Series(model.predict_proba(np.vstack(features.to_numpy()))[:, 1])
+
+    return (
+        df.withColumn("churn_probability", churn_probability(F.col("features")))
+        .withColumn("churn_flag", (F.col("churn_probability") >= F.lit(threshold)).cast("int"))
+    )
+
+
+def read_input(spark: SparkSession, path: Path) -> DataFrame:
+    if Path(path).suffix.lower() == ".csv":
+        return spark.read.csv(str(path), header=True)
+    return spark.read.parquet(str(path))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Spark feature engineering and batch scoring.")
+    parser.add_argument("job", choices=["features", "score"])
+    parser.add_argument("--input", type=Path, default=DEFAULT_INPUT)
+    parser.add_argument("--output", type=Path, required=True)
+    parser.add_argument("--preprocessor", type=Path, default=PREPROCESSOR_PATH)
+    parser.add_argument("--model", type=Path, default=MODEL_PATH)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    spark = get_spark()
+    tables = compile_preprocessor(args.preprocessor)
+
+    df = build_features(read_input(spark, args.input), tables)
+    if args.job == "score":
+        keys = [c for c in KEY_COLS if c in df.columns]
+        df = score(df, joblib.load(args.model), args.threshold).select(*keys, "churn_probability", "churn_flag")
+
+    df.write.mode("overwrite").parquet(str(args.output))
+    print(f"✅ {args.job} written to {args.output}")
+    spark.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,5 +5,39 @@ CREATE TABLE IF NOT EXISTS prediction_log (
     mode TEXT NOT NULL,
     threshold REAL NOT NULL,
     churn_probability REAL NOT NULL,
-    churn_flag INTEGER NOT NULL
+    churn_flag INTEGER NOT NULL,
+    -- registry version that produced the score (NULL = unversioned artifacts/)
+    model_version TEXT,
+    -- 1 = candidate scored in shadow on sampled traffic (same request_id as the served row);
+    -- excluded from the rollups below
+    is_shadow INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_prediction_log_ts ON prediction_log(ts_utc);
+
+-- Rollups maintained by api/prediction_logger.py in the same transaction as the raw rows.
+-- bucket = ts_utc prefix ('YYYY-MM-DDTHH:MM' per minute, 'YYYY-MM-DDTHH' per hour);
+-- h0..h9 = probability histogram, bucket k covers [k/10, (k+1)/10)
+CREATE TABLE IF NOT EXISTS prediction_rollup_minute (
+    bucket TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    churn_flag INTEGER NOT NULL,
+    n INTEGER NOT NULL,
+    prob_sum REAL NOT NULL,
+    prob_sumsq REAL NOT NULL,
+    h0 INTEGER NOT NULL, h1 INTEGER NOT NULL, h2 INTEGER NOT NULL, h3 INTEGER NOT NULL, h4 INTEGER NOT NULL,
+    h5 INTEGER NOT NULL, h6 INTEGER NOT NULL, h7 INTEGER NOT NULL, h8 INTEGER NOT NULL, h9 INTEGER NOT NULL,
+    PRIMARY KEY (bucket, mode, churn_flag)
+);
+
+CREATE TABLE IF NOT EXISTS prediction_rollup_hour (
+    bucket TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    churn_flag INTEGER NOT NULL,
+    n INTEGER NOT NULL,
+    prob_sum REAL NOT NULL,
+    prob_sumsq REAL NOT NULL,
+    h0 INTEGER NOT NULL, h1 INTEGER NOT NULL, h2 INTEGER NOT NULL, h3 INTEGER NOT NULL, h4 INTEGER NOT NULL,
+    h5 INTEGER NOT NULL, h6 INTEGER NOT NULL, h7 INTEGER NOT NULL, h8 INTEGER NOT NULL, h9 INTEGER NOT NULL,
+    PRIMARY KEY (bucket, mode, churn_flag)
 );
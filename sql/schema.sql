@@ -19,7 +19,9 @@ CREATE TABLE dim_contract (
     contract_key INTEGER PRIMARY KEY AUTOINCREMENT,
     contract_type TEXT,
     paperless_billing TEXT,
-    payment_method TEXT
+    payment_method TEXT,
+    nk_hash INTEGER,  -- hash of the natural key columns (surrogate key lookups)
+    UNIQUE (contract_type, paperless_billing, payment_method)
 );
 
 -- =========================
@@ -35,7 +37,10 @@ CREATE TABLE dim_services (
     device_protection TEXT,
     tech_support TEXT,
     streaming_tv TEXT,
-    streaming_movies TEXT
+    streaming_movies TEXT,
+    nk_hash INTEGER,  -- hash of the natural key columns (surrogate key lookups)
+    UNIQUE (phone_service, multiple_lines, internet_service, online_security, online_backup,
+            device_protection, tech_support, streaming_tv, streaming_movies)
 );
 
 -- =========================
@@ -54,8 +59,13 @@ CREATE TABLE fact_customer_snapshot (
 
     churn_label TEXT,
     snapshot_date TEXT,
+    row_hash INTEGER,  -- hash of the customer's attributes in this snapshot (incremental loads)
 
     FOREIGN KEY (customer_key) REFERENCES dim_customer(customer_key),
     FOREIGN KEY (contract_key) REFERENCES dim_contract(contract_key),
     FOREIGN KEY (services_key) REFERENCES dim_services(services_key)
 );
+
+CREATE UNIQUE INDEX ux_fact_customer_snapshot ON fact_customer_snapshot(customer_key, snapshot_date);
+CREATE UNIQUE INDEX ux_dim_contract_nk_hash ON dim_contract(nk_hash);
+CREATE UNIQUE INDEX ux_dim_services_nk_hash ON dim_services(nk_hash);
@@ -44,3 +44,15 @@ FROM fact_customer_snapshot f
 JOIN dim_customer dc ON dc.customer_key = f.customer_key
 JOIN dim_contract dcon ON dcon.contract_key = f.contract_key
 JOIN dim_services ds ON ds.services_key = f.services_key;
+
+-- Materialized copy of the view (refreshed by src/load_star_schema.py per snapshot)
+CREATE TABLE IF NOT EXISTS churn_training_dataset AS SELECT * FROM vw_churn_training_dataset WHERE 0;
+CREATE UNIQUE INDEX IF NOT EXISTS ux_training_customer_snapshot ON churn_training_dataset(customer_id, snapshot_date);
+CREATE INDEX IF NOT EXISTS idx_training_snapshot_date ON churn_training_dataset(snapshot_date);
+
+-- Refresh watermarks: the table is stale when facts were loaded after its last refresh
+CREATE TABLE IF NOT EXISTS etl_watermark (
+    name TEXT PRIMARY KEY,
+    snapshot_date TEXT,
+    updated_at_utc TEXT
+);
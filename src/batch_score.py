@@ -0,0 +1,290 @@
+"""
+Offline batch scoring for full-customer-base backfills.
+
+Customers are read from the training table/view in SQLite or from a
+Parquet/CSV file, cut into fixed-size shards and scored across a process
+pool; every worker loads the preprocessor and model once. Results stream
+to one Parquet file per shard (--output DIR) or to the batch_scores table,
+with each completed shard recorded so `--resume` skips it on a rerun.
+
+Usage (from the project root):
+    python -m src.batch_score --workers 8 --output data/scores
+    python -m src.batch_score --input customers.parquet --to-db --job-id backfill-2026-01 --resume
+"""
+import argparse
+import multiprocessing
+import os
+import sqlite3
+import time
+from collections import defaultdict
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime, timezone
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.forest_evaluator import DB_PATH, MODEL_PATH, PACKED_MODEL_DIR, PREPROCESSOR_PATH, PackedForest
+
+SOURCE_TABLE = "churn_training_dataset"
+SOURCE_VIEW = "vw_churn_training_dataset"
+
+DEFAULT_THRESHOLD = 0.48
+KEY_COLS = ["customer_id", "snapshot_date"]
+DROP_COLS = ["customer_id", "snapshot_date", "churn_target"]
+
+SCORES_SQL = """
+    CREATE TABLE IF NOT EXISTS batch_scores (
+        job_id TEXT NOT NULL,
+        customer_id TEXT NOT NULL,
+        snapshot_date TEXT NOT NULL DEFAULT '',
+        churn_probability REAL NOT NULL,
+        churn_flag INTEGER NOT NULL,
+        PRIMARY KEY (job_id, customer_id, snapshot_date)
+    );
+    CREATE TABLE IF NOT EXISTS batch_score_shards (
+        job_id TEXT NOT NULL,
+        shard_id INTEGER NOT NULL,
+        rows INTEGER NOT NULL,
+        completed_at_utc TEXT NOT NULL,
+        PRIMARY KEY (job_id, shard_id)
+    );
+"""
+
+# Worker-process state, set once by init_worker
+_worker = {}
+
+
+# ------------------------
+# Workers
+# ------------------------
+def init_worker(preprocessor_path: str, model_path: str, packed_model_dir, threshold: float) -> None:
+    _worker["preprocessor"] = joblib.load(preprocessor_path)
+    if packed_model_dir and Path(packed_model_dir).exists():
+        _worker["model"] = PackedForest.load(packed_model_dir)
+    else:
+        _worker["model"] = joblib.load(model_path)
+    _worker["threshold"] = threshold
+
+
+def score_shard(shard_id: int, df: pd.DataFrame):
+    """Score one shard; returns (shard_id, pid, seconds, scores frame)."""
+    start = time.perf_counter()
+    X = _worker["preprocessor"].transform(df.drop(columns=[c for c in DROP_COLS if c in df.columns]))
+    proba = _worker["model"].predict_proba(X)[:, 1]
+
+    out = pd.DataFrame({c: df[c].to_numpy() for c in KEY_COLS if c in df.columns})
+    out["churn_probability"] = proba
+    out["churn_flag"] = (proba >= _worker["threshold"]).astype(np.int64)
+    return shard_id, os.getpid(), time.perf_counter() - start, out
+
+
+# ------------------------
+# Input
+# ------------------------
+def iter_shards(input_path, shard_size: int, db_path: Path = DB_PATH):
+    """Yield (shard_id, DataFrame) in a deterministic order (same shards on every run)."""
+    if input_path is None:
+        conn = sqlite3.connect(db_path)
+        has_table = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?;", (SOURCE_TABLE,)
+        ).fetchone()
+        source = SOURCE_TABLE if has_table else SOURCE_VIEW
+        chunks = pd.read_sql_query(
+            f"SELECT * FROM {source} ORDER BY customer_id, snapshot_date", conn, chunksize=shard_size
+        )
+        try:
+            yield from enumerate(chunks)
+        finally:
+            conn.close()
+        return
+
+    input_path = Path(input_path)
+    if input_path.suffix.lower() == ".csv":
+        yield from enumerate(pd.read_csv(input_path, chunksize=shard_size))
+    elif input_path.suffix.lower() in (".parquet", ".pq"):
+        import pyarrow.parquet as pq
+        pf = pq.ParquetFile(input_path)
+        yield from enumerate(b.to_pandas() for b in pf.iter_batches(batch_size=shard_size))
+    else:
+        raise ValueError(f"Unsupported input format: {input_path.suffix}")
+
+
+# ------------------------
+# Output sinks
+# ------------------------
+class ParquetSink:
+    """One file per shard; a shard is complete once its file exists (atomic rename)."""
+
+    def __init__(self, out_dir: Path, resume: bool):
+        self.out_dir = Path(out_dir)
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        if not resume:
+            for f in self.out_dir.glob("shard-*.parquet"):
+                f.unlink()
+
+    def _path(self, shard_id: int) -> Path:
+        return self.out_dir / f"shard-{shard_id:06d}.parquet"
+
+    def completed(self) -> set:
+        return {int(f.stem.split("-")[1]) for f in self.out_dir.glob("shard-*.parquet")}
+
+    def write(self, shard_id: int, scores: pd.DataFrame) -> None:
+        tmp = self._path(shard_id).with_suffix(".tmp")
+        scores.to_parquet(tmp, index=False)
+        tmp.replace(self._path(shard_id))
+
+    def close(self) -> None:
+        pass
+
+
+class DatabaseSink:
+    """batch_scores rows and the shard's completion mark commit in one transaction."""
+
+    def __init__(self, db_path: Path, job_id: str, resume: bool):
+        self.job_id = job_id
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL;")
+        self.conn.executescript(SCORES_SQL)
+        if not resume:
+            with self.conn:
+                self.conn.execute("DELETE FROM batch_scores WHERE job_id = ?;", (job_id,))
+                self.conn.execute("DELETE FROM batch_score_shards WHERE job_id = ?;", (job_id,))
+
+    def completed(self) -> set:
+        rows = self.conn.execute("SELECT shard_id FROM batch_score_shards WHERE job_id = ?;", (self.job_id,))
+        return {r[0] for r in rows}
+
+    def write(self, shard_id: int, scores: pd.DataFrame) -> None:
+        snapshot = scores["snapshot_date"] if "snapshot_date" in scores else pd.Series("", index=scores.index)
+        rows = zip(
+            [self.job_id] * len(scores),
+            scores["customer_id"].astype(str).tolist(),
+            snapshot.fillna("").astype(str).tolist(),
+            scores["churn_probability"].tolist(),
+            scores["churn_flag"].tolist(),
+        )
+        with self.conn:
+            self.conn.executemany(
+                """
+                INSERT OR REPLACE INTO batch_scores
+                    (job_id, customer_id, snapshot_date, churn_probability, churn_flag)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO batch_score_shards VALUES (?, ?, ?, ?);",
+                (self.job_id, shard_id, len(scores), datetime.now(timezone.utc).isoformat()),
+            )
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+# ------------------------
+# Driver
+# ------------------------
+def run(input_path, sink, workers: int, shard_size: int, threshold: float = DEFAULT_THRESHOLD,
+        db_path: Path = DB_PATH, model_backend: str = "sklearn") -> dict:
+    """
+    Score every shard not yet completed in `sink`. At most 2 shards per
+    worker are in flight, so memory stays bounded for any input size.
+    Returns overall and per-worker throughput.
+    """
+    done = sink.completed()
+    packed_dir = str(PACKED_MODEL_DIR) if model_backend == "packed" else None
+    initargs = (str(PREPROCESSOR_PATH), str(MODEL_PATH), packed_dir, threshold)
+
+    per_worker = defaultdict(lambda: {"shards": 0, "rows": 0, "busy_s": 0.0})
+    rows_scored, shards_scored, skipped = 0, 0, 0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_worker, initargs=initargs,
+    ) as pool:
+        pending = set()
+
+        def drain(return_when):
+            nonlocal pending, rows_scored, shards_scored
+            finished, pending = wait(pending, return_when=return_when)
+            for fut in finished:
+                shard_id, pid, seconds, scores = fut.result()
+                sink.write(shard_id, scores)
+                stats = per_worker[pid]
+                stats["shards"] += 1
+                stats["rows"] += len(scores)
+                stats["busy_s"] += seconds
+                rows_scored += len(scores)
+                shards_scored += 1
+
+        for shard_id, df in iter_shards(input_path, shard_size, db_path):
+            if shard_id in done:
+                skipped += 1
+                continue
+            pending.add(pool.submit(score_shard, shard_id, df))
+            if len(pending) >= 2 * workers:
+                drain(FIRST_COMPLETED)
+        if pending:
+            drain(ALL_COMPLETED)
+
+    elapsed = time.perf_counter() - start
+    return {
+        "workers": workers,
+        "shards_scored": shards_scored,
+        "shards_skipped": skipped,
+        "rows": rows_scored,
+        "elapsed_s": elapsed,
+        "rows_per_sec": rows_scored / elapsed if elapsed else 0.0,
+        "per_worker": {
+            pid: {**s, "rows_per_sec": s["rows"] / s["busy_s"] if s["busy_s"] else 0.0}
+            for pid, s in per_worker.items()
+        },
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"workers: {report['workers']}  shards: {report['shards_scored']} scored, "
+          f"{report['shards_skipped']} skipped (already complete)")
+    print(f"rows: {report['rows']:,} in {report['elapsed_s']:.1f}s ({report['rows_per_sec']:,.0f} rows/sec overall)")
+    for pid, s in sorted(report["per_worker"].items()):
+        print(f"  worker {pid}: {s['shards']} shards, {s['rows']:,} rows, {s['rows_per_sec']:,.0f} rows/sec busy")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Score the full customer base offline across a process pool.")
+    parser.add_argument("--input", type=Path, default=None,
+                        help="Parquet or CSV file (default: training table/view in the SQLite DB)")
+    out = parser.add_mutually_exclusive_group(required=True)
+    out.add_argument("--output", type=Path, help="directory for per-shard Parquet files")
+    out.add_argument("--to-db", action="store_true", help="write to the batch_scores table")
+    parser.add_argument("--job-id", default="backfill", help="batch_scores job id (--to-db)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--shard-size", type=int, default=50_000)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    # Shards are large batches, where sklearn's per-tree traversal beats the packed walk
+    parser.add_argument("--model-backend", choices=["sklearn", "packed"], default="sklearn")
+    parser.add_argument("--resume", action="store_true",
+                        help="skip shards completed by a previous run (same input and --shard-size)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.to_db:
+        sink = DatabaseSink(DB_PATH, args.job_id, args.resume)
+    else:
+        sink = ParquetSink(args.output, args.resume)
+
+    try:
+        report = run(args.input, sink, args.workers, args.shard_size, args.threshold,
+                     model_backend=args.model_backend)
+    finally:
+        sink.close()
+    print_report(report)
+
+
+if __name__ == "__main__":
+    main()
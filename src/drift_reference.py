@@ -0,0 +1,141 @@
+"""
+Reference distributions for drift monitoring.
+
+Built from vw_churn_training_dataset when the model is exported: quantile
+bins (numeric inputs and the model's churn_probability) or category shares
+(categorical inputs), written to artifacts/drift_reference.json. The API
+bins live traffic with the same `bin_index` and compares the two with PSI
+and KS (api/drift.py).
+
+Build (from the project root):
+    python -m src.drift_reference
+"""
+import json
+import math
+import sqlite3
+from bisect import bisect_right
+from datetime import datetime, timezone
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DB_PATH = PROJECT_ROOT / "data" / "telco_churn.db"
+ARTIFACTS_DIR = PROJECT_ROOT / "artifacts"
+PREPROCESSOR_PATH = ARTIFACTS_DIR / "preprocessor.joblib"
+MODEL_PATH = ARTIFACTS_DIR / "churn_model_rf.joblib"
+REFERENCE_PATH = ARTIFACTS_DIR / "drift_reference.json"
+
+NUMERIC_FEATURES = ["tenure_months", "monthly_charges", "total_charges"]
+CATEGORICAL_FEATURES = ["contract_type", "internet_service", "payment_method"]
+SCORE = "churn_probability"
+
+N_BINS = 20
+EPS = 1e-4  # floor for empty bins in PSI
+
+
+# ------------------------
+# Binning (shared with the API)
+# ------------------------
+def n_bins(spec: dict) -> int:
+    # numeric: len(edges) + 1 ranges + missing; categorical: categories + other
+    if spec["type"] == "numeric":
+        return len(spec["edges"]) + 2
+    return len(spec["categories"]) + 1
+
+
+def bin_index(spec: dict, value) -> int:
+    if spec["type"] == "numeric":
+        try:
+            x = float(value)
+        except (TypeError, ValueError):
+            x = math.nan
+        if x != x:
+            return len(spec["edges"]) + 1
+        return bisect_right(spec["edges"], x)
+    return spec["_lookup"].get(value, len(spec["categories"]))
+
+
+def prepare(spec: dict) -> dict:
+    """Add the category -> bin lookup used by bin_index (not serialized)."""
+    if spec["type"] == "categorical":
+        spec["_lookup"] = {c: i for i, c in enumerate(spec["categories"])}
+    return spec
+
+
+def psi(expected, actual) -> float:
+    """Population stability index between two share vectors."""
+    e = np.maximum(np.asarray(expected, dtype=np.float64), EPS)
+    a = np.maximum(np.asarray(actual, dtype=np.float64), EPS)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+
+def ks(expected, actual) -> float:
+    """Max CDF distance over the ordered bins (numeric specs only)."""
+    return float(np.max(np.abs(np.cumsum(expected) - np.cumsum(actual))))
+
+
+# ------------------------
+# Build
+# ------------------------
+def numeric_spec(values) -> dict:
+    x = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=np.float64)
+    finite = x[~np.isnan(x)]
+    edges = np.unique(np.quantile(finite, np.arange(1, N_BINS) / N_BINS)) if len(finite) else np.array([])
+    counts = np.bincount(np.searchsorted(edges, finite, side="right"), minlength=len(edges) + 1)
+    counts = np.append(counts, np.isnan(x).sum())
+    return {"type": "numeric", "edges": edges.tolist(), "proportions": (counts / len(x)).tolist()}
+
+
+def categorical_spec(values) -> dict:
+    shares = pd.Series(values).value_counts(normalize=True, dropna=False)
+    categories = [c for c in shares.index if isinstance(c, str)]
+    other = 1.0 - float(shares[categories].sum())
+    return {
+        "type": "categorical",
+        "categories": categories,
+        "proportions": [float(shares[c]) for c in categories] + [other],
+    }
+
+
+def build_reference(preprocessor, model, db_path: Path = DB_PATH) -> dict:
+    conn = sqlite3.connect(db_path)
+    df = pd.read_sql_query("SELECT * FROM vw_churn_training_dataset", conn)
+    conn.close()
+
+    X = df.drop(columns=["customer_id", "snapshot_date", "churn_target"])
+    scores = model.predict_proba(preprocessor.transform(X))[:, 1]
+
+    features = {c: numeric_spec(df[c]) for c in NUMERIC_FEATURES}
+    features.update({c: categorical_spec(df[c]) for c in CATEGORICAL_FEATURES})
+    features[SCORE] = numeric_spec(scores)
+    return {
+        "created_at_utc": datetime.now(timezone.utc).isoformat(),
+        "source": "vw_churn_training_dataset",
+        "n_rows": int(len(df)),
+        "features": features,
+    }
+
+
+def save_reference(reference: dict, path: Path = REFERENCE_PATH) -> None:
+    Path(path).write_text(json.dumps(reference, indent=2))
+
+
+def load_reference(path: Path = REFERENCE_PATH) -> dict:
+    reference = json.loads(Path(path).read_text())
+    for spec in reference["features"].values():
+        prepare(spec)
+    return reference
+
+
+def main():
+    reference = build_reference(joblib.load(PREPROCESSOR_PATH), joblib.load(MODEL_PATH))
+    save_reference(reference)
+    print(f"✅ drift reference ({reference['n_rows']} rows, {len(reference['features'])} features) "
+          f"written to {REFERENCE_PATH}")
+
+
+if __name__ == "__main__":
+    main()
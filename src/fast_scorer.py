@@ -0,0 +1,184 @@
+import math
+from bisect import bisect_left
+from numbers import Real
+
+import numpy as np
+from sklearn.compose import ColumnTransformer
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder
+
+from src.feature_engineering import TelecomFeatureEngineer, TENURE_BINS, TENURE_LABELS
+
+
+# Columns TelecomFeatureEngineer coerces with pd.to_numeric(errors="coerce")
+NUMERIC_INPUTS = ["tenure_months", "total_charges", "monthly_charges", "cltv"]
+
+
+def _to_numeric(value):
+    """Scalar equivalent of pd.to_numeric(..., errors="coerce")."""
+    if value is None:
+        return math.nan
+    if isinstance(value, Real) and not isinstance(value, bool):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _is_nan(value) -> bool:
+    # Same test sklearn uses for missing values in object arrays (X != X)
+    return value != value
+
+
+class FastScorer:
+    """
+    Pandas-free re-implementation of the fitted preprocessing Pipeline
+    (TelecomFeatureEngineer + ColumnTransformer) for low-latency scoring.
+
+    Built once from a fitted `preprocessor.joblib`; holds the imputer fill
+    values, one-hot lookup tables and tenure cut points as plain Python
+    structures and writes features straight into a dense float64 matrix
+    with the same column layout as `preprocessor.transform`.
+    """
+
+    def __init__(self, addon_cols, numeric, categorical, n_features,
+                 tenure_bins=TENURE_BINS, tenure_labels=TENURE_LABELS):
+        self.addon_cols = list(addon_cols)
+        # [(column, fill_value, output_index)]
+        self.numeric = numeric
+        # [(column, missing_value, fill_value, {category: output_index})]
+        self.categorical = categorical
+        self.n_features = n_features
+        self.tenure_bins = [float(b) for b in tenure_bins]
+        self.tenure_labels = list(tenure_labels)
+
+    # ------------------------
+    # Compilation
+    # ------------------------
+    @classmethod
+    def from_preprocessor(cls, preprocessor):
+        """
+        Compile a FastScorer from a fitted Pipeline(fe, ct).
+        Raises ValueError for configurations it cannot reproduce exactly.
+        """
+        if not isinstance(preprocessor, Pipeline) or len(preprocessor.steps) != 2:
+            raise ValueError("Expected a fitted Pipeline([('fe', ...), ('ct', ...)])")
+
+        fe = preprocessor.steps[0][1]
+        ct = preprocessor.steps[-1][1]
+        if not isinstance(fe, TelecomFeatureEngineer):
+            raise ValueError(f"Unsupported feature step: {type(fe).__name__}")
+        if not isinstance(ct, ColumnTransformer):
+            raise ValueError(f"Unsupported encoding step: {type(ct).__name__}")
+
+        numeric, categorical = [], []
+        n_features = 0
+
+        for name, trans, columns in ct.transformers_:
+            if trans == "drop":
+                continue
+            out = ct.output_indices_[name]
+            if out.stop == out.start:
+                continue
+            if trans == "passthrough" or isinstance(columns, slice) or not all(isinstance(c, str) for c in columns):
+                raise ValueError(f"Unsupported transformer '{name}': only named columns are supported")
+
+            steps = [s for _, s in trans.steps] if isinstance(trans, Pipeline) else [trans]
+            imputer = steps[0] if isinstance(steps[0], SimpleImputer) else None
+            rest = steps[1:] if imputer is not None else steps
+
+            encoder = None
+            if len(rest) == 1 and isinstance(rest[0], OneHotEncoder):
+                encoder = rest[0]
+            elif rest:
+                raise ValueError(f"Unsupported steps in '{name}': {[type(s).__name__ for s in rest]}")
+
+            columns = list(columns)
+            fills = [None] * len(columns)
+            missing = np.nan
+            if imputer is not None:
+                if imputer.add_indicator:
+                    raise ValueError("SimpleImputer(add_indicator=True) is not supported")
+                missing = imputer.missing_values
+                stats = list(imputer.statistics_)
+                if any(_is_nan(v) for v in stats):
+                    # sklearn drops (or zero-fills) all-missing columns; not worth mirroring
+                    raise ValueError(f"Imputer in '{name}' has empty features")
+                fills = stats
+
+            if encoder is None:
+                for i, (col, fill) in enumerate(zip(columns, fills)):
+                    numeric.append((col, None if fill is None else float(fill), out.start + i))
+            else:
+                if encoder.drop_idx_ is not None or getattr(encoder, "_infrequent_enabled", False):
+                    raise ValueError("OneHotEncoder with drop/infrequent categories is not supported")
+                if encoder.handle_unknown not in ("ignore", "infrequent_if_exist"):
+                    raise ValueError("OneHotEncoder must use handle_unknown='ignore'")
+                offset = out.start
+                for col, fill, cats in zip(columns, fills, encoder.categories_):
+                    cats = cats.tolist()
+                    table = {c: offset + j for j, c in enumerate(cats)}
+                    categorical.append((col, missing, fill, table))
+                    offset += len(cats)
+
+            n_features = max(n_features, out.stop)
+
+        return cls(fe.addon_cols, numeric, categorical, n_features)
+
+    # ------------------------
+    # Scoring path
+    # ------------------------
+    def tenure_band(self, tenure):
+        # pd.cut(bins, right=True) + astype(str); out-of-range -> NaN, filled by the imputer
+        idx = bisect_left(self.tenure_bins, tenure) - 1
+        if 0 <= idx < len(self.tenure_labels):
+            return self.tenure_labels[idx]
+        return math.nan
+
+    def engineer(self, record: dict) -> dict:
+        """Single-row equivalent of TelecomFeatureEngineer.transform."""
+        row = dict(record)
+        for c in NUMERIC_INPUTS:
+            row[c] = _to_numeric(row.get(c))
+
+        tenure = row["tenure_months"]
+        tenure_filled = 0 if _is_nan(tenure) else tenure
+
+        if tenure_filled > 0:
+            avg = row["total_charges"] / tenure
+            row["avg_monthly_spend"] = math.nan if math.isinf(avg) else avg
+        else:
+            row["avg_monthly_spend"] = 0.0
+
+        row["tenure_band"] = self.tenure_band(tenure_filled)
+        row["addon_count"] = sum(1 for c in self.addon_cols if row.get(c, None) == "Yes")
+        return row
+
+    def _fill(self, out: np.ndarray, row: dict) -> None:
+        for col, fill, idx in self.numeric:
+            v = float(row[col])
+            out[idx] = fill if (v != v and fill is not None) else v
+
+        for col, missing, fill, table in self.categorical:
+            v = row[col]
+            if fill is not None and (_is_nan(v) if _is_nan(missing) else v == missing):
+                v = fill
+            idx = table.get(v)
+            if idx is not None:  # unknown category -> all zeros (handle_unknown="ignore")
+                out[idx] = 1.0
+
+    def transform_record(self, record: dict) -> np.ndarray:
+        """One raw record (dict of view columns) -> (1, n_features) float64."""
+        out = np.zeros((1, self.n_features), dtype=np.float64)
+        self._fill(out[0], self.engineer(record))
+        return out
+
+    def transform_records(self, records) -> np.ndarray:
+        """Many raw records -> (n, n_features) float64, in input order."""
+        records = list(records)
+        out = np.zeros((len(records), self.n_features), dtype=np.float64)
+        for i, record in enumerate(records):
+            self._fill(out[i], self.engineer(record))
+        return out
@@ -3,6 +3,24 @@ import pandas as pd
 from sklearn.base import BaseEstimator, TransformerMixin
 
 
+# pd.cut bins (right-inclusive) and labels for tenure_band
+TENURE_BINS = [-1, 12, 24, 48, 1200]
+TENURE_LABELS = ["0-12", "13-24", "25-48", "49+"]
+
+# tenure_band values as a pandas categorical; out-of-range tenures are missing,
+# as pd.cut(...).astype(str) leaves them, and the fitted imputer fills them
+TENURE_BAND_DTYPE = pd.CategoricalDtype(TENURE_LABELS)
+
+NUMERIC_INPUTS = ["tenure_months", "total_charges", "monthly_charges", "cltv"]
+
+
+def tenure_band_codes(tenure: np.ndarray) -> np.ndarray:
+    """Category codes of TENURE_BAND_DTYPE for float tenures (NaN = 0, out of range = -1), same bins as pd.cut."""
+    codes = np.searchsorted(TENURE_BINS, np.nan_to_num(tenure, nan=0.0), side="left") - 1
+    codes[codes >= len(TENURE_LABELS)] = -1
+    return codes.astype(np.int8)
+
+
 class TelecomFeatureEngineer(BaseEstimator, TransformerMixin):
     """
     Custom feature engineering for telecom churn.
@@ -19,31 +37,33 @@ class TelecomFeatureEngineer(BaseEstimator, TransformerMixin):
         return self
 
     def transform(self, X):
-        X = X.copy()
+        # New frame over the input's column arrays: nothing is copied except the
+        # numeric columns that actually need coercion; X itself is not modified
+        cols = {c: X[c] for c in X.columns}
 
         # Ensure numeric fields are numeric
-        X["tenure_months"] = pd.to_numeric(X["tenure_months"], errors="coerce")
-        X["total_charges"] = pd.to_numeric(X["total_charges"], errors="coerce")
-        X["monthly_charges"] = pd.to_numeric(X["monthly_charges"], errors="coerce")
-        X["cltv"] = pd.to_numeric(X["cltv"], errors="coerce")
+        for c in NUMERIC_INPUTS:
+            if not pd.api.types.is_numeric_dtype(cols[c]):
+                cols[c] = pd.to_numeric(cols[c], errors="coerce")
+
+        tenure = cols["tenure_months"].to_numpy(dtype=np.float64, na_value=np.nan)
+        total = cols["total_charges"].to_numpy(dtype=np.float64, na_value=np.nan)
 
         # Engineered features
-        X["avg_monthly_spend"] = np.where(
-            X["tenure_months"].fillna(0) > 0,
-            X["total_charges"] / X["tenure_months"].replace({0: np.nan}),
-            0.0
-        )
-        X["avg_monthly_spend"] = X["avg_monthly_spend"].replace([np.inf, -np.inf], np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            spend = np.where(tenure > 0, total / tenure, 0.0)
+        spend[np.isinf(spend)] = np.nan
+        cols["avg_monthly_spend"] = pd.Series(spend, index=X.index)
 
-        X["tenure_band"] = pd.cut(
-            X["tenure_months"].fillna(0),
-            bins=[-1, 12, 24, 48, 1200],
-            labels=["0-12", "13-24", "25-48", "49+"]
-        ).astype(str)
+        cols["tenure_band"] = pd.Series(
+            pd.Categorical.from_codes(tenure_band_codes(tenure), dtype=TENURE_BAND_DTYPE), index=X.index
+        )
 
-        X["addon_count"] = 0
-        for c in self.addon_cols:
-            if c in X.columns:
-                X["addon_count"] += (X[c] == "Yes").astype(int)
+        addons = [c for c in self.addon_cols if c in X.columns]
+        # One boolean column at a time: no (rows x addons) object block is materialized
+        addon_count = np.zeros(len(X), dtype=np.int64)
+        for c in addons:
+            addon_count += (X[c] == "Yes").to_numpy()
+        cols["addon_count"] = pd.Series(addon_count, index=X.index)
 
-        return X
+        return pd.DataFrame(cols, copy=False)
@@ -0,0 +1,185 @@
+"""
+Columnar feature store for training and backfills.
+
+The training dataset (churn_training_dataset, i.e. vw_churn_training_dataset)
+plus the TelecomFeatureEngineer columns is exported once per snapshot to a
+hive-partitioned dataset (snapshot_date=YYYY-MM-DD/), with text columns
+dictionary-encoded. Readers then pull only the columns and snapshots they
+need through memory-mapped files instead of converting every row through
+Python objects in pd.read_sql_query.
+
+Two on-disk formats:
+  - parquet: compressed, portable (default)
+  - arrow:   uncompressed Arrow IPC; numeric columns without nulls map
+             straight into NumPy/pandas with no copy
+
+Export (from the project root):
+    python -m src.feature_store --format parquet
+    python -m src.feature_store --snapshot-date 2026-01-28 --format arrow
+"""
+import argparse
+import sqlite3
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+from pyarrow import fs
+
+from src.feature_engineering import TelecomFeatureEngineer
+from src.preprocessor import DEFAULT_CATEGORICAL_BASE
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DB_PATH = PROJECT_ROOT / "data" / "telco_churn.db"
+FEATURE_STORE_DIR = PROJECT_ROOT / "data" / "feature_store"
+
+SOURCE_TABLE = "churn_training_dataset"
+SOURCE_VIEW = "vw_churn_training_dataset"
+
+FORMATS = ["parquet", "arrow"]
+
+# Low-cardinality text columns, stored dictionary-encoded (pandas categoricals)
+DICTIONARY_COLS = DEFAULT_CATEGORICAL_BASE + ["tenure_band"]
+
+PARTITIONING = ds.partitioning(pa.schema([("snapshot_date", pa.string())]), flavor="hive")
+
+
+def store_path(root: Path, fmt: str) -> Path:
+    return Path(root) / f"churn_training.{fmt}"
+
+
+def _source(conn: sqlite3.Connection) -> str:
+    # Materialized table when the loader has built it, else the view
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?;", (SOURCE_TABLE,)
+    ).fetchone()
+    return SOURCE_TABLE if row else SOURCE_VIEW
+
+
+def build_features(df: pd.DataFrame) -> pd.DataFrame:
+    """Training rows + engineered features, text columns as pandas categoricals."""
+    X = TelecomFeatureEngineer().transform(df)
+    for c in DICTIONARY_COLS:
+        if c in X.columns:
+            X[c] = X[c].astype("category")
+    return X
+
+
+def _file_format(fmt: str):
+    if fmt == "parquet":
+        file_format = ds.ParquetFileFormat()
+        return file_format, file_format.make_write_options(use_dictionary=True, compression="snappy")
+    if fmt == "arrow":
+        file_format = ds.IpcFileFormat()
+        return file_format, file_format.make_write_options(compression=None)
+    raise ValueError(f"Unknown feature store format: {fmt!r}")
+
+
+def write_snapshot(df: pd.DataFrame, root: Path, fmt: str = "parquet") -> None:
+    """Write (or replace) the snapshot_date partitions present in `df`."""
+    file_format, write_options = _file_format(fmt)
+    ds.write_dataset(
+        pa.Table.from_pandas(df, preserve_index=False),
+        store_path(root, fmt),
+        format=file_format,
+        file_options=write_options,
+        partitioning=PARTITIONING,
+        existing_data_behavior="delete_matching",
+    )
+
+
+def export(db_path: Path = DB_PATH, root: Path = FEATURE_STORE_DIR, fmt: str = "parquet",
+           snapshot_dates=None) -> int:
+    """Export the given snapshots (default: all) one partition at a time. Returns rows written."""
+    conn = sqlite3.connect(db_path)
+    source = _source(conn)
+    if snapshot_dates is None:
+        snapshot_dates = [r[0] for r in conn.execute(f"SELECT DISTINCT snapshot_date FROM {source};")]
+
+    written = 0
+    for snapshot_date in snapshot_dates:
+        df = pd.read_sql_query(f"SELECT * FROM {source} WHERE snapshot_date = ?", conn, params=(snapshot_date,))
+        if df.empty:
+            continue
+        write_snapshot(build_features(df), root, fmt)
+        written += len(df)
+    conn.close()
+    return written
+
+
+# ------------------------
+# Readers
+# ------------------------
+def open_dataset(root: Path = FEATURE_STORE_DIR, fmt: str = "parquet") -> ds.Dataset:
+    if fmt == "parquet":
+        # Keep text columns dictionary-encoded on read (-> pandas categoricals)
+        file_format = ds.ParquetFileFormat(read_options={"dictionary_columns": DICTIONARY_COLS})
+    else:
+        file_format, _ = _file_format(fmt)
+    return ds.dataset(
+        store_path(root, fmt),
+        format=file_format,
+        partitioning=PARTITIONING,
+        filesystem=fs.LocalFileSystem(use_mmap=True),
+    )
+
+
+def read_table(root: Path = FEATURE_STORE_DIR, columns=None, snapshot_dates=None, fmt: str = "parquet") -> pa.Table:
+    """Selected columns/snapshots as an Arrow table (memory-mapped, partition-pruned)."""
+    dataset = open_dataset(root, fmt)
+    flt = None
+    if snapshot_dates is not None:
+        flt = ds.field("snapshot_date").isin(list(snapshot_dates))
+    return dataset.to_table(columns=columns, filter=flt)
+
+
+def load_features(root: Path = FEATURE_STORE_DIR, columns=None, snapshot_dates=None,
+                  fmt: str = "parquet") -> pd.DataFrame:
+    """
+    Selected columns/snapshots as a DataFrame. split_blocks + self_destruct
+    let pandas reuse the Arrow buffers (no copy for null-free numeric
+    columns of an arrow store) instead of consolidating into new blocks.
+    """
+    table = read_table(root, columns, snapshot_dates, fmt)
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def load_matrix(columns, root: Path = FEATURE_STORE_DIR, snapshot_dates=None, fmt: str = "parquet") -> np.ndarray:
+    """
+    Numeric columns as a (rows, columns) float64 matrix, filled chunk by
+    chunk from the mapped buffers (one copy: into the matrix itself).
+    """
+    table = read_table(root, columns, snapshot_dates, fmt)
+    X = np.empty((table.num_rows, len(columns)), dtype=np.float64)
+    for j, c in enumerate(columns):
+        start = 0
+        for chunk in table.column(c).chunks:
+            X[start:start + len(chunk), j] = chunk.to_numpy(zero_copy_only=False)
+            start += len(chunk)
+    return X
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Export the training dataset to the columnar feature store.")
+    parser.add_argument("--snapshot-date", action="append", dest="snapshot_dates",
+                        help="snapshot to (re-)export; repeatable (default: all snapshots)")
+    parser.add_argument("--format", choices=FORMATS, default="parquet")
+    parser.add_argument("--out", type=Path, default=FEATURE_STORE_DIR)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not DB_PATH.exists():
+        raise FileNotFoundError(f"DB not found: {DB_PATH}")
+
+    start = time.perf_counter()
+    rows = export(DB_PATH, args.out, args.format, args.snapshot_dates)
+    elapsed = time.perf_counter() - start
+    print(f"✅ {rows:,} rows exported to {store_path(args.out, args.format)} ({elapsed:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
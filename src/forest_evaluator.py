@@ -0,0 +1,290 @@
+"""
+Array-backed evaluator for the served RandomForestClassifier.
+
+All trees are packed into contiguous NumPy arrays (feature index, threshold,
+left/right child, leaf class probabilities) and a batch is walked through
+every tree in lockstep, one depth level per NumPy step. This avoids the
+joblib dispatch and per-estimator Python overhead of sklearn's predict_proba.
+
+The exported .npy files can be memory-mapped read-only by every API worker
+(SHARED_MODEL=1), so the forest exists once in memory per node instead of
+once per process.
+
+Export + verify (from the project root):
+    python -m src.forest_evaluator
+"""
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import sys
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DB_PATH = PROJECT_ROOT / "data" / "telco_churn.db"
+ARTIFACTS_DIR = PROJECT_ROOT / "artifacts"
+PREPROCESSOR_PATH = ARTIFACTS_DIR / "preprocessor.joblib"
+MODEL_PATH = ARTIFACTS_DIR / "churn_model_rf.joblib"
+PACKED_MODEL_DIR = ARTIFACTS_DIR / "churn_model_rf_packed"
+
+PARITY_TOLERANCE = 1e-12
+ARRAY_NAMES = ["feature", "threshold", "left", "right", "missing_left", "value", "roots"]
+
+
+class PackedForest:
+    """RandomForest packed into flat node arrays; drop-in for predict_proba."""
+
+    def __init__(self, feature, threshold, left, right, missing_left, value, roots,
+                 max_depth, n_features, classes):
+        self.feature = feature            # int32  (n_nodes,)  0 for leaves
+        self.threshold = threshold        # float64 (n_nodes,)
+        self.left = left                  # int32  (n_nodes,)  leaves point to themselves
+        self.right = right                # int32  (n_nodes,)
+        self.missing_left = missing_left  # bool   (n_nodes,)  NaN routing
+        self.value = value                # float64 (n_nodes, n_classes) normalized leaf proba
+        self.roots = roots                # int32  (n_trees,)  root node of each tree
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features)
+        self.classes_ = np.asarray(classes)
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    # ------------------------
+    # Export
+    # ------------------------
+    @classmethod
+    def from_sklearn(cls, model):
+        estimators = getattr(model, "estimators_", None)
+        if not estimators:
+            raise ValueError("Expected a fitted RandomForestClassifier")
+        if getattr(model, "n_outputs_", 1) != 1:
+            raise ValueError("Multi-output forests are not supported")
+
+        n_classes = int(model.n_classes_)
+        parts = {name: [] for name in ARRAY_NAMES if name != "roots"}
+        roots = []
+        offset = 0
+        max_depth = 0
+
+        for est in estimators:
+            t = est.tree_
+            n = t.node_count
+            is_leaf = t.children_left == -1
+            idx = np.arange(n)
+
+            parts["feature"].append(np.where(is_leaf, 0, t.feature))
+            parts["threshold"].append(np.where(is_leaf, 0.0, t.threshold))
+            parts["left"].append(np.where(is_leaf, idx, t.children_left) + offset)
+            parts["right"].append(np.where(is_leaf, idx, t.children_right) + offset)
+
+            missing = getattr(t, "missing_go_to_left", None)
+            parts["missing_left"].append(
+                np.zeros(n, dtype=bool) if missing is None else np.asarray(missing, dtype=bool)
+            )
+
+            # Same normalization as DecisionTreeClassifier.predict_proba
+            proba = t.value[:, 0, :n_classes].astype(np.float64)
+            normalizer = proba.sum(axis=1, keepdims=True)
+            normalizer[normalizer == 0.0] = 1.0
+            parts["value"].append(proba / normalizer)
+
+            roots.append(offset)
+            offset += n
+            max_depth = max(max_depth, t.max_depth)
+
+        return cls(
+            feature=np.concatenate(parts["feature"]).astype(np.int32),
+            threshold=np.concatenate(parts["threshold"]).astype(np.float64),
+            left=np.concatenate(parts["left"]).astype(np.int32),
+            right=np.concatenate(parts["right"]).astype(np.int32),
+            missing_left=np.concatenate(parts["missing_left"]),
+            value=np.ascontiguousarray(np.concatenate(parts["value"])),
+            roots=np.asarray(roots, dtype=np.int32),
+            max_depth=max_depth,
+            n_features=model.n_features_in_,
+            classes=model.classes_,
+        )
+
+    def save(self, path: Path, source: dict = None) -> None:
+        """Write one .npy per array (mmap-able) plus meta.json (`source`: see file_fingerprint)."""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        for name in ARRAY_NAMES:
+            np.save(path / f"{name}.npy", getattr(self, name))
+        meta = {
+            "max_depth": self.max_depth,
+            "n_features": self.n_features,
+            "classes": self.classes_.tolist(),
+            "source": source,
+        }
+        (path / "meta.json").write_text(json.dumps(meta, indent=2))
+
+    @classmethod
+    def load(cls, path: Path, mmap_mode=None):
+        path = Path(path)
+        meta = json.loads((path / "meta.json").read_text())
+        arrays = {name: np.load(path / f"{name}.npy", mmap_mode=mmap_mode) for name in ARRAY_NAMES}
+        return cls(**arrays, max_depth=meta["max_depth"], n_features=meta["n_features"],
+                   classes=meta["classes"])
+
+    # ------------------------
+    # Evaluation
+    # ------------------------
+    def _proba_chunk(self, X: np.ndarray) -> np.ndarray:
+        n = X.shape[0]
+        rows = np.arange(n)[:, None]
+        node = np.broadcast_to(self.roots, (n, self.n_trees)).copy()
+        has_nan = bool(np.isnan(X).any())
+
+        # Walk all trees one level at a time; leaves are self-loops
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[node]]
+            go_left = x <= self.threshold[node]
+            if has_nan:
+                go_left |= np.isnan(x) & self.missing_left[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+
+        return self.value[node].sum(axis=1) / self.n_trees
+
+    def predict_proba(self, X, chunk_size: int = None) -> np.ndarray:
+        if hasattr(X, "toarray"):
+            X = X.toarray()
+        # sklearn trees compare float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected X with {self.n_features} features, got shape {X.shape}")
+
+        # Bound the (rows x trees) index matrix to ~1M entries
+        if chunk_size is None:
+            chunk_size = max(1, (1 << 20) // max(1, self.n_trees))
+        if X.shape[0] <= chunk_size:
+            return self._proba_chunk(X)
+        return np.vstack([
+            self._proba_chunk(X[i:i + chunk_size]) for i in range(0, X.shape[0], chunk_size)
+        ])
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+class HybridForest:
+    """
+    PackedForest for batches of up to `max_rows` rows, the sklearn forest above.
+
+    The lockstep walk is one to two orders of magnitude faster for one row, but its (rows x trees) index
+    matrices make it several times slower than sklearn's compiled per-tree
+    traversal on large batches (about 1.1 s vs 0.3 s for 10k rows with the
+    300-tree model). Both give the same probabilities (PARITY_TOLERANCE).
+    """
+
+    def __init__(self, packed: PackedForest, model, max_rows: int):
+        self.packed = packed
+        self.model = model
+        self.max_rows = int(max_rows)
+        self.classes_ = packed.classes_
+
+    def predict_proba(self, X) -> np.ndarray:
+        if X.shape[0] <= self.max_rows:
+            return self.packed.predict_proba(X)
+        return self.model.predict_proba(X)
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+# ------------------------
+# Shared hosting
+# ------------------------
+def file_fingerprint(path: Path) -> dict:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return {"file": Path(path).name, "size": Path(path).stat().st_size, "sha256": digest.hexdigest()}
+
+
+def verify_source(packed_dir: Path, model_path: Path = MODEL_PATH) -> None:
+    """
+    Check that the packed forest was exported (and parity-checked) from the
+    current model file. Lets workers map the packed arrays without loading
+    the sklearn model just to re-run the parity check.
+    """
+    meta = json.loads((Path(packed_dir) / "meta.json").read_text())
+    if meta.get("source") != file_fingerprint(model_path):
+        raise RuntimeError(
+            f"{packed_dir} was not exported from the current {Path(model_path).name}; "
+            "re-run python -m src.forest_evaluator"
+        )
+
+
+def publish_shared(packed_dir: Path, shared_dir: Path) -> Path:
+    """
+    Copy the packed arrays to `shared_dir` (e.g. under /dev/shm) unless an
+    identical export is already there. The first worker to start copies;
+    the rest find it in place. Returns `shared_dir`.
+    """
+    packed_dir, shared_dir = Path(packed_dir), Path(shared_dir)
+    meta = (packed_dir / "meta.json").read_text()
+    published = shared_dir / "meta.json"
+    if published.exists() and published.read_text() == meta:
+        return shared_dir
+
+    tmp = shared_dir.with_name(f"{shared_dir.name}.tmp-{os.getpid()}")
+    shutil.copytree(packed_dir, tmp, dirs_exist_ok=True)
+    if shared_dir.exists():
+        # Stale export: move it aside (processes that mapped it keep their pages)
+        stale = shared_dir.with_name(f"{shared_dir.name}.stale-{os.getpid()}")
+        try:
+            shared_dir.rename(stale)
+            shutil.rmtree(stale, ignore_errors=True)
+        except OSError:
+            pass
+    try:
+        tmp.rename(shared_dir)
+    except OSError:
+        # Another worker published concurrently
+        shutil.rmtree(tmp, ignore_errors=True)
+    return shared_dir
+
+
+def max_abs_diff(model, packed: PackedForest, X) -> float:
+    """Largest |sklearn - packed| over all rows and classes."""
+    return float(np.max(np.abs(model.predict_proba(X) - packed.predict_proba(X))))
+
+
+def load_training_matrix(preprocessor, db_path: Path = DB_PATH):
+    """Transformed feature matrix for the full vw_churn_training_dataset."""
+    conn = sqlite3.connect(db_path)
+    df = pd.read_sql_query("SELECT * FROM vw_churn_training_dataset", conn)
+    conn.close()
+    X = df.drop(columns=["customer_id", "snapshot_date", "churn_target"])
+    return preprocessor.transform(X)
+
+
+def main():
+    preprocessor = joblib.load(PREPROCESSOR_PATH)
+    model = joblib.load(MODEL_PATH)
+
+    packed = PackedForest.from_sklearn(model)
+    X = load_training_matrix(preprocessor)
+    diff = max_abs_diff(model, packed, X)
+
+    print(f"trees: {packed.n_trees}, nodes: {len(packed.feature)}, max_depth: {packed.max_depth}")
+    print(f"max |sklearn - packed| on training view: {diff:.3e}")
+    if diff > PARITY_TOLERANCE:
+        print(f"❌ parity check failed (> {PARITY_TOLERANCE})")
+        sys.exit(1)
+
+    packed.save(PACKED_MODEL_DIR, source=file_fingerprint(MODEL_PATH))
+    print(f"✅ packed forest written to {PACKED_MODEL_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,276 +1,646 @@
+import argparse
 import sqlite3
+import time
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Optional
 import pandas as pd
 import numpy as np
 
 DB_PATH = Path("data/telco_churn.db")
+VIEWS_SQL_PATH = Path(__file__).resolve().parents[1] / "sql" / "views.sql"
 XLSX_PATH = Path("data/raw/Telco_customer_churn.xlsx")
 
 SNAPSHOT_DATE = "2026-01-28"  # constant snapshot date for this dataset
 
+# Raw extract column -> star schema / staging column
+COLUMN_MAP = {
+    "CustomerID": "customer_id",
+    "Gender": "gender",
+    "Senior Citizen": "senior_citizen",
+    "Partner": "partner",
+    "Dependents": "dependents",
+    "Country": "country",
+    "State": "state",
+
+    "Contract": "contract_type",
+    "Paperless Billing": "paperless_billing",
+    "Payment Method": "payment_method",
+
+    "Phone Service": "phone_service",
+    "Multiple Lines": "multiple_lines",
+    "Internet Service": "internet_service",
+    "Online Security": "online_security",
+    "Online Backup": "online_backup",
+    "Device Protection": "device_protection",
+    "Tech Support": "tech_support",
+    "Streaming TV": "streaming_tv",
+    "Streaming Movies": "streaming_movies",
+
+    "Tenure Months": "tenure_months",
+    "Monthly Charges": "monthly_charges",
+    "Total Charges": "total_charges",
+    "CLTV": "cltv",
+
+    "Churn Label": "churn_label",
+}
+
+CUSTOMER_COLS = ["customer_id", "gender", "senior_citizen", "partner", "dependents", "country", "state"]
+CONTRACT_COLS = ["contract_type", "paperless_billing", "payment_method"]
+SERVICES_COLS = [
+    "phone_service", "multiple_lines", "internet_service", "online_security",
+    "online_backup", "device_protection", "tech_support",
+    "streaming_tv", "streaming_movies",
+]
+FACT_COLS = ["tenure_months", "monthly_charges", "total_charges", "cltv", "churn_label"]
+NUMERIC_COLS = ["senior_citizen", "tenure_months", "monthly_charges", "total_charges", "cltv"]
+
+# Everything that describes a customer in one snapshot; drives the row hash
+HASH_COLS = CUSTOMER_COLS + CONTRACT_COLS + SERVICES_COLS + FACT_COLS
+STG_COLS = HASH_COLS + ["snapshot_date", "row_hash"]
+
+
+def _check_columns(df: pd.DataFrame) -> None:
+    # Ensure expected columns exist
+    missing = [c for c in COLUMN_MAP if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing expected columns: {missing}")
 
-def clean_total_charges(x):
-    """Excel sometimes stores blanks/spaces; coerce safely to float."""
-    if pd.isna(x):
-        return np.nan
-    if isinstance(x, str) and x.strip() == "":
-        return np.nan
-    return pd.to_numeric(x, errors="coerce")
 
+def read_raw(path: Path) -> pd.DataFrame:
+    df = pd.read_excel(path)
+    _check_columns(df)
+    return df
+
+
+def iter_raw_chunks(path: Path, chunksize: int):
+    """
+    Yield the raw extract in chunks of `chunksize` rows (0 = whole file).
+    CSV and Parquet are streamed, so only one chunk is in memory at a time;
+    XLSX cannot be streamed and is read whole, then sliced.
+    """
+    suffix = path.suffix.lower()
+    columns = list(COLUMN_MAP)
+
+    if suffix == ".csv":
+        # Text columns stay text; numerics are coerced in standardize()
+        dtype = {c: str for c in columns if COLUMN_MAP[c] not in NUMERIC_COLS}
+        if not chunksize:
+            yield pd.read_csv(path, usecols=columns, dtype=dtype)
+            return
+        yield from pd.read_csv(path, usecols=columns, dtype=dtype, chunksize=chunksize)
+
+    elif suffix in (".parquet", ".pq"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Reading Parquet extracts requires pyarrow (pip install pyarrow)") from e
+        pf = pq.ParquetFile(path)
+        if not chunksize:
+            yield pf.read(columns=columns).to_pandas()
+            return
+        for batch in pf.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+
+    else:
+        df = read_raw(path)
+        if not chunksize:
+            yield df
+            return
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start:start + chunksize]
+
+
+# One dtype per numeric column for hashing: to_numeric gives int64 for a chunk of whole
+# numbers and float64 otherwise, and equal values of the two hash differently
+HASH_DTYPES = {
+    "senior_citizen": "int64",
+    "tenure_months": "int64",
+    "monthly_charges": "float64",
+    "total_charges": "float64",
+    "cltv": "float64",
+}
+
+
+def row_hash(df: pd.DataFrame) -> np.ndarray:
+    """Stable 64-bit hash per row over HASH_COLS (stored as signed INTEGER in SQLite)."""
+    return pd.util.hash_pandas_object(df[HASH_COLS].astype(HASH_DTYPES), index=False).to_numpy().view(np.int64)
+
+
+def standardize(df: pd.DataFrame, snapshot_date: str) -> pd.DataFrame:
+    """
+    Raw extract (or chunk) -> staging frame with STG_COLS.
+    Fully vectorized; the raw frame itself is never copied or modified.
+    """
+    _check_columns(df)
+
+    # Keep only columns we need for star schema (COLUMN_MAP order == HASH_COLS order)
+    stg = df[list(COLUMN_MAP)].rename(columns=COLUMN_MAP)
+
+    # Coerce numeric fields; blanks/spaces in total_charges become NaN
+    stg["senior_citizen"] = pd.to_numeric(stg["senior_citizen"], errors="coerce").fillna(0).astype(int)
+    stg["tenure_months"] = pd.to_numeric(stg["tenure_months"], errors="coerce").fillna(0).astype(int)
+    stg["monthly_charges"] = pd.to_numeric(stg["monthly_charges"], errors="coerce")
+    stg["total_charges"] = pd.to_numeric(stg["total_charges"], errors="coerce")
+    stg["cltv"] = pd.to_numeric(stg["cltv"], errors="coerce")
+
+    stg["snapshot_date"] = snapshot_date
+    stg["row_hash"] = row_hash(stg)
+    return stg
+
+
+# Rows of the latest load as read from the extract (audit/debugging; facts never join through it)
+STG_RAW_COLS = HASH_COLS + ["snapshot_date"]
+STG_RAW_SQL = """
+    CREATE TABLE IF NOT EXISTS stg_raw (
+        customer_id TEXT,
+        gender TEXT,
+        senior_citizen INTEGER,
+        partner TEXT,
+        dependents TEXT,
+        country TEXT,
+        state TEXT,
+
+        contract_type TEXT,
+        paperless_billing TEXT,
+        payment_method TEXT,
+
+        phone_service TEXT,
+        multiple_lines TEXT,
+        internet_service TEXT,
+        online_security TEXT,
+        online_backup TEXT,
+        device_protection TEXT,
+        tech_support TEXT,
+        streaming_tv TEXT,
+        streaming_movies TEXT,
+
+        tenure_months INTEGER,
+        monthly_charges REAL,
+        total_charges REAL,
+        cltv REAL,
+
+        churn_label TEXT,
+        snapshot_date TEXT
+    );
+"""
+
+
+def write_stg_raw(cur, stg: pd.DataFrame) -> None:
+    cur.executemany(
+        f"INSERT INTO stg_raw ({', '.join(STG_RAW_COLS)}) VALUES ({', '.join('?' * len(STG_RAW_COLS))});",
+        stg[STG_RAW_COLS].itertuples(index=False, name=None)
+    )
 
-def main():
-    if not DB_PATH.exists():
-        raise FileNotFoundError(f"DB not found: {DB_PATH}")
-    if not XLSX_PATH.exists():
-        raise FileNotFoundError(f"XLSX not found: {XLSX_PATH}")
 
-    df = pd.read_excel(XLSX_PATH)
+# ------------------------
+# Schema / migrations
+# ------------------------
+def _columns(cur, table):
+    return {r[1] for r in cur.execute(f"PRAGMA table_info({table});")}
 
-    # Minimal cleaning + standardization 
-    df = df.copy()
 
-    # Ensure expected columns exist
-    required_cols = [
-        "CustomerID", "Gender", "Senior Citizen", "Partner", "Dependents",
-        "Country", "State",
-        "Contract", "Paperless Billing", "Payment Method",
-        "Phone Service", "Multiple Lines", "Internet Service", "Online Security",
-        "Online Backup", "Device Protection", "Tech Support",
-        "Streaming TV", "Streaming Movies",
-        "Tenure Months", "Monthly Charges", "Total Charges", "CLTV",
-        "Churn Label"
-    ]
-    missing = [c for c in required_cols if c not in df.columns]
-    if missing:
-        raise ValueError(f"Missing expected columns: {missing}")
+def _dedupe_dimension(cur, table, key_col, nk_cols):
+    """Collapse duplicate natural keys left by earlier non-idempotent loads."""
+    nk = ", ".join(nk_cols)
+    dupes = cur.execute(
+        f"SELECT COUNT(*) - (SELECT COUNT(*) FROM (SELECT DISTINCT {nk} FROM {table})) FROM {table};"
+    ).fetchone()[0]
+    if not dupes:
+        return
 
-    # Coerce numeric fields
-    df["Senior Citizen"] = pd.to_numeric(df["Senior Citizen"], errors="coerce").fillna(0).astype(int)
-    df["Tenure Months"] = pd.to_numeric(df["Tenure Months"], errors="coerce").fillna(0).astype(int)
-    df["Monthly Charges"] = pd.to_numeric(df["Monthly Charges"], errors="coerce")
-    df["Total Charges"] = df["Total Charges"].apply(clean_total_charges)
-    df["CLTV"] = pd.to_numeric(df["CLTV"], errors="coerce")
+    match = " AND ".join(f"d2.{c} IS d.{c}" for c in nk_cols)
+    cur.execute(
+        f"""
+        UPDATE fact_customer_snapshot
+        SET {key_col} = (
+            SELECT MIN(d2.{key_col})
+            FROM {table} d
+            JOIN {table} d2 ON {match}
+            WHERE d.{key_col} = fact_customer_snapshot.{key_col}
+        );
+        """
+    )
+    cur.execute(
+        f"DELETE FROM {table} WHERE {key_col} NOT IN (SELECT MIN({key_col}) FROM {table} GROUP BY {nk});"
+    )
+    print(f"Removed {dupes} duplicate rows from {table}")
 
-    # Keep only columns we need for star schema
-    df = df[required_cols]
 
-    # Connect DB
-    conn = sqlite3.connect(DB_PATH)
+def ensure_schema(conn):
+    """Bring an existing DB up to the idempotent-load schema (safe to rerun)."""
     cur = conn.cursor()
 
-    # Load dim_customer
-    dim_customer = (
-        df[["CustomerID", "Gender", "Senior Citizen", "Partner", "Dependents", "Country", "State"]]
-        .drop_duplicates()
-        .rename(columns={
-            "CustomerID": "customer_id",
-            "Gender": "gender",
-            "Senior Citizen": "senior_citizen",
-            "Partner": "partner",
-            "Dependents": "dependents",
-            "Country": "country",
-            "State": "state",
-        })
-    )
+    if "row_hash" not in _columns(cur, "fact_customer_snapshot"):
+        cur.execute("ALTER TABLE fact_customer_snapshot ADD COLUMN row_hash INTEGER;")
 
-    cur.executemany(
+    _dedupe_dimension(cur, "dim_contract", "contract_key", CONTRACT_COLS)
+    _dedupe_dimension(cur, "dim_services", "services_key", SERVICES_COLS)
+
+    # Fact rows multiplied by duplicate dimension rows
+    cur.execute(
+        """
+        DELETE FROM fact_customer_snapshot
+        WHERE snapshot_id NOT IN (
+            SELECT MIN(snapshot_id) FROM fact_customer_snapshot GROUP BY customer_key, snapshot_date
+        );
         """
-        INSERT OR IGNORE INTO dim_customer
-        (customer_id, gender, senior_citizen, partner, dependents, country, state)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-        """,
-        dim_customer.itertuples(index=False, name=None)
     )
 
-    # Load dim_contract
-    dim_contract = (
-        df[["Contract", "Paperless Billing", "Payment Method"]]
-        .drop_duplicates()
-        .rename(columns={
-            "Contract": "contract_type",
-            "Paperless Billing": "paperless_billing",
-            "Payment Method": "payment_method",
-        })
-    )
+    # Natural-key hash column used for in-memory surrogate key lookups
+    for table, key_col, cols in [
+        ("dim_contract", "contract_key", CONTRACT_COLS),
+        ("dim_services", "services_key", SERVICES_COLS),
+    ]:
+        if "nk_hash" not in _columns(cur, table):
+            cur.execute(f"ALTER TABLE {table} ADD COLUMN nk_hash INTEGER;")
+        todo = pd.read_sql_query(f"SELECT {key_col}, {', '.join(cols)} FROM {table} WHERE nk_hash IS NULL;", conn)
+        if not todo.empty:
+            cur.executemany(
+                f"UPDATE {table} SET nk_hash = ? WHERE {key_col} = ?;",
+                zip(natural_key_hash(todo, cols).tolist(), todo[key_col].tolist())
+            )
 
-    cur.executemany(
+    cur.executescript(
+        f"""
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_dim_contract_nk ON dim_contract({", ".join(CONTRACT_COLS)});
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_dim_services_nk ON dim_services({", ".join(SERVICES_COLS)});
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_dim_contract_nk_hash ON dim_contract(nk_hash);
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_dim_services_nk_hash ON dim_services(nk_hash);
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_fact_customer_snapshot
+            ON fact_customer_snapshot(customer_key, snapshot_date);
+        CREATE INDEX IF NOT EXISTS idx_fact_snapshot_date ON fact_customer_snapshot(snapshot_date);
         """
-        INSERT INTO dim_contract (contract_type, paperless_billing, payment_method)
-        VALUES (?, ?, ?)
-        """,
-        dim_contract.itertuples(index=False, name=None)
     )
+    if not cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'view' AND name = ?;", (TRAINING_VIEW,)).fetchone():
+        cur.executescript(VIEWS_SQL_PATH.read_text())
+    cur.executescript(TRAINING_TABLE_SQL)
+    cur.executescript(STG_RAW_SQL)
+    conn.commit()
 
-    # Load dim_services
-    dim_services = (
-        df[[
-            "Phone Service", "Multiple Lines", "Internet Service", "Online Security",
-            "Online Backup", "Device Protection", "Tech Support",
-            "Streaming TV", "Streaming Movies"
-        ]]
-        .drop_duplicates()
-        .rename(columns={
-            "Phone Service": "phone_service",
-            "Multiple Lines": "multiple_lines",
-            "Internet Service": "internet_service",
-            "Online Security": "online_security",
-            "Online Backup": "online_backup",
-            "Device Protection": "device_protection",
-            "Tech Support": "tech_support",
-            "Streaming TV": "streaming_tv",
-            "Streaming Movies": "streaming_movies",
-        })
-    )
 
+# ------------------------
+# Dimensions
+# ------------------------
+def natural_key_hash(df: pd.DataFrame, cols) -> np.ndarray:
+    """Stable 64-bit hash of a dimension's natural-key columns (signed, for SQLite INTEGER)."""
+    return pd.util.hash_pandas_object(df[cols].astype(object), index=False).to_numpy().view(np.int64)
+
+
+class DimensionKeyMap:
+    """
+    In-memory nk_hash -> surrogate key map for a small dimension
+    (dim_contract, dim_services). Unknown combinations are inserted on
+    first sight, so fact rows arrive with their keys already resolved.
+    """
+
+    def __init__(self, cur, table: str, key_col: str, cols):
+        self.table = table
+        self.key_col = key_col
+        self.cols = list(cols)
+        self._reload(cur)
+
+    def _reload(self, cur) -> None:
+        rows = cur.execute(f"SELECT nk_hash, {self.key_col} FROM {self.table};").fetchall()
+        self._hashes = pd.Index(np.array([r[0] for r in rows], dtype=np.int64))
+        self._keys = np.array([r[1] for r in rows], dtype=np.int64)
+
+    def resolve(self, cur, df: pd.DataFrame) -> np.ndarray:
+        hashes = natural_key_hash(df, self.cols)
+        pos = self._hashes.get_indexer(hashes)
+
+        missing = pos < 0
+        if missing.any():
+            new = df.loc[missing, self.cols].assign(nk_hash=hashes[missing]).drop_duplicates("nk_hash")
+            cols = self.cols + ["nk_hash"]
+            cur.executemany(
+                f"""
+                INSERT INTO {self.table} ({", ".join(cols)})
+                VALUES ({", ".join("?" * len(cols))})
+                ON CONFLICT DO NOTHING
+                """,
+                new.itertuples(index=False, name=None)
+            )
+            self._reload(cur)
+            pos = self._hashes.get_indexer(hashes)
+
+        return self._keys[pos]
+
+
+def _stage_customer_ids(cur, ids) -> None:
+    cur.execute("DROP TABLE IF EXISTS chunk_ids;")
+    cur.execute("CREATE TEMP TABLE chunk_ids (customer_id TEXT PRIMARY KEY);")
+    cur.executemany("INSERT OR IGNORE INTO chunk_ids (customer_id) VALUES (?);", ((cid,) for cid in ids))
+
+
+def upsert_customers(cur, stg: pd.DataFrame) -> np.ndarray:
+    """Upsert dim_customer for the chunk; returns customer_key per stg row."""
+    # Natural key customer_id; attributes follow the latest load
+    updates = ", ".join(f"{c} = excluded.{c}" for c in CUSTOMER_COLS[1:])
+    changed = " OR ".join(f"dim_customer.{c} IS NOT excluded.{c}" for c in CUSTOMER_COLS[1:])
     cur.executemany(
-        """
-        INSERT INTO dim_services
-        (phone_service, multiple_lines, internet_service, online_security, online_backup,
-         device_protection, tech_support, streaming_tv, streaming_movies)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        f"""
+        INSERT INTO dim_customer ({", ".join(CUSTOMER_COLS)})
+        VALUES ({", ".join("?" * len(CUSTOMER_COLS))})
+        ON CONFLICT(customer_id) DO UPDATE SET {updates}
+        WHERE {changed}
         """,
-        dim_services.itertuples(index=False, name=None)
+        stg[CUSTOMER_COLS].drop_duplicates("customer_id", keep="last").itertuples(index=False, name=None)
     )
 
-    conn.commit()
+    _stage_customer_ids(cur, stg["customer_id"])
+    rows = cur.execute(
+        """
+        SELECT c.customer_id, dc.customer_key
+        FROM chunk_ids c
+        JOIN dim_customer dc ON dc.customer_id = c.customer_id;
+        """
+    ).fetchall()
+    cur.execute("DROP TABLE chunk_ids;")
 
-    # Populate fact_customer_snapshot
-    # We create the fact rows by looking up surrogate keys from dims.
-    # Use SQL joins to ensure consistency.
+    ids, keys = zip(*rows)
+    return np.asarray(keys, dtype=np.int64)[pd.Index(ids).get_indexer(stg["customer_id"])]
 
-    # Create a temporary staging table for raw rows (fastest way to map keys)
-    cur.execute("DROP TABLE IF EXISTS stg_raw;")
-    cur.execute(
+
+class KeyResolver:
+    """Surrogate key lookups for one load (dimension maps are reused across chunks)."""
+
+    def __init__(self, cur):
+        self.contract = DimensionKeyMap(cur, "dim_contract", "contract_key", CONTRACT_COLS)
+        self.services = DimensionKeyMap(cur, "dim_services", "services_key", SERVICES_COLS)
+
+    def resolve(self, cur, stg: pd.DataFrame) -> pd.DataFrame:
+        """Upsert dimensions and return fact rows (FACT_INSERT_COLS) with keys resolved."""
+        facts = pd.DataFrame({
+            "customer_key": upsert_customers(cur, stg),
+            "contract_key": self.contract.resolve(cur, stg),
+            "services_key": self.services.resolve(cur, stg),
+        })
+        for c in FACT_COLS + ["snapshot_date", "row_hash"]:
+            facts[c] = stg[c].to_numpy()
+        return facts
+
+
+# ------------------------
+# Facts
+# ------------------------
+FACT_INSERT_COLS = [
+    "customer_key", "contract_key", "services_key",
+    "tenure_months", "monthly_charges", "total_charges", "cltv",
+    "churn_label", "snapshot_date", "row_hash",
+]
+
+FACT_UPSERT_SQL = f"""
+    INSERT INTO fact_customer_snapshot ({", ".join(FACT_INSERT_COLS)})
+    VALUES ({", ".join("?" * len(FACT_INSERT_COLS))})
+    ON CONFLICT(customer_key, snapshot_date) DO UPDATE SET
+        contract_key = excluded.contract_key,
+        services_key = excluded.services_key,
+        tenure_months = excluded.tenure_months,
+        monthly_charges = excluded.monthly_charges,
+        total_charges = excluded.total_charges,
+        cltv = excluded.cltv,
+        churn_label = excluded.churn_label,
+        row_hash = excluded.row_hash
+"""
+
+
+def write_facts(cur, resolver: KeyResolver, stg: pd.DataFrame) -> int:
+    """Resolve surrogate keys in memory and upsert the fact rows. Returns rows written."""
+    if stg.empty:
+        return 0
+    facts = resolver.resolve(cur, stg)
+    cur.executemany(FACT_UPSERT_SQL, facts.itertuples(index=False, name=None))
+    return len(facts)
+
+
+def changed_rows(cur, stg: pd.DataFrame, snapshot_date: str) -> pd.DataFrame:
+    """Staging rows whose row_hash differs from the customer's latest fact row up to snapshot_date."""
+    # Only look up this chunk's customers (index seeks on ux_fact_customer_snapshot)
+    _stage_customer_ids(cur, stg["customer_id"])
+    rows = cur.execute(
         """
-        CREATE TABLE stg_raw (
-            customer_id TEXT,
-            gender TEXT,
-            senior_citizen INTEGER,
-            partner TEXT,
-            dependents TEXT,
-            country TEXT,
-            state TEXT,
-
-            contract_type TEXT,
-            paperless_billing TEXT,
-            payment_method TEXT,
-
-            phone_service TEXT,
-            multiple_lines TEXT,
-            internet_service TEXT,
-            online_security TEXT,
-            online_backup TEXT,
-            device_protection TEXT,
-            tech_support TEXT,
-            streaming_tv TEXT,
-            streaming_movies TEXT,
-
-            tenure_months INTEGER,
-            monthly_charges REAL,
-            total_charges REAL,
-            cltv REAL,
-
-            churn_label TEXT,
-            snapshot_date TEXT
-        );
+        SELECT dc.customer_id, f.row_hash
+        FROM chunk_ids c
+        JOIN dim_customer dc ON dc.customer_id = c.customer_id
+        JOIN fact_customer_snapshot f
+          ON f.customer_key = dc.customer_key
+         AND f.snapshot_date = (
+            SELECT MAX(f2.snapshot_date)
+            FROM fact_customer_snapshot f2
+            WHERE f2.customer_key = dc.customer_key
+              AND f2.snapshot_date <= ?
+         )
+        WHERE f.row_hash IS NOT NULL;
+        """,
+        (snapshot_date,),
+    ).fetchall()
+    cur.execute("DROP TABLE chunk_ids;")
+    if not rows:
+        return stg
+
+    ids, hashes = zip(*rows)
+    pos = pd.Index(ids).get_indexer(stg["customer_id"])
+    previous = np.asarray(hashes, dtype=np.int64)[np.maximum(pos, 0)]
+    unchanged = (pos >= 0) & (previous == stg["row_hash"].to_numpy())
+    return stg[~unchanged]
+
+
+def load_full(cur, resolver: KeyResolver, stg: pd.DataFrame) -> int:
+    """Write every row of the chunk (dimensions + facts). Returns fact rows written."""
+    return write_facts(cur, resolver, stg)
+
+
+def load_incremental(cur, resolver: KeyResolver, stg: pd.DataFrame, snapshot_date: str,
+                     touched: Optional[set] = None) -> int:
+    """
+    Load one snapshot_date chunk touching only customers whose row hash
+    differs from their latest stored row: dimensions are upserted and fact
+    rows upserted for those customers only. Their customer_ids are added to
+    `touched` when given. Returns fact rows written.
+    """
+    changed = changed_rows(cur, stg, snapshot_date)
+    if touched is not None:
+        touched.update(changed["customer_id"])
+    return write_facts(cur, resolver, changed)
+
+
+# ------------------------
+# Training table
+# ------------------------
+TRAINING_VIEW = "vw_churn_training_dataset"
+TRAINING_TABLE = "churn_training_dataset"
+
+# Materialized copy of the view (same columns) + per-source refresh watermarks
+TRAINING_TABLE_SQL = f"""
+    CREATE TABLE IF NOT EXISTS {TRAINING_TABLE} AS SELECT * FROM {TRAINING_VIEW} WHERE 0;
+    CREATE UNIQUE INDEX IF NOT EXISTS ux_training_customer_snapshot ON {TRAINING_TABLE}(customer_id, snapshot_date);
+    CREATE INDEX IF NOT EXISTS idx_training_snapshot_date ON {TRAINING_TABLE}(snapshot_date);
+
+    CREATE TABLE IF NOT EXISTS etl_watermark (
+        name TEXT PRIMARY KEY,
+        snapshot_date TEXT,
+        updated_at_utc TEXT
+    );
+"""
+
+# Customers with a fact row in the snapshot being refreshed
+_SNAPSHOT_CUSTOMERS_SQL = """
+    SELECT dc.customer_id
+    FROM fact_customer_snapshot f
+    JOIN dim_customer dc ON dc.customer_key = f.customer_key
+    WHERE f.snapshot_date = ?
+"""
+
+
+def mark_watermark(cur, name: str, snapshot_date: str) -> None:
+    cur.execute(
         """
+        INSERT INTO etl_watermark (name, snapshot_date, updated_at_utc) VALUES (?, ?, ?)
+        ON CONFLICT(name) DO UPDATE SET
+            snapshot_date = excluded.snapshot_date,
+            updated_at_utc = excluded.updated_at_utc
+        """,
+        (name, snapshot_date, datetime.now(timezone.utc).isoformat()),
     )
 
-    stg = df.rename(columns={
-        "CustomerID": "customer_id",
-        "Gender": "gender",
-        "Senior Citizen": "senior_citizen",
-        "Partner": "partner",
-        "Dependents": "dependents",
-        "Country": "country",
-        "State": "state",
-
-        "Contract": "contract_type",
-        "Paperless Billing": "paperless_billing",
-        "Payment Method": "payment_method",
-
-        "Phone Service": "phone_service",
-        "Multiple Lines": "multiple_lines",
-        "Internet Service": "internet_service",
-        "Online Security": "online_security",
-        "Online Backup": "online_backup",
-        "Device Protection": "device_protection",
-        "Tech Support": "tech_support",
-        "Streaming TV": "streaming_tv",
-        "Streaming Movies": "streaming_movies",
-
-        "Tenure Months": "tenure_months",
-        "Monthly Charges": "monthly_charges",
-        "Total Charges": "total_charges",
-        "CLTV": "cltv",
-
-        "Churn Label": "churn_label",
-    }).copy()
-
-    stg["snapshot_date"] = SNAPSHOT_DATE
 
-    cur.executemany(
-        """
-        INSERT INTO stg_raw (
-            customer_id, gender, senior_citizen, partner, dependents, country, state,
-            contract_type, paperless_billing, payment_method,
-            phone_service, multiple_lines, internet_service, online_security, online_backup,
-            device_protection, tech_support, streaming_tv, streaming_movies,
-            tenure_months, monthly_charges, total_charges, cltv,
-            churn_label, snapshot_date
+def refresh_training_table(cur, snapshot_date: str, full: bool = False,
+                           customer_ids: Optional[set] = None) -> int:
+    """
+    Bring churn_training_dataset in line with the view. A full refresh
+    rebuilds it; `customer_ids` rewrites every row of just those customers
+    (nothing when empty); otherwise the snapshot's rows and every row of the
+    customers in it are rewritten (their dim_customer attributes may have
+    changed, which the view shows for older snapshots too). Returns rows written.
+    """
+    if full:
+        cur.execute(f"DELETE FROM {TRAINING_TABLE};")
+        cur.execute(f"INSERT INTO {TRAINING_TABLE} SELECT * FROM {TRAINING_VIEW};")
+    elif customer_ids is not None:
+        if not customer_ids:
+            mark_watermark(cur, TRAINING_TABLE, snapshot_date)
+            return 0
+        _stage_customer_ids(cur, customer_ids)
+        cur.execute(f"DELETE FROM {TRAINING_TABLE} WHERE customer_id IN (SELECT customer_id FROM chunk_ids);")
+        cur.execute(
+            f"""
+            INSERT INTO {TRAINING_TABLE}
+            SELECT * FROM {TRAINING_VIEW}
+            WHERE customer_id IN (SELECT customer_id FROM chunk_ids);
+            """
         )
-        VALUES (?, ?, ?, ?, ?, ?, ?,
-                ?, ?, ?,
-                ?, ?, ?, ?, ?,
-                ?, ?, ?, ?,
-                ?, ?, ?, ?,
-                ?, ?)
-        """,
-        stg.itertuples(index=False, name=None)
-    )
-    conn.commit()
+        written = cur.rowcount
+        cur.execute("DROP TABLE chunk_ids;")
+        mark_watermark(cur, TRAINING_TABLE, snapshot_date)
+        return written
+    else:
+        cur.execute(
+            f"""
+            DELETE FROM {TRAINING_TABLE}
+            WHERE snapshot_date = ? OR customer_id IN ({_SNAPSHOT_CUSTOMERS_SQL});
+            """,
+            (snapshot_date, snapshot_date),
+        )
+        cur.execute(
+            f"""
+            INSERT INTO {TRAINING_TABLE}
+            SELECT * FROM {TRAINING_VIEW}
+            WHERE customer_id IN ({_SNAPSHOT_CUSTOMERS_SQL});
+            """,
+            (snapshot_date,),
+        )
+    written = cur.rowcount
+    mark_watermark(cur, TRAINING_TABLE, snapshot_date)
+    return written
 
-    # Insert into fact using joins to get surrogate keys
-    cur.execute("DELETE FROM fact_customer_snapshot;")  # idempotent for reruns
 
-    cur.execute(
-        """
-        INSERT INTO fact_customer_snapshot (
-            customer_key, contract_key, services_key,
-            tenure_months, monthly_charges, total_charges, cltv,
-            churn_label, snapshot_date
+def training_table_status(cur) -> dict:
+    """Refresh watermarks; stale when facts were loaded after the last refresh."""
+    marks = {
+        name: (snapshot_date, updated_at)
+        for name, snapshot_date, updated_at in cur.execute(
+            "SELECT name, snapshot_date, updated_at_utc FROM etl_watermark;"
         )
-        SELECT
-            dc.customer_key,
-            dcon.contract_key,
-            ds.services_key,
-            r.tenure_months,
-            r.monthly_charges,
-            r.total_charges,
-            r.cltv,
-            r.churn_label,
-            r.snapshot_date
-        FROM stg_raw r
-        JOIN dim_customer dc
-          ON dc.customer_id = r.customer_id
-        JOIN dim_contract dcon
-          ON dcon.contract_type = r.contract_type
-         AND dcon.paperless_billing = r.paperless_billing
-         AND dcon.payment_method = r.payment_method
-        JOIN dim_services ds
-          ON ds.phone_service = r.phone_service
-         AND ds.multiple_lines = r.multiple_lines
-         AND ds.internet_service = r.internet_service
-         AND ds.online_security = r.online_security
-         AND ds.online_backup = r.online_backup
-         AND ds.device_protection = r.device_protection
-         AND ds.tech_support = r.tech_support
-         AND ds.streaming_tv = r.streaming_tv
-         AND ds.streaming_movies = r.streaming_movies
-        ;
-        """
+    }
+    facts = marks.get("fact_customer_snapshot")
+    table = marks.get(TRAINING_TABLE)
+    return {
+        "facts_loaded_at_utc": facts[1] if facts else None,
+        "refreshed_at_utc": table[1] if table else None,
+        "refreshed_snapshot_date": table[0] if table else None,
+        "stale": table is None or (facts is not None and facts[1] > table[1]),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load a raw extract (XLSX, CSV or Parquet) into the star schema.")
+    parser.add_argument("--input", type=Path, default=XLSX_PATH)
+    parser.add_argument("--snapshot-date", default=SNAPSHOT_DATE)
+    parser.add_argument(
+        "--mode", choices=["full", "incremental"], default="full",
+        help="full: rebuild every fact row; incremental: upsert changed customers for --snapshot-date",
     )
-    conn.commit()
+    parser.add_argument(
+        "--replace-snapshot", action="store_true",
+        help="incremental only: drop existing fact rows for --snapshot-date before loading",
+    )
+    parser.add_argument(
+        "--chunksize", type=int, default=100_000,
+        help="rows per chunk/transaction (0 = read and load the whole file at once)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if not DB_PATH.exists():
+        raise FileNotFoundError(f"DB not found: {DB_PATH}")
+    if not args.input.exists():
+        raise FileNotFoundError(f"Input not found: {args.input}")
+
+    # Connect DB
+    conn = sqlite3.connect(DB_PATH)
+    cur = conn.cursor()
+    ensure_schema(conn)
+
+    # One chunk = one transaction; dimensions are upserted, so reruns never duplicate them.
+    # Nothing is deleted until the first chunk has been read and validated: the
+    # DELETE commits together with that chunk's rows, never on its own.
+    resolver = KeyResolver(cur)
+    total, written = 0, 0
+    # An incremental run refreshes only the customers it wrote, unless an earlier load was never refreshed
+    touched = None if args.mode == "full" or args.replace_snapshot or training_table_status(cur)["stale"] else set()
+    start = time.perf_counter()
+    for chunk in iter_raw_chunks(args.input, args.chunksize):
+        stg = standardize(chunk, args.snapshot_date)
+        if stg.empty:
+            continue
+        with conn:
+            if not total:
+                if args.mode == "full":
+                    cur.execute("DELETE FROM fact_customer_snapshot;")  # idempotent for reruns
+                elif args.replace_snapshot:
+                    cur.execute("DELETE FROM fact_customer_snapshot WHERE snapshot_date = ?;", (args.snapshot_date,))
+                cur.execute("DELETE FROM stg_raw;")
+            write_stg_raw(cur, stg)
+            if args.mode == "full":
+                written += load_full(cur, resolver, stg)
+            else:
+                written += load_incremental(cur, resolver, stg, args.snapshot_date, touched)
+        total += len(stg)
+
+        elapsed = time.perf_counter() - start
+        print(f"... {total:,} rows read, {written:,} fact rows written "
+              f"({total / elapsed:,.0f} rows/sec, {elapsed:.1f}s)")
+
+    if not total:
+        raise ValueError(f"No rows read from {args.input}; existing facts left untouched")
+
+    # Only a load that got through its last chunk moves the watermark
+    with conn:
+        mark_watermark(cur, "fact_customer_snapshot", args.snapshot_date)
 
     # Create indexes for performance (good SQL habit)
     cur.executescript(
@@ -283,17 +653,23 @@ def main():
     )
     conn.commit()
 
+    # Materialized training table: consumers read it instead of re-running the view's joins
+    with conn:
+        refreshed = refresh_training_table(cur, args.snapshot_date, full=(args.mode == "full"), customer_ids=touched)
+
     # Basic validation
     fact_count = cur.execute("SELECT COUNT(*) FROM fact_customer_snapshot;").fetchone()[0]
     cust_count = cur.execute("SELECT COUNT(*) FROM dim_customer;").fetchone()[0]
     con_count = cur.execute("SELECT COUNT(*) FROM dim_contract;").fetchone()[0]
     svc_count = cur.execute("SELECT COUNT(*) FROM dim_services;").fetchone()[0]
 
-    print("✅ Load complete.")
+    print(f"✅ Load complete ({args.mode}, snapshot {args.snapshot_date}).")
+    print(f"fact rows written: {written} of {total} input rows")
     print(f"dim_customer rows: {cust_count}")
     print(f"dim_contract rows: {con_count}")
     print(f"dim_services rows: {svc_count}")
     print(f"fact_customer_snapshot rows: {fact_count}")
+    print(f"{TRAINING_TABLE} rows refreshed: {refreshed}")
 
     conn.close()
 
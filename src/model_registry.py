@@ -0,0 +1,179 @@
+"""
+Filesystem model registry.
+
+Versions are the bundles written by src/train.py under
+artifacts/models/<version>/ (preprocessor.joblib, model.joblib,
+drift_reference.json, manifest.json with the decision thresholds). Which
+version serves is recorded in one small pointer file per stage:
+
+    artifacts/models/production.json   {"version": ..., "promoted_at_utc": ...}
+    artifacts/models/shadow.json       candidate scored on sampled traffic
+
+Pointers are replaced atomically (write + rename), so the API, which polls
+them, never reads a half-written file. Every change is appended to
+history.jsonl; `rollback` re-points a stage to the version it replaced, and
+repeated rollbacks keep walking back (promote v1, v2, v3; rollback -> v2;
+rollback -> v1).
+
+Usage (from the project root):
+    python -m src.model_registry list
+    python -m src.model_registry promote v20260301-120000
+    python -m src.model_registry shadow v20260308-090000
+    python -m src.model_registry clear shadow
+    python -m src.model_registry rollback
+"""
+import argparse
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+REGISTRY_DIR = PROJECT_ROOT / "artifacts" / "models"
+
+STAGES = ("production", "shadow")
+REQUIRED_FILES = ("preprocessor.joblib", "model.joblib", "manifest.json")
+HISTORY_FILE = "history.jsonl"
+
+
+# ------------------------
+# Versions
+# ------------------------
+def version_paths(version: str, registry_dir: Path = REGISTRY_DIR) -> Dict[str, Path]:
+    root = Path(registry_dir) / version
+    return {
+        "dir": root,
+        "preprocessor": root / "preprocessor.joblib",
+        "model": root / "model.joblib",
+        "packed": root / "packed",  # optional: python -m src.forest_evaluator export of this model
+        "reference": root / "drift_reference.json",
+        "manifest": root / "manifest.json",
+    }
+
+
+def list_versions(registry_dir: Path = REGISTRY_DIR) -> List[str]:
+    """Complete bundles, oldest first (version names are UTC timestamps)."""
+    root = Path(registry_dir)
+    if not root.is_dir():
+        return []
+    return sorted(
+        p.name for p in root.iterdir()
+        if p.is_dir() and all((p / f).exists() for f in REQUIRED_FILES)
+    )
+
+
+def load_manifest(version: str, registry_dir: Path = REGISTRY_DIR) -> dict:
+    return json.loads(version_paths(version, registry_dir)["manifest"].read_text())
+
+
+def thresholds(manifest: dict) -> Dict[str, float]:
+    """Decision threshold per mode, as picked at training time."""
+    return {mode: float(t["threshold"]) for mode, t in manifest["thresholds"].items()}
+
+
+# ------------------------
+# Stage pointers
+# ------------------------
+def _pointer(stage: str, registry_dir: Path) -> Path:
+    if stage not in STAGES:
+        raise ValueError(f"Unknown stage: {stage!r} (expected one of {STAGES})")
+    return Path(registry_dir) / f"{stage}.json"
+
+
+def current_version(stage: str = "production", registry_dir: Path = REGISTRY_DIR) -> Optional[str]:
+    """Version the stage points to, or None when nothing was promoted."""
+    try:
+        return json.loads(_pointer(stage, registry_dir).read_text())["version"]
+    except FileNotFoundError:
+        return None
+
+
+def _write_pointer(stage: str, version: Optional[str], registry_dir: Path, rollback: bool = False) -> None:
+    path = _pointer(stage, registry_dir)
+    previous = current_version(stage, registry_dir)
+    now = datetime.now(timezone.utc).isoformat()
+    if version is None:
+        path.unlink(missing_ok=True)
+    else:
+        tmp = path.with_suffix(f".tmp{os.getpid()}")
+        tmp.write_text(json.dumps({"version": version, "promoted_at_utc": now}))
+        tmp.replace(path)
+    with open(Path(registry_dir) / HISTORY_FILE, "a") as f:
+        f.write(json.dumps({
+            "ts_utc": now, "stage": stage, "version": version, "previous": previous, "rollback": rollback,
+        }) + "\n")
+
+
+def promote(version: str, stage: str = "production", registry_dir: Path = REGISTRY_DIR) -> None:
+    if version not in list_versions(registry_dir):
+        raise ValueError(f"Not a complete bundle in {registry_dir}: {version!r}")
+    _write_pointer(stage, version, registry_dir)
+
+
+def clear(stage: str, registry_dir: Path = REGISTRY_DIR) -> None:
+    _write_pointer(stage, None, registry_dir)
+
+
+def _rollback_targets(events: List[dict]) -> List[Optional[str]]:
+    """
+    Versions a stage can roll back to, most recent last: every change pushes
+    the version it replaced, every rollback pops one. Rollbacks recorded
+    before the `rollback` flag existed count as ordinary changes.
+    """
+    stack: List[Optional[str]] = []
+    for e in events:
+        if e.get("rollback"):
+            if stack:
+                stack.pop()
+        else:
+            stack.append(e["previous"])
+    return stack
+
+
+def rollback(stage: str = "production", registry_dir: Path = REGISTRY_DIR) -> Optional[str]:
+    """Re-point the stage to the version it held before the current one (repeatable)."""
+    path = Path(registry_dir) / HISTORY_FILE
+    events = [json.loads(line) for line in path.read_text().splitlines()] if path.exists() else []
+    targets = _rollback_targets([e for e in events if e["stage"] == stage])
+    if not targets or targets[-1] is None:
+        raise ValueError(f"No earlier {stage} version to roll back to")
+    _write_pointer(stage, targets[-1], registry_dir, rollback=True)
+    return targets[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Promote / inspect churn model versions.")
+    parser.add_argument("--registry-dir", type=Path, default=REGISTRY_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list")
+    sub.add_parser("promote").add_argument("version")
+    sub.add_parser("shadow").add_argument("version")
+    sub.add_parser("clear").add_argument("stage", choices=STAGES)
+    sub.add_parser("rollback").add_argument("stage", nargs="?", default="production", choices=STAGES)
+    args = parser.parse_args()
+    registry_dir = args.registry_dir
+
+    if args.command == "list":
+        live = {stage: current_version(stage, registry_dir) for stage in STAGES}
+        for version in list_versions(registry_dir):
+            m = load_manifest(version, registry_dir)
+            tags = [stage for stage, v in live.items() if v == version]
+            t = thresholds(m)
+            print(f"{version:<18} {m['model']['name']:<14} test AUC {m['test']['roc_auc']:.4f}  "
+                  f"thresholds {t.get('default', float('nan')):.3f}/{t.get('aggressive', float('nan')):.3f}"
+                  f"  {' '.join(f'[{s}]' for s in tags)}")
+        return
+    if args.command == "promote":
+        promote(args.version, "production", registry_dir)
+    elif args.command == "shadow":
+        promote(args.version, "shadow", registry_dir)
+    elif args.command == "clear":
+        clear(args.stage, registry_dir)
+    elif args.command == "rollback":
+        rollback(args.stage, registry_dir)
+    print("✅ " + ", ".join(f"{s}: {current_version(s, registry_dir)}" for s in STAGES))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
+import numpy as np
+import pandas as pd
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import OneHotEncoder
+from sklearn.preprocessing import FunctionTransformer, OneHotEncoder, OrdinalEncoder
 from sklearn.impute import SimpleImputer
 
 from src.feature_engineering import TelecomFeatureEngineer
@@ -21,28 +23,54 @@ DEFAULT_CATEGORICAL_BASE = [
     "tech_support", "streaming_tv", "streaming_movies",
 ]
 
+# Output encodings and the dtype each one's transform() returns:
+#   onehot:  one-hot categoricals + float64 numerics (original; dense or sparse per ColumnTransformer)
+#   sparse:  always CSR, float32 values (0/1 one-hot entries + numerics share the one data array)
+#   ordinal: DataFrame, float32 numerics + one int16 code per categorical (unknown -> -1); for
+#            tree models, which cast to float32 themselves at predict time
+OUTPUT_DTYPES = {"onehot": np.float64, "sparse": np.float32, "ordinal": np.int16}
 
-def build_preprocessor(categorical_features=None):
+
+def to_float32(X):
+    # Module-level (not a lambda) so fitted pipelines stay picklable; DataFrames (ordinal) stay DataFrames
+    if isinstance(X, pd.DataFrame):
+        return X.astype(np.float32)
+    return np.asarray(X, dtype=np.float32)
+
+
+def build_preprocessor(categorical_features=None, output="onehot"):
     """
     Returns an sklearn Pipeline that:
       1) adds engineered features (TelecomFeatureEngineer)
-      2) imputes + one-hot encodes categoricals
+      2) imputes + encodes categoricals (see OUTPUT_DTYPES for `output`)
       3) imputes numerics
     Import-safe: does NOT require X to exist.
     """
+    if output not in OUTPUT_DTYPES:
+        raise ValueError(f"Unknown output {output!r}; expected one of {list(OUTPUT_DTYPES)}")
     if categorical_features is None:
         categorical_features = DEFAULT_CATEGORICAL_BASE
 
     # tenure_band is created by TelecomFeatureEngineer
     categorical_features = list(categorical_features) + ["tenure_band"]
 
-    numeric_transformer = Pipeline(steps=[
-        ("imputer", SimpleImputer(strategy="median")),
-    ])
+    numeric_steps = [("imputer", SimpleImputer(strategy="median"))]
+    if output != "onehot":
+        numeric_steps.append(("float32", FunctionTransformer(to_float32, feature_names_out="one-to-one")))
+    numeric_transformer = Pipeline(steps=numeric_steps)
+
+    if output == "ordinal":
+        encoder = ("ordinal", OrdinalEncoder(
+            handle_unknown="use_encoded_value", unknown_value=-1, dtype=OUTPUT_DTYPES["ordinal"],
+        ))
+    elif output == "sparse":
+        encoder = ("onehot", OneHotEncoder(handle_unknown="ignore", dtype=np.float32))
+    else:
+        encoder = ("onehot", OneHotEncoder(handle_unknown="ignore"))
 
     categorical_transformer = Pipeline(steps=[
         ("imputer", SimpleImputer(strategy="most_frequent")),
-        ("onehot", OneHotEncoder(handle_unknown="ignore")),
+        encoder,
     ])
 
     ct = ColumnTransformer(
@@ -50,8 +78,13 @@ def build_preprocessor(categorical_features=None):
             ("num", numeric_transformer, NUMERIC_FEATURES),
             ("cat", categorical_transformer, categorical_features),
         ],
-        remainder="drop"
+        remainder="drop",
+        # sparse: keep CSR regardless of density
+        sparse_threshold=1.0 if output == "sparse" else 0.3,
     )
+    if output == "ordinal":
+        # Keep each block's dtype: a single ndarray would upcast the codes to float
+        ct.set_output(transform="pandas")
 
     preprocessor = Pipeline(steps=[
         ("fe", TelecomFeatureEngineer()),
@@ -59,3 +92,27 @@ def build_preprocessor(categorical_features=None):
     ])
 
     return preprocessor
+
+
+def output_mode(preprocessor) -> str:
+    """Which OUTPUT_DTYPES encoding a (fitted or unfitted) build_preprocessor pipeline produces."""
+    ct = preprocessor.named_steps["ct"]
+    cat = dict((name, trans) for name, trans, _ in ct.transformers)["cat"]
+    encoder = cat.steps[-1][1]
+    if isinstance(encoder, OrdinalEncoder):
+        return "ordinal"
+    return "sparse" if np.dtype(encoder.dtype) == np.float32 else "onehot"
+
+
+def transform_iter(preprocessor, X, chunk_rows: int = 100_000):
+    """
+    Yield preprocessor.transform one chunk at a time, for inputs larger than
+    memory. `X` is a DataFrame (sliced into `chunk_rows` rows) or any
+    iterable of DataFrames, e.g. pd.read_sql_query(..., chunksize=N) or
+    pd.read_csv(..., chunksize=N).
+    """
+    chunks = X
+    if isinstance(X, pd.DataFrame):
+        chunks = (X.iloc[i:i + chunk_rows] for i in range(0, len(X), chunk_rows))
+    for chunk in chunks:
+        yield preprocessor.transform(chunk)
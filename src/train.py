@@ -0,0 +1,379 @@
+"""
+Reproducible training for the churn model.
+
+Replaces the manual steps of notebooks/04_modeling.ipynb:
+  1. stratified train/test split of the training dataset (fixed seed)
+  2. K preprocessed CV folds of the train split, cached on disk under
+     data/cache/folds/<key>/ (key = data fingerprint + fold settings), so
+     reruns and extra candidates skip preprocessing
+  3. every (model, hyperparameters, fold) task scored in a process pool;
+     each task fits single-threaded, so wall-clock scales with --workers
+  4. best candidate by mean CV score; thresholds for the `default` and
+     `aggressive` modes picked from its out-of-fold probabilities as the
+     highest-precision cut-off that meets each mode's minimum recall
+  5. refit on the full train split, evaluation on the test split, and a
+     versioned bundle in artifacts/models/<version>/: preprocessor.joblib,
+     model.joblib, drift_reference.json and manifest.json (metrics,
+     thresholds, candidates, data fingerprint, library versions, timings)
+
+Usage (from the project root):
+    python -m src.train --workers 8
+    python -m src.train --models random_forest --folds 3 --output ordinal
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from importlib.util import find_spec
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import average_precision_score, precision_recall_curve, roc_auc_score
+from sklearn.model_selection import StratifiedKFold, train_test_split
+
+from src.drift_reference import build_reference, save_reference
+from src.preprocessor import OUTPUT_DTYPES, build_preprocessor
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DB_PATH = PROJECT_ROOT / "data" / "telco_churn.db"
+MODELS_DIR = PROJECT_ROOT / "artifacts" / "models"
+FOLD_CACHE_DIR = PROJECT_ROOT / "data" / "cache" / "folds"
+
+SOURCE_TABLE = "churn_training_dataset"
+SOURCE_VIEW = "vw_churn_training_dataset"
+TARGET = "churn_target"
+DROP_COLS = ["customer_id", "snapshot_date"]
+
+SEED = 42
+TEST_SIZE = 0.2
+METRICS = ["roc_auc", "average_precision"]
+
+# Minimum recall each decision mode must reach (thresholds are picked, not hand-set)
+MIN_RECALL = {"default": 0.80, "aggressive": 0.90}
+
+# Fixed settings per model family + the grid searched on top of them
+SEARCH_SPACE = {
+    "logreg": {"C": [0.1, 1.0, 10.0]},
+    "random_forest": {"max_depth": [8, 10, 14], "min_samples_leaf": [10, 20]},
+    "xgboost": {"max_depth": [3, 4, 6], "learning_rate": [0.05, 0.1]},
+}
+
+
+# ------------------------
+# Models
+# ------------------------
+def available_models():
+    # xgboost is optional: searched only when installed
+    return [m for m in SEARCH_SPACE if m != "xgboost" or find_spec("xgboost") is not None]
+
+
+def make_model(name: str, params: dict, n_jobs: int = 1, seed: int = SEED):
+    if name == "logreg":
+        return LogisticRegression(max_iter=1000, class_weight="balanced", **params)
+    if name == "random_forest":
+        return RandomForestClassifier(
+            n_estimators=300, class_weight="balanced_subsample", random_state=seed, n_jobs=n_jobs, **params
+        )
+    if name == "xgboost":
+        from xgboost import XGBClassifier
+        return XGBClassifier(
+            n_estimators=300, subsample=0.8, colsample_bytree=0.8, eval_metric="logloss",
+            random_state=seed, n_jobs=n_jobs, **params
+        )
+    raise ValueError(f"Unknown model: {name!r}")
+
+
+def candidates(models):
+    """(model, params) for every grid point of the requested model families."""
+    out = []
+    for name in models:
+        grid = SEARCH_SPACE[name]
+        for values in itertools.product(*grid.values()):
+            out.append((name, dict(zip(grid, values))))
+    return out
+
+
+# ------------------------
+# Data + fold cache
+# ------------------------
+def load_training_data(db_path: Path = DB_PATH) -> pd.DataFrame:
+    conn = sqlite3.connect(db_path)
+    has_table = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?;", (SOURCE_TABLE,)
+    ).fetchone()
+    source = SOURCE_TABLE if has_table else SOURCE_VIEW
+    df = pd.read_sql_query(f"SELECT * FROM {source} ORDER BY customer_id, snapshot_date", conn)
+    conn.close()
+    return df
+
+
+def data_fingerprint(df: pd.DataFrame) -> str:
+    return hashlib.sha256(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes()).hexdigest()
+
+
+def build_fold(path: Path, X: pd.DataFrame, y: np.ndarray, train_idx, val_idx, output: str) -> Path:
+    prep = build_preprocessor(output=output)
+    fold = {
+        "X_train": prep.fit_transform(X.iloc[train_idx]),
+        "y_train": y[train_idx],
+        "X_val": prep.transform(X.iloc[val_idx]),
+        "y_val": y[val_idx],
+        "val_idx": np.asarray(val_idx),
+    }
+    tmp = path.with_suffix(".tmp")
+    joblib.dump(fold, tmp)  # uncompressed: workers memory-map the arrays
+    tmp.replace(path)
+    return path
+
+
+def cached_folds(pool, X: pd.DataFrame, y: np.ndarray, n_folds: int, output: str, seed: int,
+                 cache_dir: Path = FOLD_CACHE_DIR):
+    """Paths of the preprocessed folds, building (in the pool) only those not cached yet."""
+    key = hashlib.sha256(json.dumps({
+        "data": data_fingerprint(X.assign(**{TARGET: y})),
+        "folds": n_folds, "seed": seed, "output": output, "sklearn": sklearn.__version__,
+    }, sort_keys=True).encode()).hexdigest()[:16]
+    fold_dir = Path(cache_dir) / key
+    fold_dir.mkdir(parents=True, exist_ok=True)
+
+    splits = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=seed).split(X, y)
+    paths, pending = [], []
+    for i, (train_idx, val_idx) in enumerate(splits):
+        path = fold_dir / f"fold-{i}.joblib"
+        paths.append(path)
+        if not path.exists():
+            pending.append(pool.submit(build_fold, path, X, y, train_idx, val_idx, output))
+    for fut in pending:
+        fut.result()
+    return paths, len(pending)
+
+
+# ------------------------
+# Search
+# ------------------------
+_thread_limits = None
+
+
+def init_worker() -> None:
+    # One core per task: parallelism comes from the pool, not from BLAS/OpenMP threads
+    from threadpoolctl import threadpool_limits
+    global _thread_limits
+    _thread_limits = threadpool_limits(limits=1)
+
+
+def evaluate(candidate_id: int, name: str, params: dict, fold_id: int, fold_path: Path, seed: int) -> dict:
+    fold = joblib.load(fold_path, mmap_mode="r")
+    start = time.perf_counter()
+    model = make_model(name, params, n_jobs=1, seed=seed).fit(fold["X_train"], fold["y_train"])
+    proba = model.predict_proba(fold["X_val"])[:, 1]
+    return {
+        "candidate": candidate_id,
+        "fold": fold_id,
+        "roc_auc": float(roc_auc_score(fold["y_val"], proba)),
+        "average_precision": float(average_precision_score(fold["y_val"], proba)),
+        "val_idx": np.asarray(fold["val_idx"]),
+        "proba": proba,
+        "fit_s": time.perf_counter() - start,
+    }
+
+
+def search(pool, fold_paths, cands, seed: int = SEED):
+    """Score every candidate on every fold; returns per-candidate summaries and all task results."""
+    futures = [
+        pool.submit(evaluate, cid, name, params, fold_id, path, seed)
+        for cid, (name, params) in enumerate(cands)
+        for fold_id, path in enumerate(fold_paths)
+    ]
+    results = [f.result() for f in futures]
+
+    summary = []
+    for cid, (name, params) in enumerate(cands):
+        rows = [r for r in results if r["candidate"] == cid]
+        entry = {"model": name, "params": params}
+        for m in METRICS:
+            scores = [r[m] for r in rows]
+            entry[f"cv_{m}_mean"] = float(np.mean(scores))
+            entry[f"cv_{m}_std"] = float(np.std(scores))
+        entry["fit_s"] = float(sum(r["fit_s"] for r in rows))
+        summary.append(entry)
+    return summary, results
+
+
+def out_of_fold(results, candidate_id: int, n_rows: int) -> np.ndarray:
+    proba = np.full(n_rows, np.nan)
+    for r in results:
+        if r["candidate"] == candidate_id:
+            proba[r["val_idx"]] = r["proba"]
+    return proba
+
+
+# ------------------------
+# Thresholds
+# ------------------------
+def pick_threshold(y_true, proba, min_recall: float) -> dict:
+    """Highest-precision threshold with recall >= min_recall (ties: the higher threshold)."""
+    precision, recall, thresholds = precision_recall_curve(y_true, proba)
+    precision, recall = precision[:-1], recall[:-1]
+    ok = np.flatnonzero(recall >= min_recall)
+    # recall is non-increasing in the threshold, so the lowest threshold always qualifies
+    best = ok[np.lexsort((thresholds[ok], precision[ok]))[-1]]
+    return {
+        "threshold": float(thresholds[best]),
+        "min_recall": min_recall,
+        "cv_precision": float(precision[best]),
+        "cv_recall": float(recall[best]),
+    }
+
+
+def rates_at(y_true, proba, threshold: float) -> dict:
+    flag = proba >= threshold
+    tp = int(np.sum(flag & (y_true == 1)))
+    return {
+        "precision": tp / max(int(flag.sum()), 1),
+        "recall": tp / max(int((y_true == 1).sum()), 1),
+        "flag_rate": float(flag.mean()),
+    }
+
+
+# ------------------------
+# Driver
+# ------------------------
+def new_version() -> str:
+    return datetime.now(timezone.utc).strftime("v%Y%m%d-%H%M%S")
+
+
+def train(models, n_folds: int = 5, workers: int = 1, output: str = "onehot", seed: int = SEED,
+          min_recall: dict = None, db_path: Path = DB_PATH, models_dir: Path = MODELS_DIR,
+          cache_dir: Path = FOLD_CACHE_DIR, version: str = None) -> dict:
+    min_recall = dict(MIN_RECALL, **(min_recall or {}))
+    timings = {}
+    start = time.perf_counter()
+
+    df = load_training_data(db_path)
+    X = df.drop(columns=DROP_COLS + [TARGET])
+    y = df[TARGET].astype(int).to_numpy()
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=TEST_SIZE, stratify=y, random_state=seed
+    )
+    X_train = X_train.reset_index(drop=True)
+
+    cands = candidates(models)
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn"), initializer=init_worker,
+    ) as pool:
+        t0 = time.perf_counter()
+        fold_paths, built = cached_folds(pool, X_train, y_train, n_folds, output, seed, cache_dir)
+        timings["folds_s"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        summary, results = search(pool, fold_paths, cands, seed)
+        timings["search_s"] = time.perf_counter() - t0
+
+    best_id = max(range(len(cands)), key=lambda i: summary[i]["cv_roc_auc_mean"])
+    best_name, best_params = cands[best_id]
+    oof = out_of_fold(results, best_id, len(y_train))
+    thresholds = {mode: pick_threshold(y_train, oof, r) for mode, r in min_recall.items()}
+
+    # Refit on the whole train split (all cores for the final fit)
+    t0 = time.perf_counter()
+    preprocessor = build_preprocessor(output=output)
+    model = make_model(best_name, best_params, n_jobs=workers, seed=seed)
+    model.fit(preprocessor.fit_transform(X_train), y_train)
+    proba_test = model.predict_proba(preprocessor.transform(X_test))[:, 1]
+    timings["refit_s"] = time.perf_counter() - t0
+
+    for mode, t in thresholds.items():
+        t.update({f"test_{k}": v for k, v in rates_at(y_test, proba_test, t["threshold"]).items()})
+
+    version = version or new_version()
+    out_dir = Path(models_dir) / version
+    out_dir.mkdir(parents=True, exist_ok=False)
+    joblib.dump(preprocessor, out_dir / "preprocessor.joblib")
+    joblib.dump(model, out_dir / "model.joblib")
+    save_reference(build_reference(preprocessor, model, db_path), out_dir / "drift_reference.json")
+    timings["total_s"] = time.perf_counter() - start
+
+    manifest = {
+        "version": version,
+        "created_at_utc": datetime.now(timezone.utc).isoformat(),
+        "model": {"name": best_name, "params": best_params},
+        "thresholds": thresholds,
+        "test": {
+            "rows": int(len(y_test)),
+            "roc_auc": float(roc_auc_score(y_test, proba_test)),
+            "average_precision": float(average_precision_score(y_test, proba_test)),
+        },
+        "data": {"rows": int(len(df)), "fingerprint": data_fingerprint(df), "positive_rate": float(y.mean())},
+        "config": {
+            "folds": n_folds, "seed": seed, "test_size": TEST_SIZE, "output": output,
+            "output_dtype": np.dtype(OUTPUT_DTYPES[output]).name, "workers": workers,
+            "models": list(models), "folds_rebuilt": built,
+        },
+        "search": sorted(summary, key=lambda s: -s["cv_roc_auc_mean"]),
+        "timings": timings,
+        "versions": {
+            "python": platform.python_version(), "sklearn": sklearn.__version__,
+            "numpy": np.__version__, "pandas": pd.__version__,
+        },
+    }
+    (out_dir / "manifest.json").write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Cross-validated model search + versioned churn model artifacts.")
+    parser.add_argument("--models", nargs="+", choices=list(SEARCH_SPACE), default=None,
+                        help="model families to search (default: all installed)")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--output", choices=list(OUTPUT_DTYPES), default="onehot",
+                        help="preprocessor encoding (see src/preprocessor.py)")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--default-recall", type=float, default=MIN_RECALL["default"])
+    parser.add_argument("--aggressive-recall", type=float, default=MIN_RECALL["aggressive"])
+    parser.add_argument("--version", default=None, help="bundle name (default: UTC timestamp)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    models = args.models or available_models()
+    missing = [m for m in models if m not in available_models()]
+    if missing:
+        raise SystemExit(f"Not installed: {', '.join(missing)}")
+
+    manifest = train(
+        models, n_folds=args.folds, workers=args.workers, output=args.output, seed=args.seed,
+        min_recall={"default": args.default_recall, "aggressive": args.aggressive_recall},
+        version=args.version,
+    )
+
+    for s in manifest["search"]:
+        print(f"  {s['model']:<14} {json.dumps(s['params']):<45} "
+              f"AUC {s['cv_roc_auc_mean']:.4f} ± {s['cv_roc_auc_std']:.4f}  AP {s['cv_average_precision_mean']:.4f}")
+    best = manifest["model"]
+    print(f"best: {best['name']} {json.dumps(best['params'])}  test AUC {manifest['test']['roc_auc']:.4f}")
+    for mode, t in manifest["thresholds"].items():
+        print(f"  {mode:<10} threshold {t['threshold']:.3f}  (recall >= {t['min_recall']:.2f}: "
+              f"test precision {t['test_precision']:.3f}, recall {t['test_recall']:.3f})")
+    timings = manifest["timings"]
+    print(f"folds {timings['folds_s']:.1f}s ({manifest['config']['folds_rebuilt']} rebuilt), "
+          f"search {timings['search_s']:.1f}s on {manifest['config']['workers']} workers, "
+          f"total {timings['total_s']:.1f}s")
+    print(f"✅ {MODELS_DIR / manifest['version']}  (serve it: python -m src.model_registry promote {manifest['version']})")
+
+
+if __name__ == "__main__":
+    main()
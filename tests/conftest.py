@@ -0,0 +1,88 @@
+"""
+Shared fixtures: a small synthetic extract shaped like vw_churn_training_dataset,
+a preprocessor fitted on it and a small forest trained on its output. No
+database or artifacts are needed.
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.preprocessor import build_preprocessor  # noqa: E402
+
+SEED = 7
+ADDON = ["Yes", "No", "No internet service"]
+CATEGORIES = {
+    "gender": ["Male", "Female"],
+    "partner": ["Yes", "No"],
+    "dependents": ["Yes", "No"],
+    "country": ["United States"],
+    "state": ["California", "Texas", "New York"],
+    "contract_type": ["Month-to-month", "One year", "Two year"],
+    "paperless_billing": ["Yes", "No"],
+    "payment_method": ["Electronic check", "Mailed check", "Bank transfer (automatic)", "Credit card (automatic)"],
+    "phone_service": ["Yes", "No"],
+    "multiple_lines": ["Yes", "No", "No phone service"],
+    "internet_service": ["Fiber optic", "DSL", "No"],
+    "online_security": ADDON,
+    "online_backup": ADDON,
+    "device_protection": ADDON,
+    "tech_support": ADDON,
+    "streaming_tv": ADDON,
+    "streaming_movies": ADDON,
+}
+
+
+def make_raw(n: int, seed: int = SEED, unseen: bool = False) -> pd.DataFrame:
+    """
+    Raw feature rows with the awkward cases the pipeline has to handle:
+    missing categoricals and numerics, zero and out-of-range tenure and,
+    with `unseen`, categories the encoder was not fitted on.
+    """
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({c: rng.choice(v, n).astype(object) for c, v in CATEGORIES.items()})
+    df["senior_citizen"] = rng.integers(0, 2, n)
+    df["tenure_months"] = rng.integers(0, 73, n).astype(float)
+    df["monthly_charges"] = rng.uniform(18, 120, n).round(2)
+    df["total_charges"] = (df["monthly_charges"] * df["tenure_months"]).round(2)
+    df["cltv"] = rng.integers(2000, 6500, n).astype(float)
+
+    holes = rng.random((n, 3)) < 0.05
+    df.loc[holes[:, 0], "total_charges"] = np.nan
+    df.loc[holes[:, 1], "monthly_charges"] = np.nan
+    df.loc[holes[:, 2], "contract_type"] = None
+    df.loc[df.index[:3], "tenure_months"] = [0.0, np.nan, 1300.0]  # -> "0-12", "0-12", imputed band
+    if unseen:
+        df.loc[df.index[3], "state"] = "Nevada"
+        df.loc[df.index[4], "payment_method"] = "Crypto"
+    return df
+
+
+@pytest.fixture(scope="session")
+def raw_frame() -> pd.DataFrame:
+    return make_raw(400)
+
+
+@pytest.fixture(scope="session")
+def score_frame() -> pd.DataFrame:
+    return make_raw(150, seed=SEED + 1, unseen=True)
+
+
+@pytest.fixture(scope="session")
+def preprocessor(raw_frame):
+    return build_preprocessor().fit(raw_frame)
+
+
+@pytest.fixture(scope="session")
+def forest(preprocessor, raw_frame):
+    X = preprocessor.transform(raw_frame)
+    # Label loosely tied to contract and tenure so the trees have real splits
+    y = ((raw_frame["contract_type"] == "Month-to-month") & (raw_frame["tenure_months"] < 24)).to_numpy()
+    y = y ^ (np.random.default_rng(SEED).random(len(y)) < 0.1)
+    return RandomForestClassifier(n_estimators=25, max_depth=8, random_state=SEED).fit(X, y.astype(int))
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.fast_scorer import FastScorer
+
+
+def dense(X) -> np.ndarray:
+    return np.asarray(X.toarray() if hasattr(X, "toarray") else X, dtype=np.float64)
+
+
+def assert_identical(expected: np.ndarray, actual: np.ndarray) -> None:
+    assert actual.shape == expected.shape
+    same = (expected == actual) | (np.isnan(expected) & np.isnan(actual))
+    bad = np.flatnonzero(~same.all(axis=1))
+    assert not len(bad), f"{len(bad)} mismatching rows; first row {bad[0]}, columns {np.flatnonzero(~same[bad[0]])}"
+
+
+@pytest.fixture(scope="module")
+def scorer(preprocessor):
+    return FastScorer.from_preprocessor(preprocessor)
+
+
+@pytest.mark.parametrize("frame", ["raw_frame", "score_frame"])
+def test_transform_record_matches_pipeline(request, preprocessor, scorer, frame):
+    df = request.getfixturevalue(frame)
+    expected = dense(preprocessor.transform(df))
+    actual = np.vstack([scorer.transform_record(r) for r in df.to_dict(orient="records")])
+    assert_identical(expected, actual)
+
+
+def test_transform_records_matches_pipeline(preprocessor, scorer, score_frame):
+    expected = dense(preprocessor.transform(score_frame))
+    assert_identical(expected, scorer.transform_records(score_frame.to_dict(orient="records")))
+
+
+def test_engineered_features_match(preprocessor, scorer, score_frame):
+    engineered = preprocessor.steps[0][1].transform(score_frame)
+    rows = [scorer.engineer(r) for r in score_frame.to_dict(orient="records")]
+    bands = engineered["tenure_band"]
+    expected = bands.astype(object).where(bands.notna(), None).tolist()
+    assert [None if pd.isna(r["tenure_band"]) else r["tenure_band"] for r in rows] == expected
+    assert [r["addon_count"] for r in rows] == engineered["addon_count"].tolist()
+    np.testing.assert_array_equal([r["avg_monthly_spend"] for r in rows], engineered["avg_monthly_spend"])
+
+
+def test_out_of_range_tenure_gets_the_imputed_band(preprocessor, scorer, score_frame):
+    # Row 2 has 1300 months, past the last bin: missing, then the imputer's fill, like pd.cut(...).astype(str)
+    _, _, fill, table = next(c for c in scorer.categorical if c[0] == "tenure_band")
+    block = sorted(table.values())
+    X = dense(preprocessor.transform(score_frame.iloc[[2]]))
+    assert X[0, block].tolist() == [1.0 if i == table[fill] else 0.0 for i in block]
+
+
+def test_unsupported_encoding_is_rejected(raw_frame):
+    from src.preprocessor import build_preprocessor
+
+    with pytest.raises(ValueError):
+        FastScorer.from_preprocessor(build_preprocessor(output="ordinal").fit(raw_frame))
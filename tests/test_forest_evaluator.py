@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from src.forest_evaluator import PARITY_TOLERANCE, HybridForest, PackedForest, max_abs_diff
+
+
+@pytest.fixture(scope="module")
+def X(preprocessor, score_frame, raw_frame):
+    X = np.vstack([preprocessor.transform(raw_frame), preprocessor.transform(score_frame)])
+    return np.asarray(X, dtype=np.float64)
+
+
+@pytest.fixture(scope="module")
+def packed(forest):
+    return PackedForest.from_sklearn(forest)
+
+
+def test_packed_matches_sklearn(forest, packed, X):
+    assert max_abs_diff(forest, packed, X) <= PARITY_TOLERANCE
+    np.testing.assert_array_equal(packed.predict(X), forest.predict(X))
+
+
+@pytest.mark.parametrize("n", [1, 7, 64])
+def test_packed_matches_sklearn_per_batch_size(forest, packed, X, n):
+    np.testing.assert_allclose(packed.predict_proba(X[:n]), forest.predict_proba(X[:n]), rtol=0, atol=PARITY_TOLERANCE)
+
+
+def test_chunked_evaluation_is_identical(packed, X):
+    np.testing.assert_array_equal(packed.predict_proba(X, chunk_size=33), packed.predict_proba(X))
+
+
+@pytest.mark.parametrize("mmap_mode", [None, "r"])
+def test_save_load_round_trip(forest, packed, X, tmp_path, mmap_mode):
+    packed.save(tmp_path / "packed")
+    loaded = PackedForest.load(tmp_path / "packed", mmap_mode=mmap_mode)
+    assert max_abs_diff(forest, loaded, X) <= PARITY_TOLERANCE
+
+
+def test_hybrid_routes_by_batch_size(forest, packed, X):
+    calls = []
+
+    class Recording:
+        def __init__(self, name, model):
+            self.name, self.model, self.classes_ = name, model, model.classes_
+
+        def predict_proba(self, X):
+            calls.append((self.name, X.shape[0]))
+            return self.model.predict_proba(X)
+
+    hybrid = HybridForest(Recording("packed", packed), Recording("sklearn", forest), max_rows=16)
+    for n in (1, 16, 17, 200):
+        np.testing.assert_allclose(hybrid.predict_proba(X[:n]), forest.predict_proba(X[:n]), rtol=0,
+                                   atol=PARITY_TOLERANCE)
+    assert calls == [("packed", 1), ("packed", 16), ("sklearn", 17), ("sklearn", 200)]
@@ -0,0 +1,50 @@
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src import load_star_schema as loader
+
+SCHEMA_SQL = Path(__file__).resolve().parents[1] / "sql" / "schema.sql"
+SNAPSHOT = "2026-01-28"
+
+
+def raw_extract(numeric_dtype: str) -> pd.DataFrame:
+    # Whole-number charges, so pd.to_numeric keeps whichever dtype the extract used
+    n = 4
+    df = pd.DataFrame({raw: ["x"] * n for raw in loader.COLUMN_MAP})
+    df["CustomerID"] = [f"C{i:04d}" for i in range(n)]
+    df["Senior Citizen"] = [0, 1, 0, 1]
+    df["Tenure Months"] = [1, 12, 30, 72]
+    df["Monthly Charges"] = [20, 55, 80, 105]
+    df["Total Charges"] = [20, 660, 2400, 7560]
+    df["CLTV"] = [2000, 3500, 4100, 6000]
+    numeric = ["Senior Citizen", "Tenure Months", "Monthly Charges", "Total Charges", "CLTV"]
+    df[numeric] = df[numeric].astype(numeric_dtype)
+    return df
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(SCHEMA_SQL.read_text())
+    loader.ensure_schema(conn)
+    yield conn
+    conn.close()
+
+
+def test_row_hash_ignores_int_vs_float_extracts():
+    as_int = loader.standardize(raw_extract("int64"), SNAPSHOT)
+    as_float = loader.standardize(raw_extract("float64"), SNAPSHOT)
+    assert as_int["monthly_charges"].dtype != as_float["monthly_charges"].dtype
+    assert (as_int["row_hash"].to_numpy() == as_float["row_hash"].to_numpy()).all()
+
+
+def test_incremental_reload_of_same_rows_changes_nothing(conn):
+    cur = conn.cursor()
+    with conn:
+        loader.load_full(cur, loader.KeyResolver(cur), loader.standardize(raw_extract("int64"), SNAPSHOT))
+
+    changed = loader.changed_rows(cur, loader.standardize(raw_extract("float64"), SNAPSHOT), SNAPSHOT)
+    assert len(changed) == 0
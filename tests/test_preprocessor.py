@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+import pytest
+import scipy.sparse as sp
+
+from src.preprocessor import OUTPUT_DTYPES, NUMERIC_FEATURES, build_preprocessor, output_mode, transform_iter
+
+
+@pytest.mark.parametrize("mode", list(OUTPUT_DTYPES))
+def test_output_dtype(raw_frame, score_frame, mode):
+    prep = build_preprocessor(output=mode).fit(raw_frame)
+    assert output_mode(prep) == mode
+    X = prep.transform(score_frame)
+
+    if mode == "ordinal":
+        # float32 numerics, integer codes for every categorical
+        assert isinstance(X, pd.DataFrame)
+        codes = X.drop(columns=[f"num__{c}" for c in NUMERIC_FEATURES])
+        assert set(X.dtypes.drop(codes.columns)) == {np.dtype(np.float32)}
+        assert set(codes.dtypes) == {np.dtype(OUTPUT_DTYPES[mode])}
+        assert codes.iloc[3:5].min(axis=1).tolist() == [-1, -1]  # unseen state / payment_method
+    else:
+        assert X.dtype == OUTPUT_DTYPES[mode]
+        if mode == "sparse":
+            assert sp.isspmatrix_csr(X)
+
+
+def test_transform_iter_matches_transform(raw_frame, score_frame):
+    prep = build_preprocessor(output="ordinal").fit(raw_frame)
+    chunks = list(transform_iter(prep, score_frame, chunk_rows=40))
+    assert len(chunks) == 4
+    pd.testing.assert_frame_equal(pd.concat(chunks), prep.transform(score_frame))
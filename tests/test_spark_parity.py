@@ -0,0 +1,62 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyspark")
+if not (os.getenv("JAVA_HOME") or shutil.which("java")):
+    pytest.skip("Spark local mode needs a Java runtime", allow_module_level=True)
+
+from spark.spark_features import KEY_COLS, build_features, get_spark, score  # noqa: E402
+from src.fast_scorer import FastScorer  # noqa: E402
+from src.forest_evaluator import PARITY_TOLERANCE  # noqa: E402
+
+ENGINEERED = ["avg_monthly_spend", "tenure_band", "addon_count"]
+
+
+def same(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    # NaN == NaN for parity purposes
+    return (a == b) | (pd.isna(a) & pd.isna(b))
+
+
+@pytest.fixture(scope="module")
+def spark():
+    session = get_spark("telco-churn-parity-tests")
+    yield session
+    session.stop()
+
+
+@pytest.fixture(scope="module")
+def frame(score_frame) -> pd.DataFrame:
+    df = score_frame.copy()
+    df["customer_id"] = [f"C{i:05d}" for i in range(len(df))]
+    df["snapshot_date"] = "2026-01-28"
+    return df
+
+
+@pytest.fixture(scope="module")
+def spark_out(spark, preprocessor, forest, frame) -> pd.DataFrame:
+    features = build_features(spark.createDataFrame(frame), FastScorer.from_preprocessor(preprocessor))
+    return score(features, forest).toPandas().sort_values(KEY_COLS, ignore_index=True)
+
+
+def test_engineered_features_match(preprocessor, frame, spark_out):
+    engineered = preprocessor.steps[0][1].transform(frame.drop(columns=KEY_COLS))
+    for c in ENGINEERED:
+        ok = same(engineered[c].astype(spark_out[c].dtype).to_numpy(), spark_out[c].to_numpy())
+        assert ok.all(), f"{c}: {int((~ok).sum())} mismatching rows"
+
+
+def test_feature_matrix_matches_pipeline(preprocessor, frame, spark_out):
+    expected = np.asarray(preprocessor.transform(frame.drop(columns=KEY_COLS)), dtype=np.float64)
+    actual = np.vstack(spark_out["features"].to_numpy())
+    assert actual.shape == expected.shape
+    bad = np.flatnonzero(~same(expected, actual).all(axis=1))
+    assert not len(bad), f"{len(bad)} mismatching rows; first row {bad[0]}"
+
+
+def test_scores_match_sklearn(preprocessor, forest, frame, spark_out):
+    expected = forest.predict_proba(preprocessor.transform(frame.drop(columns=KEY_COLS)))[:, 1]
+    np.testing.assert_allclose(spark_out["churn_probability"], expected, rtol=0, atol=PARITY_TOLERANCE)